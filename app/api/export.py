@@ -0,0 +1,52 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import Optional
+from app.api.rss import article_service
+from app.utils.export import EXPORT_FORMATS, encode_batches_async, get_encoder
+
+router = APIRouter()
+
+
+@router.get("/export")
+async def export_articles(
+    format: str = Query("ndjson", description="ndjson, csv or parquet"),
+    topic: Optional[str] = Query(None, description="Filter by job topic"),
+    locale: Optional[str] = Query(
+        None, description="farsi to export translated articles only"
+    ),
+    source: Optional[str] = Query(None, description="Filter by source URL"),
+    search: Optional[str] = Query(
+        None, description="Full-text search in title or summary"
+    ),
+    start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+):
+    """
+    Streams every matching article, newest first. Rows are read through a
+    server-side cursor and encoded batch by batch, so memory use stays flat
+    however large the export is.
+    """
+    try:
+        encoder = get_encoder(format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+    start_dt = datetime.strptime(start_date, "%Y-%m-%d") if start_date else None
+    end_dt = datetime.strptime(end_date, "%Y-%m-%d") if end_date else None
+
+    batches = article_service.export_articles(
+        topic=topic,
+        locale=locale,
+        source=source,
+        search=search,
+        start_date=start_dt,
+        end_date=end_dt,
+    )
+    return StreamingResponse(
+        encode_batches_async(encoder, batches),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="articles.{format}"'},
+    )
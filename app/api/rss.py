@@ -1,6 +1,5 @@
-from fastapi import APIRouter, Response, Query
-from app.db.base_service import BaseDatabaseService
-from app.db.article_service import ArticleService
+from fastapi import APIRouter, HTTPException, Response, Query
+from app.db.backend import create_async_article_service
 import xml.etree.ElementTree as ET
 from datetime import datetime
 from typing import Optional
@@ -8,36 +7,35 @@ import os
 
 router = APIRouter()
 
-base_service = BaseDatabaseService()
-article_service = ArticleService(base_service)
+article_service = create_async_article_service()
 
 
-def build_rss_feed(articles, domain, locale="english"):
+def build_rss_feed(articles, domain, locale="english", topic=None):
     """
     Builds RSS feed XML for given articles and locale with proper encoding
     """
     rss = ET.Element("rss", version="2.0")
     channel = ET.SubElement(rss, "channel")
+    topic_path = f"/{topic}" if topic else ""
 
     if locale == "farsi":
         ET.SubElement(channel, "title").text = "اخبار مهبد"
-        ET.SubElement(channel, "link").text = f"{domain}/rss/farsi"
+        ET.SubElement(channel, "link").text = f"{domain}/rss/farsi{topic_path}"
         ET.SubElement(channel, "description").text = "آخرین اخبار از منابع معتبر شما"
         ET.SubElement(channel, "language").text = "fa-ir"
     else:  # English
         ET.SubElement(channel, "title").text = "Mahbod's News Feed"
-        ET.SubElement(channel, "link").text = f"{domain}/rss"
+        ET.SubElement(channel, "link").text = f"{domain}/rss{topic_path}"
         ET.SubElement(channel, "description").text = (
             "Latest news by your trusted sources"
         )
         ET.SubElement(channel, "language").text = "en-us"
 
     for article in articles:
-        # Skip articles that don't have content for the requested locale
+        # The listing already filters by locale in SQL; this is a safety net
         if locale == "farsi":
             title = article.get("farsi_title")
             summary = article.get("farsi_summary")
-            # Skip if no Farsi content available
             if not title or not summary:
                 continue
         else:  # English
@@ -52,6 +50,8 @@ def build_rss_feed(articles, domain, locale="english"):
         ET.SubElement(item, "description").text = summary or ""
         ET.SubElement(item, "link").text = article["source"]
         ET.SubElement(item, "guid").text = article["source"]
+        if article.get("topic"):
+            ET.SubElement(item, "category").text = article["topic"]
         ET.SubElement(item, "pubDate").text = article["created_at"].strftime(
             "%a, %d %b %Y %H:%M:%S GMT"
         )
@@ -61,17 +61,16 @@ def build_rss_feed(articles, domain, locale="english"):
     return f'<?xml version="1.0" encoding="UTF-8"?>\n{xml_str}'
 
 
-@router.get("/rss", response_class=Response)
-def get_rss(
-    source: Optional[str] = Query(None, description="Filter by source URL"),
-    search: Optional[str] = Query(None, description="Search in title or summary"),
-    start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
-    end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
-    limit: int = Query(20, description="Limit number of articles"),
-):
-    """
-    English RSS feed - maintains existing URL for backward compatibility
-    """
+def feed_headers(next_cursor):
+    headers = {"Content-Type": "application/rss+xml; charset=utf-8"}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return headers
+
+
+async def feed_response(
+    locale, topic, source, search, start_date, end_date, limit, after
+) -> Response:
     domain = os.environ.get("SERVER_URL")
 
     # Parse dates if provided
@@ -79,43 +78,110 @@ def get_rss(
     end_dt = datetime.strptime(end_date, "%Y-%m-%d") if end_date else None
 
     # Fetch filtered articles
-    articles = article_service.list_articles_filtered(
-        source=source, search=search, start_date=start_dt, end_date=end_dt, limit=limit
-    )
+    try:
+        articles, next_cursor = await article_service.list_articles_page(
+            topic=topic,
+            locale=locale,
+            source=source,
+            search=search,
+            start_date=start_dt,
+            end_date=end_dt,
+            limit=limit,
+            after=after,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    xml_str = build_rss_feed(articles, domain, locale="english")
+    xml_str = build_rss_feed(articles, domain, locale=locale, topic=topic)
     return Response(
         content=xml_str,
         media_type="application/rss+xml; charset=utf-8",
-        headers={"Content-Type": "application/rss+xml; charset=utf-8"},
+        headers=feed_headers(next_cursor),
+    )
+
+
+@router.get("/rss", response_class=Response)
+async def get_rss(
+    source: Optional[str] = Query(None, description="Filter by source URL"),
+    search: Optional[str] = Query(
+        None, description="Full-text search in title or summary"
+    ),
+    start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+    limit: int = Query(20, description="Limit number of articles"),
+    after: Optional[str] = Query(
+        None, description="Cursor from the X-Next-Cursor header of the previous page"
+    ),
+):
+    """
+    English RSS feed - maintains existing URL for backward compatibility
+    """
+    return await feed_response(
+        "english", None, source, search, start_date, end_date, limit, after
     )
 
 
 @router.get("/rss/farsi", response_class=Response)
-def get_rss_farsi(
+async def get_rss_farsi(
     source: Optional[str] = Query(None, description="Filter by source URL"),
-    search: Optional[str] = Query(None, description="Search in title or summary"),
+    search: Optional[str] = Query(
+        None, description="Full-text search in title or summary"
+    ),
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
     limit: int = Query(20, description="Limit number of articles"),
+    after: Optional[str] = Query(
+        None, description="Cursor from the X-Next-Cursor header of the previous page"
+    ),
 ):
     """
     Farsi RSS feed - separate endpoint for Persian content
     """
-    domain = os.environ.get("SERVER_URL")
+    return await feed_response(
+        "farsi", None, source, search, start_date, end_date, limit, after
+    )
 
-    # Parse dates if provided
-    start_dt = datetime.strptime(start_date, "%Y-%m-%d") if start_date else None
-    end_dt = datetime.strptime(end_date, "%Y-%m-%d") if end_date else None
 
-    # Fetch filtered articles
-    articles = article_service.list_articles_filtered(
-        source=source, search=search, start_date=start_dt, end_date=end_dt, limit=limit
+@router.get("/rss/farsi/{topic}", response_class=Response)
+async def get_rss_farsi_topic(
+    topic: str,
+    source: Optional[str] = Query(None, description="Filter by source URL"),
+    search: Optional[str] = Query(
+        None, description="Full-text search in title or summary"
+    ),
+    start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+    limit: int = Query(20, description="Limit number of articles"),
+    after: Optional[str] = Query(
+        None, description="Cursor from the X-Next-Cursor header of the previous page"
+    ),
+):
+    """
+    Farsi RSS feed for a single topic (e.g. tech, football_upcoming_week)
+    """
+    return await feed_response(
+        "farsi", topic, source, search, start_date, end_date, limit, after
     )
 
-    xml_str = build_rss_feed(articles, domain, locale="farsi")
-    return Response(
-        content=xml_str,
-        media_type="application/rss+xml; charset=utf-8",
-        headers={"Content-Type": "application/rss+xml; charset=utf-8"},
+
+@router.get("/rss/{topic}", response_class=Response)
+async def get_rss_topic(
+    topic: str,
+    source: Optional[str] = Query(None, description="Filter by source URL"),
+    search: Optional[str] = Query(
+        None, description="Full-text search in title or summary"
+    ),
+    start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+    limit: int = Query(20, description="Limit number of articles"),
+    after: Optional[str] = Query(
+        None, description="Cursor from the X-Next-Cursor header of the previous page"
+    ),
+):
+    """
+    English RSS feed for a single topic. Registered last so /rss/farsi
+    keeps its meaning.
+    """
+    return await feed_response(
+        "english", topic, source, search, start_date, end_date, limit, after
     )
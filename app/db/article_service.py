@@ -1,4 +1,7 @@
 import uuid
+from psycopg2.extras import execute_values
+from app.db import queries
+from app.db.async_service import AsyncDatabaseService
 from app.db.base_service import BaseDatabaseService
 
 
@@ -6,78 +9,6 @@ class ArticleService:
     def __init__(self, db_service: BaseDatabaseService):
         self.db_service = db_service
         self.logger = db_service.logger
-        self._init_schema()
-
-    def _init_schema(self):
-        conn = self.db_service.get_connection()
-        cur = conn.cursor()
-
-        cur.execute('CREATE EXTENSION IF NOT EXISTS "uuid-ossp";')
-
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS articles (
-                id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-                title TEXT NOT NULL UNIQUE,
-                summary TEXT,
-                source TEXT NOT NULL,
-                sent_to_telegram BOOLEAN NOT NULL DEFAULT FALSE,
-                created_at TIMESTAMP NOT NULL DEFAULT now(),
-                updated_at TIMESTAMP NOT NULL DEFAULT now()
-            );
-        """
-        )
-
-        cur.execute(
-            """
-            DO $$
-            BEGIN
-                -- Add farsi_title column if it doesn't exist
-                IF NOT EXISTS (
-                    SELECT 1 FROM information_schema.columns 
-                    WHERE table_name = 'articles' AND column_name = 'farsi_title'
-                ) THEN
-                    ALTER TABLE articles ADD COLUMN farsi_title TEXT NULL;
-                END IF;
-                
-                -- Add farsi_summary column if it doesn't exist
-                IF NOT EXISTS (
-                    SELECT 1 FROM information_schema.columns 
-                    WHERE table_name = 'articles' AND column_name = 'farsi_summary'
-                ) THEN
-                    ALTER TABLE articles ADD COLUMN farsi_summary TEXT NULL;
-                END IF;
-            END
-            $$;
-        """
-        )
-
-        cur.execute(
-            """
-            CREATE OR REPLACE FUNCTION update_updated_at_column()
-            RETURNS TRIGGER AS $$
-            BEGIN
-                NEW.updated_at = now();
-                RETURN NEW;
-            END;
-            $$ language 'plpgsql';
-        """
-        )
-
-        cur.execute(
-            """
-            DROP TRIGGER IF EXISTS set_updated_at ON articles;
-            CREATE TRIGGER set_updated_at
-            BEFORE UPDATE ON articles
-            FOR EACH ROW
-            EXECUTE PROCEDURE update_updated_at_column();
-        """
-        )
-
-        conn.commit()
-        cur.close()
-        conn.close()
-        self.logger.info("Article schema and triggers initialized with auto-migration.")
 
     def create_article(
         self,
@@ -87,24 +18,36 @@ class ArticleService:
         sent_to_telegram=False,
         farsi_title: str = None,
         farsi_summary: str = None,
+        topic: str = None,
+        on_created=None,
     ):
-        conn = self.db_service.get_connection()
-        cur = conn.cursor()
-
-        cur.execute(
-            """
-            INSERT INTO articles (title, summary, source, sent_to_telegram, farsi_title, farsi_summary)
-            VALUES (%s, %s, %s, %s, %s, %s)
-            ON CONFLICT (title) DO NOTHING
-            RETURNING id;
-        """,
-            (title, summary, source, sent_to_telegram, farsi_title, farsi_summary),
-        )
+        """
+        Returns the new article id, or None for a duplicate title.
+        `on_created(cur, article_id)` runs in the insert's transaction, so
+        rows it writes (e.g. outbox entries) commit or roll back with it.
+        """
+        with self.db_service.connection() as conn:
+            cur = conn.cursor()
+
+            cur.execute(
+                queries.CREATE_ARTICLE,
+                (
+                    title,
+                    summary,
+                    source,
+                    sent_to_telegram,
+                    farsi_title,
+                    farsi_summary,
+                    topic,
+                ),
+            )
 
-        row = cur.fetchone()
-        conn.commit()
-        cur.close()
-        conn.close()
+            row = cur.fetchone()
+            if row and on_created is not None:
+                on_created(cur, str(row[0]))
+            conn.commit()
+            self.db_service.note_write()
+            cur.close()
 
         if row:
             article_id = row[0]
@@ -112,40 +55,85 @@ class ArticleService:
             return str(article_id)
         else:
             self.logger.info(
-                f"Skipped insert: article with title '{title}' already exists."
+                f"Skipped insert: an article with the same normalized title as '{title}' exists."
             )
             return None
 
-    def get_article(self, article_id):
-        conn = self.db_service.get_connection()
-        cur = conn.cursor()
-
-        cur.execute(
-            """
-            SELECT id, title, summary, source, sent_to_telegram, created_at, updated_at, farsi_title, farsi_summary
-            FROM articles
-            WHERE id = %s;
-        """,
-            (uuid.UUID(article_id),),
+    def create_articles_bulk(
+        self, articles: list, page_size: int = 1000, on_created=None
+    ) -> list:
+        """
+        Inserts many articles in one transaction with multi-row INSERTs.
+        Each article is a dict with title, summary, source and optionally
+        sent_to_telegram, farsi_title, farsi_summary and topic.
+
+        Returns one {"title", "id", "inserted"} per input, in input order;
+        titles matching an existing one after normalization (including
+        earlier rows of the batch) are skipped with id None, like
+        create_article. `on_created(cur, position, article_id)` runs for
+        each inserted article inside the same transaction.
+        """
+        if not articles:
+            return []
+
+        rows = [
+            (
+                position,
+                article["title"],
+                article.get("summary"),
+                article["source"],
+                article.get("sent_to_telegram", False),
+                article.get("farsi_title"),
+                article.get("farsi_summary"),
+                article.get("topic"),
+            )
+            for position, article in enumerate(articles)
+        ]
+
+        with self.db_service.connection() as conn:
+            cur = conn.cursor()
+            inserted = execute_values(
+                cur,
+                queries.CREATE_ARTICLES_BULK,
+                rows,
+                page_size=page_size,
+                fetch=True,
+            )
+
+            # RETURNING order is not guaranteed, so match rows back by title
+            ids = {title: str(article_id) for article_id, title in inserted}
+            results = []
+            for position, article in enumerate(articles):
+                article_id = ids.pop(article["title"], None)
+                results.append(
+                    {
+                        "title": article["title"],
+                        "id": article_id,
+                        "inserted": article_id is not None,
+                    }
+                )
+                if article_id is not None and on_created is not None:
+                    on_created(cur, position, article_id)
+
+            conn.commit()
+            self.db_service.note_write()
+            cur.close()
+
+        self.logger.info(
+            f"Bulk insert: {len(inserted)} created, {len(articles) - len(inserted)} skipped"
         )
+        return results
 
-        row = cur.fetchone()
-        cur.close()
-        conn.close()
+    def get_article(self, article_id):
+        def fetch(conn):
+            cur = conn.cursor()
+            cur.execute(queries.GET_ARTICLE, (uuid.UUID(article_id),))
+            row = cur.fetchone()
+            cur.close()
+            return row
 
-        if row:
-            return {
-                "id": str(row[0]),
-                "title": row[1],
-                "summary": row[2],
-                "source": row[3],
-                "sent_to_telegram": row[4],
-                "created_at": row[5].isoformat(),
-                "updated_at": row[6].isoformat(),
-                "farsi_title": row[7],
-                "farsi_summary": row[8],
-            }
-        return None
+        row = self.db_service.read(fetch)
+        return queries.article_from_row(row) if row else None
 
     def update_article(
         self,
@@ -156,57 +144,39 @@ class ArticleService:
         sent_to_telegram=None,
         farsi_title=None,
         farsi_summary=None,
+        topic=None,
     ):
-        conn = self.db_service.get_connection()
-        cur = conn.cursor()
-
-        fields = []
-        values = []
-
-        if title is not None:
-            fields.append("title = %s")
-            values.append(title)
-        if summary is not None:
-            fields.append("summary = %s")
-            values.append(summary)
-        if source is not None:
-            fields.append("source = %s")
-            values.append(source)
-        if sent_to_telegram is not None:
-            fields.append("sent_to_telegram = %s")
-            values.append(sent_to_telegram)
-        if farsi_title is not None:
-            fields.append("farsi_title = %s")
-            values.append(farsi_title)
-        if farsi_summary is not None:
-            fields.append("farsi_summary = %s")
-            values.append(farsi_summary)
-
-        if not fields:
+        update = queries.update_article_query(
+            uuid.UUID(article_id),
+            title=title,
+            summary=summary,
+            source=source,
+            sent_to_telegram=sent_to_telegram,
+            farsi_title=farsi_title,
+            farsi_summary=farsi_summary,
+            topic=topic,
+        )
+        if update is None:
             return False
 
-        values.append(uuid.UUID(article_id))
-
-        query = f"UPDATE articles SET {', '.join(fields)} WHERE id = %s;"
-        cur.execute(query, tuple(values))
-
-        conn.commit()
-        cur.close()
-        conn.close()
+        with self.db_service.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(*update)
+            conn.commit()
+            self.db_service.note_write()
+            cur.close()
 
         self.logger.info(f"Updated article {article_id}")
         return True
 
     def delete_article(self, article_id):
-        conn = self.db_service.get_connection()
-        cur = conn.cursor()
-
-        cur.execute("DELETE FROM articles WHERE id = %s;", (uuid.UUID(article_id),))
-        deleted = cur.rowcount
-
-        conn.commit()
-        cur.close()
-        conn.close()
+        with self.db_service.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(queries.DELETE_ARTICLE, (uuid.UUID(article_id),))
+            deleted = cur.fetchone()[0]
+            conn.commit()
+            self.db_service.note_write()
+            cur.close()
 
         self.logger.info(
             f"Deleted article {article_id}"
@@ -216,53 +186,175 @@ class ArticleService:
         return deleted > 0
 
     def list_articles_filtered(
-        self, source=None, search=None, start_date=None, end_date=None, limit=20
+        self,
+        source=None,
+        search=None,
+        start_date=None,
+        end_date=None,
+        limit=20,
+        after=None,
+        topic=None,
+        locale=None,
     ):
-        conn = self.db_service.get_connection()
-        cur = conn.cursor()
+        query, params = queries.list_articles_query(
+            source=source,
+            search=search,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            after=after,
+            topic=topic,
+            locale=locale,
+        )
+
+        def fetch(conn):
+            cur = conn.cursor()
+            cur.execute(query, params)
+            rows = cur.fetchall()
+            cur.close()
+            return rows
+
+        rows = self.db_service.read(fetch)
+        return [queries.listed_article_from_row(row) for row in rows]
 
-        query = """
-            SELECT id, title, summary, source, sent_to_telegram, created_at, farsi_title, farsi_summary
-            FROM articles
-            WHERE 1=1
+    def list_articles_page(self, limit=20, after=None, **filters):
         """
-        params = []
-
-        if source:
-            query += " AND source = %s"
-            params.append(source)
-
-        if search:
-            query += " AND (title ILIKE %s OR summary ILIKE %s OR farsi_title ILIKE %s OR farsi_summary ILIKE %s)"
-            like_term = f"%{search}%"
-            params.extend([like_term, like_term, like_term, like_term])
-
-        if start_date:
-            query += " AND created_at >= %s"
-            params.append(start_date)
-
-        if end_date:
-            query += " AND created_at <= %s"
-            params.append(end_date)
-
-        query += " ORDER BY created_at DESC LIMIT %s"
-        params.append(limit)
-
-        cur.execute(query, tuple(params))
-        rows = cur.fetchall()
-        cur.close()
-        conn.close()
-
-        return [
-            {
-                "id": str(row[0]),
-                "title": row[1],
-                "summary": row[2],
-                "source": row[3],
-                "sent_to_telegram": row[4],
-                "created_at": row[5],
-                "farsi_title": row[6],
-                "farsi_summary": row[7],
-            }
-            for row in rows
-        ]
+        Returns (articles, next_cursor); pass next_cursor as `after` to get
+        the following page. next_cursor is None on the last page.
+        """
+        articles = self.list_articles_filtered(limit=limit, after=after, **filters)
+        return articles, queries.next_cursor(articles, limit)
+
+    def export_articles(self, batch_size: int = 5000, **filters):
+        """
+        Yields every article matching the list_articles_filtered filters,
+        in lists of up to `batch_size`. Rows are read through a server-side
+        cursor, so memory use does not grow with the result. Batches already
+        yielded cannot be taken back, so a replica failing mid-export raises
+        instead of restarting on the primary.
+        """
+        query, params = queries.list_articles_query(limit=None, **filters)
+        with self.db_service.read_connection() as conn:
+            cur = conn.cursor(name="article_export")
+            cur.execute(query, params)
+            while rows := cur.fetchmany(batch_size):
+                yield [queries.listed_article_from_row(row) for row in rows]
+            cur.close()
+
+
+class AsyncArticleService:
+    """
+    Async mirror of ArticleService for the FastAPI handlers, so reads do
+    not block the event loop.
+    """
+
+    def __init__(self, db_service: AsyncDatabaseService):
+        self.db_service = db_service
+        self.logger = db_service.logger
+
+    async def create_article(
+        self,
+        title: str,
+        summary: str,
+        source: str,
+        sent_to_telegram=False,
+        farsi_title: str = None,
+        farsi_summary: str = None,
+        topic: str = None,
+    ):
+        async with self.db_service.connection() as conn:
+            cur = await conn.execute(
+                queries.CREATE_ARTICLE,
+                (
+                    title,
+                    summary,
+                    source,
+                    sent_to_telegram,
+                    farsi_title,
+                    farsi_summary,
+                    topic,
+                ),
+            )
+            row = await cur.fetchone()
+        self.db_service.note_write()
+
+        if row:
+            self.logger.info(f"Created article {row[0]}")
+            return str(row[0])
+        self.logger.info(
+            f"Skipped insert: an article with the same normalized title as '{title}' exists."
+        )
+        return None
+
+    async def get_article(self, article_id):
+        async def fetch(conn):
+            cur = await conn.execute(queries.GET_ARTICLE, (uuid.UUID(article_id),))
+            return await cur.fetchone()
+
+        row = await self.db_service.read(fetch)
+        return queries.article_from_row(row) if row else None
+
+    async def update_article(self, article_id, **fields):
+        update = queries.update_article_query(uuid.UUID(article_id), **fields)
+        if update is None:
+            return False
+
+        async with self.db_service.connection() as conn:
+            await conn.execute(*update)
+        self.db_service.note_write()
+
+        self.logger.info(f"Updated article {article_id}")
+        return True
+
+    async def delete_article(self, article_id):
+        async with self.db_service.connection() as conn:
+            cur = await conn.execute(queries.DELETE_ARTICLE, (uuid.UUID(article_id),))
+            deleted = (await cur.fetchone())[0]
+        self.db_service.note_write()
+
+        return deleted > 0
+
+    async def list_articles_filtered(
+        self,
+        source=None,
+        search=None,
+        start_date=None,
+        end_date=None,
+        limit=20,
+        after=None,
+        topic=None,
+        locale=None,
+    ):
+        query, params = queries.list_articles_query(
+            source=source,
+            search=search,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            after=after,
+            topic=topic,
+            locale=locale,
+        )
+
+        async def fetch(conn):
+            cur = await conn.execute(query, params)
+            return await cur.fetchall()
+
+        rows = await self.db_service.read(fetch)
+        return [queries.listed_article_from_row(row) for row in rows]
+
+    async def list_articles_page(self, limit=20, after=None, **filters):
+        """Async counterpart of ArticleService.list_articles_page."""
+        articles = await self.list_articles_filtered(
+            limit=limit, after=after, **filters
+        )
+        return articles, queries.next_cursor(articles, limit)
+
+    async def export_articles(self, batch_size: int = 5000, **filters):
+        """Async counterpart of ArticleService.export_articles."""
+        query, params = queries.list_articles_query(limit=None, **filters)
+        async with self.db_service.read_connection() as conn:
+            async with conn.cursor(name="article_export") as cur:
+                await cur.execute(query, params)
+                while rows := await cur.fetchmany(batch_size):
+                    yield [queries.listed_article_from_row(row) for row in rows]
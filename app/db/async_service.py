@@ -0,0 +1,191 @@
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+import psycopg
+from psycopg_pool import AsyncConnectionPool, PoolTimeout
+from app.db.replicas import REPLICA_LAG, get_replica_router, pool_name
+from app.metrics.db import get_db_metrics
+from app.utils.logger import setup_logger
+
+
+class AsyncDatabaseService:
+    """
+    psycopg 3 async connection pool for code running on the event loop:
+    FastAPI handlers and the scheduler's job-run bookkeeping. Uses the same
+    DATABASE_URL and DB_POOL_MIN/DB_POOL_MAX as BaseDatabaseService; schema
+    migrations stay with BaseDatabaseService, which runs first at startup.
+
+    The pool is opened on first use, on the loop that uses it. Article
+    reads go through read_connection(), which uses the read replicas the
+    same way BaseDatabaseService does.
+    """
+
+    def __init__(self, db_url: str = None, replica_urls=None):
+        self.db_url = db_url or os.getenv("DATABASE_URL")
+        if not self.db_url:
+            raise RuntimeError("DATABASE_URL environment variable is not set.")
+
+        self.logger = setup_logger(self.__class__.__name__)
+        self.name = pool_name(self.db_url, "async:")
+        self.metrics = get_db_metrics()
+        self.replicas = get_replica_router(self.db_url, replica_urls)
+
+        # Keyed by URL: the primary and any replicas read from
+        self._pools = {}
+        self._open_lock = asyncio.Lock()
+
+    async def _get_pool(self, db_url: str = None) -> AsyncConnectionPool:
+        db_url = db_url or self.db_url
+        if db_url not in self._pools:
+            async with self._open_lock:
+                if db_url not in self._pools:
+                    replica = db_url != self.db_url
+                    name = pool_name(db_url, "async-replica:") if replica else self.name
+                    maxconn = int(os.getenv("DB_POOL_MAX", "10"))
+                    pool = AsyncConnectionPool(
+                        db_url,
+                        min_size=int(os.getenv("DB_POOL_MIN", "1")),
+                        max_size=maxconn,
+                        # Give up on a replica quickly and read from the primary
+                        timeout=5.0 if replica else 30.0,
+                        check=AsyncConnectionPool.check_connection,
+                        name=name,
+                        open=False,
+                    )
+                    await pool.open()
+                    self.metrics.pool_created(name, maxconn)
+                    self._pools[db_url] = pool
+        return self._pools[db_url]
+
+    @asynccontextmanager
+    async def connection(self):
+        """
+        Yields a pooled async connection. The transaction is committed when
+        the block exits normally and rolled back on error.
+        """
+        pool = await self._get_pool()
+        start = time.monotonic()
+        async with pool.connection() as conn:
+            self.metrics.connection_acquired(self.name, time.monotonic() - start)
+            try:
+                yield conn
+            finally:
+                self.metrics.connection_released(self.name)
+
+    async def _replica_connection(self):
+        """
+        Returns (replica_url, pool, conn) for a read, or None when it
+        should go to the primary: right after a write, or when the picked
+        replica is down or lags more than the router allows.
+        """
+        replica_url = self.replicas.pick()
+        if replica_url is None:
+            self.metrics.read_routed("primary")
+            return None
+
+        pool = await self._get_pool(replica_url)
+        start = time.monotonic()
+        try:
+            conn = await pool.getconn()
+        except (PoolTimeout, psycopg.OperationalError) as e:
+            self.logger.warning(f"Read replica unavailable, using primary: {e}")
+            self.replicas.mark_unavailable(replica_url)
+            self.metrics.read_routed("fallback")
+            return None
+        self.metrics.connection_acquired(pool.name, time.monotonic() - start)
+
+        if self.replicas.lag_check_due(replica_url):
+            try:
+                cur = await conn.execute(REPLICA_LAG)
+                lag = (await cur.fetchone())[0]
+            except psycopg.Error as e:
+                self.logger.warning(f"Read replica unavailable, using primary: {e}")
+                await self._release(pool, conn)
+                self.replicas.mark_unavailable(replica_url)
+                self.metrics.read_routed("fallback")
+                return None
+            if not self.replicas.record_lag(replica_url, lag):
+                self.logger.warning(f"Read replica is {lag:.1f}s behind, using primary")
+                await self._release(pool, conn)
+                self.metrics.read_routed("fallback")
+                return None
+
+        self.metrics.read_routed("replica")
+        return replica_url, pool, conn
+
+    async def _release(self, pool: AsyncConnectionPool, conn):
+        try:
+            # Reads only; end the transaction before the pool resets it
+            if not conn.closed:
+                await conn.rollback()
+        except psycopg.Error:
+            pass  # The pool discards broken connections
+        finally:
+            await pool.putconn(conn)
+            self.metrics.connection_released(pool.name)
+
+    @asynccontextmanager
+    async def read_connection(self):
+        """
+        Like connection(), for reads that tolerate replica lag. Falls back
+        to the primary right after a write and when the replica is down or
+        lagging. A replica failing inside the block is marked unavailable
+        and the error propagates; use read() for reads that can be retried.
+        """
+        replica = await self._replica_connection()
+        if replica is None:
+            async with self.connection() as conn:
+                yield conn
+            return
+
+        replica_url, pool, conn = replica
+        try:
+            yield conn
+        except psycopg.OperationalError:
+            self.replicas.mark_unavailable(replica_url)
+            raise
+        finally:
+            await self._release(pool, conn)
+
+    async def read(self, fn):
+        """
+        Returns await fn(conn) for a connection from read_connection(). If
+        the replica fails while fn runs, fn runs again on the primary, so
+        it must only read.
+        """
+        replica = await self._replica_connection()
+        if replica is not None:
+            replica_url, pool, conn = replica
+            try:
+                return await fn(conn)
+            except psycopg.OperationalError as e:
+                self.logger.warning(f"Read replica failed, retrying on primary: {e}")
+                self.replicas.mark_unavailable(replica_url)
+                self.metrics.read_routed("fallback")
+            finally:
+                await self._release(pool, conn)
+
+        async with self.connection() as conn:
+            return await fn(conn)
+
+    def note_write(self):
+        """Keeps this process's reads on the primary until replicas catch up."""
+        self.replicas.note_write()
+
+    async def close(self):
+        pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            await pool.close()
+
+
+# One async service per database URL, shared by the routers and every job
+_services = {}
+
+
+def get_async_database(db_url: str = None) -> AsyncDatabaseService:
+    """Get the shared async database service for a URL (default DATABASE_URL)."""
+    key = db_url or os.getenv("DATABASE_URL")
+    if key not in _services:
+        _services[key] = AsyncDatabaseService(key)
+    return _services[key]
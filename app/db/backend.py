@@ -0,0 +1,59 @@
+"""
+Picks the storage backend from DATABASE_URL: Postgres for postgresql://
+URLs, embedded SQLite for sqlite:///path. Callers get services with the
+same methods either way.
+"""
+
+import os
+import threading
+from app.db.article_service import ArticleService, AsyncArticleService
+from app.db.async_service import get_async_database
+from app.db.base_service import BaseDatabaseService
+from app.db.job_service import AsyncCronJobDBService, CronJobDBService
+from app.db.sqlite_service import (
+    AsyncSQLiteArticleService,
+    AsyncSQLiteCronJobDBService,
+    SQLiteArticleService,
+    SQLiteCronJobDBService,
+    SQLiteDatabaseService,
+)
+
+
+def is_sqlite(db_url: str = None) -> bool:
+    return (db_url or os.getenv("DATABASE_URL") or "").startswith("sqlite:")
+
+
+# One SQLite service per database file, shared by the API and every job
+_sqlite_services = {}
+_sqlite_services_lock = threading.Lock()
+
+
+def get_sqlite_database(db_url: str = None) -> SQLiteDatabaseService:
+    key = db_url or os.getenv("DATABASE_URL")
+    with _sqlite_services_lock:
+        if key not in _sqlite_services:
+            _sqlite_services[key] = SQLiteDatabaseService(key)
+        return _sqlite_services[key]
+
+
+def create_article_service(db_url: str = None):
+    if is_sqlite(db_url):
+        return SQLiteArticleService(get_sqlite_database(db_url))
+
+    return ArticleService(BaseDatabaseService(db_url))
+
+
+def create_async_article_service(db_url: str = None):
+    if is_sqlite(db_url):
+        return AsyncSQLiteArticleService(create_article_service(db_url))
+
+    return AsyncArticleService(get_async_database(db_url))
+
+
+def create_job_db_services(db_url: str = None) -> tuple:
+    """Returns the (sync, async) job-run services."""
+    if is_sqlite(db_url):
+        jobs = SQLiteCronJobDBService(get_sqlite_database(db_url))
+        return jobs, AsyncSQLiteCronJobDBService(jobs)
+
+    return CronJobDBService(db_url), AsyncCronJobDBService(get_async_database(db_url))
@@ -1,18 +1,47 @@
 import os
+import threading
 import psycopg2
+from contextlib import contextmanager
 from psycopg2 import sql
+from psycopg2.extras import register_uuid
 from urllib.parse import urlparse
+from app.db.migrations import MigrationRunner
+from app.db.pool import ConnectionPool, PooledConnection
+from app.db.replicas import REPLICA_LAG, get_replica_router, pool_name
+from app.metrics.db import get_db_metrics
 from app.utils.logger import setup_logger
 
+# Let psycopg2 pass uuid.UUID parameters (article ids, pagination cursors)
+register_uuid()
+
+# One pool per database URL, shared by every service instance in the process
+_pools = {}
+_pools_lock = threading.Lock()
+
 
 class BaseDatabaseService:
-    def __init__(self, db_url: str = None):
+    """
+    Database settings and pooled connections. Every instance for the same
+    DATABASE_URL shares one ConnectionPool (sized by DB_POOL_MIN and
+    DB_POOL_MAX), so services and jobs reuse connections instead of paying
+    a TCP and auth handshake per query.
+
+    Creating the pool also brings the schema up to date, see
+    app.db.migrations.
+
+    With read replicas (`replica_urls`, or DATABASE_REPLICA_URLS), article
+    reads use read_connection(), routed by app.db.replicas.ReplicaRouter.
+    """
+
+    def __init__(self, db_url: str = None, replica_urls=None):
         self.db_url = db_url or os.getenv("DATABASE_URL")
         if not self.db_url:
             raise RuntimeError("DATABASE_URL environment variable is not set.")
 
         self.logger = setup_logger(self.__class__.__name__)
         self.parsed_url = urlparse(self.db_url)
+        self.replicas = get_replica_router(self.db_url, replica_urls)
+        self.metrics = get_db_metrics()
 
         self.dbname = self.parsed_url.path.lstrip("/")
         self.user = self.parsed_url.username
@@ -20,7 +49,30 @@ class BaseDatabaseService:
         self.host = self.parsed_url.hostname
         self.port = self.parsed_url.port or 5432
 
-        self._ensure_database_exists()
+        with _pools_lock:
+            self.pool = _pools.get(self.db_url)
+            if self.pool is None:
+                self._ensure_database_exists()
+                self.pool = ConnectionPool(
+                    name=f"{self.host}/{self.dbname}",
+                    minconn=int(os.getenv("DB_POOL_MIN", "1")),
+                    maxconn=int(os.getenv("DB_POOL_MAX", "10")),
+                    dbname=self.dbname,
+                    user=self.user,
+                    password=self.password,
+                    host=self.host,
+                    port=self.port,
+                )
+                # Schema DDL runs here, once per process and only when the
+                # recorded schema_version is behind. The pool is only shared
+                # once that succeeded, so a failed migration is retried by the
+                # next service instead of leaving it an unmigrated schema.
+                try:
+                    MigrationRunner(self).run()
+                except Exception:
+                    self.pool.closeall()
+                    raise
+                _pools[self.db_url] = self.pool
 
     def _ensure_database_exists(self):
         conn = psycopg2.connect(
@@ -49,12 +101,126 @@ class BaseDatabaseService:
         conn.close()
 
     def get_connection(self):
-        connection = psycopg2.connect(
-            dbname=self.dbname,
-            user=self.user,
-            password=self.password,
-            host=self.host,
-            port=self.port,
-        )
+        """
+        Checks a connection out of the pool. Calling close() on it returns it
+        to the pool; prefer the connection() context manager.
+        """
+        connection = PooledConnection(self.pool, self.pool.getconn())
         self.logger.debug("Connected to database.")
         return connection
+
+    @contextmanager
+    def connection(self):
+        """
+        Yields a pooled connection and returns it to the pool afterwards.
+        Uncommitted work is rolled back on return.
+        """
+        conn = self.pool.getconn()
+        try:
+            yield conn
+        finally:
+            self.pool.putconn(conn)
+
+    def _replica_pool(self, replica_url: str) -> ConnectionPool:
+        # Replicas share the registry but are never created or migrated
+        with _pools_lock:
+            pool = _pools.get(replica_url)
+            if pool is None:
+                pool = ConnectionPool(
+                    name=pool_name(replica_url, "replica:"),
+                    minconn=int(os.getenv("DB_POOL_MIN", "1")),
+                    maxconn=int(os.getenv("DB_POOL_MAX", "10")),
+                    timeout=5.0,
+                    dsn=replica_url,
+                )
+                _pools[replica_url] = pool
+            return pool
+
+    def _replica_connection(self):
+        """
+        Returns (replica_url, pool, conn) for a read, or None when it
+        should go to the primary: right after a write, or when the picked
+        replica is down or lags more than the router allows.
+        """
+        replica_url = self.replicas.pick()
+        if replica_url is None:
+            self.metrics.read_routed("primary")
+            return None
+
+        try:
+            pool = self._replica_pool(replica_url)
+            conn = pool.getconn()
+        except (psycopg2.Error, RuntimeError) as e:
+            self.logger.warning(f"Read replica unavailable, using primary: {e}")
+            self.replicas.mark_unavailable(replica_url)
+            self.metrics.read_routed("fallback")
+            return None
+
+        if self.replicas.lag_check_due(replica_url):
+            try:
+                cur = conn.cursor()
+                cur.execute(REPLICA_LAG)
+                lag = cur.fetchone()[0]
+                cur.close()
+            except psycopg2.Error as e:
+                self.logger.warning(f"Read replica unavailable, using primary: {e}")
+                pool.putconn(conn)
+                self.replicas.mark_unavailable(replica_url)
+                self.metrics.read_routed("fallback")
+                return None
+            if not self.replicas.record_lag(replica_url, lag):
+                self.logger.warning(f"Read replica is {lag:.1f}s behind, using primary")
+                pool.putconn(conn)
+                self.metrics.read_routed("fallback")
+                return None
+
+        self.metrics.read_routed("replica")
+        return replica_url, pool, conn
+
+    @contextmanager
+    def read_connection(self):
+        """
+        Like connection(), for reads that tolerate replica lag. Falls back
+        to the primary right after a write and when the replica is down or
+        lagging. A replica failing inside the block is marked unavailable
+        and the error propagates; use read() for reads that can be retried.
+        """
+        replica = self._replica_connection()
+        if replica is None:
+            with self.connection() as conn:
+                yield conn
+            return
+
+        replica_url, pool, conn = replica
+        try:
+            yield conn
+        except psycopg2.OperationalError:
+            self.replicas.mark_unavailable(replica_url)
+            raise
+        finally:
+            pool.putconn(conn)
+
+    def read(self, fn):
+        """
+        Returns fn(conn) for a connection from read_connection(). If the
+        replica fails while fn runs, fn runs again on the primary, so it
+        must only read.
+        """
+        replica = self._replica_connection()
+        if replica is not None:
+            replica_url, pool, conn = replica
+            try:
+                return fn(conn)
+            except psycopg2.OperationalError as e:
+                self.logger.warning(f"Read replica failed, retrying on primary: {e}")
+                self.replicas.mark_unavailable(replica_url)
+                self.metrics.read_routed("fallback")
+            finally:
+                pool.putconn(conn)
+
+        with self.connection() as conn:
+            return fn(conn)
+
+    def note_write(self):
+        """Keeps this process's reads on the primary until replicas catch up."""
+        self.replicas.note_write()
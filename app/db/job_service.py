@@ -1,117 +1,90 @@
 from datetime import datetime
+from app.db import queries
+from app.db.async_service import AsyncDatabaseService, get_async_database
 from app.db.base_service import BaseDatabaseService
 
 
 class CronJobDBService(BaseDatabaseService):
-    def __init__(self, db_url: str = None):
-        super().__init__(db_url)
-        self._schema()
-
-    def _schema(self):
-        """Ensure cron_job_runs table exists."""
-        conn = self.get_connection()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS cron_job_runs (
-                id SERIAL PRIMARY KEY,
-                job_name TEXT NOT NULL,
-                scheduled_time TIMESTAMPTZ NOT NULL,
-                retry_count INT DEFAULT 0,
-                status TEXT CHECK (status IN ('pending', 'running', 'completed', 'failed')) DEFAULT 'pending',
-                last_error TEXT,
-                duration_seconds NUMERIC,
-                created_at TIMESTAMPTZ DEFAULT NOW(),
-                updated_at TIMESTAMPTZ DEFAULT NOW()
-            );
-        """
-        )
-        conn.commit()
-        cur.close()
-        conn.close()
-
-    def create_job_run(self, job_name: str, scheduled_time: datetime):
-        conn = self.get_connection()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO cron_job_runs (job_name, scheduled_time)
-            VALUES (%s, %s)
-            RETURNING id;
-        """,
-            (job_name, scheduled_time),
-        )
-        job_id = cur.fetchone()[0]
-        conn.commit()
-        cur.close()
-        conn.close()
+    def start_job_run(
+        self, job_name: str, scheduled_time: datetime, job_id: int = None
+    ) -> int:
+        """Marks a run as running, creating it when job_id is None. Returns its id."""
+        with self.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(queries.START_JOB_RUN, (job_id, job_name, scheduled_time))
+            job_id = cur.fetchone()[0]
+            conn.commit()
+            cur.close()
         return job_id
 
     def get_hanging_jobs(self, job_name: str) -> list:
         """Jobs stuck in 'running' state after crash."""
-        conn = self.get_connection()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT id, scheduled_time, retry_count
-            FROM cron_job_runs
-            WHERE job_name = %s
-              AND status != 'completed'
-              AND retry_count < 3
-            ORDER BY scheduled_time ASC;
-        """,
-            (job_name,),
-        )
-        rows = cur.fetchall()
-        cur.close()
-        conn.close()
-        return [{"id": r[0], "scheduled_time": r[1], "retry_count": r[2]} for r in rows]
-
-    def mark_job_running(self, job_id: int):
-        conn = self.get_connection()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            UPDATE cron_job_runs
-            SET status = 'running', updated_at = NOW()
-            WHERE id = %s;
-        """,
-            (job_id,),
-        )
-        conn.commit()
-        cur.close()
-        conn.close()
+        with self.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(queries.GET_HANGING_JOBS, (job_name,))
+            rows = cur.fetchall()
+            cur.close()
+        return [queries.hanging_job_from_row(r) for r in rows]
 
     def mark_job_completed(self, job_id: int, duration: float):
-        conn = self.get_connection()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            UPDATE cron_job_runs
-            SET status = 'completed', duration_seconds = %s, updated_at = NOW()
-            WHERE id = %s;
-        """,
-            (duration, job_id),
-        )
-        conn.commit()
-        cur.close()
-        conn.close()
+        self._run_update(queries.MARK_JOB_COMPLETED, (duration, job_id))
 
     def mark_job_failed(self, job_id: int, error_message: str, duration: float):
-        conn = self.get_connection()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            UPDATE cron_job_runs
-            SET status = 'failed',
-                retry_count = retry_count + 1,
-                last_error = %s,
-                duration_seconds = %s,
-                updated_at = NOW()
-            WHERE id = %s;
-        """,
-            (error_message, duration, job_id),
-        )
-        conn.commit()
-        cur.close()
-        conn.close()
+        self._run_update(queries.MARK_JOB_FAILED, (error_message, duration, job_id))
+
+    def compact_job_runs(self, retention_days: int = 30) -> int:
+        """
+        Folds finished runs older than `retention_days` into per-day rows of
+        cron_job_daily_stats. Returns the number of runs compacted.
+        """
+        with self.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(queries.COMPACT_JOB_RUNS, (retention_days,))
+            compacted = cur.fetchone()[0]
+            conn.commit()
+            cur.close()
+        return compacted
+
+    def _run_update(self, query: str, params: tuple):
+        with self.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(query, params)
+            conn.commit()
+            cur.close()
+
+
+class AsyncCronJobDBService:
+    """
+    Async mirror of CronJobDBService, used by the scheduler so job-run
+    bookkeeping never blocks the event loop.
+    """
+
+    def __init__(self, db_service: AsyncDatabaseService = None):
+        self.db_service = db_service or get_async_database()
+        self.logger = self.db_service.logger
+
+    async def start_job_run(
+        self, job_name: str, scheduled_time: datetime, job_id: int = None
+    ) -> int:
+        async with self.db_service.connection() as conn:
+            cur = await conn.execute(
+                queries.START_JOB_RUN, (job_id, job_name, scheduled_time)
+            )
+            return (await cur.fetchone())[0]
+
+    async def get_hanging_jobs(self, job_name: str) -> list:
+        """Jobs stuck in 'running' state after crash."""
+        async with self.db_service.connection() as conn:
+            cur = await conn.execute(queries.GET_HANGING_JOBS, (job_name,))
+            rows = await cur.fetchall()
+        return [queries.hanging_job_from_row(r) for r in rows]
+
+    async def mark_job_completed(self, job_id: int, duration: float):
+        async with self.db_service.connection() as conn:
+            await conn.execute(queries.MARK_JOB_COMPLETED, (duration, job_id))
+
+    async def mark_job_failed(self, job_id: int, error_message: str, duration: float):
+        async with self.db_service.connection() as conn:
+            await conn.execute(
+                queries.MARK_JOB_FAILED, (error_message, duration, job_id)
+            )
@@ -0,0 +1,444 @@
+import psycopg2
+from psycopg2 import errors
+from app.db import queries
+
+# Arbitrary key for pg_advisory_xact_lock, shared by every process that migrates
+MIGRATION_LOCK_ID = 72_403_117
+
+# (version, description, statements), applied in order. Never edit an
+# applied migration; append a new one. Migrations 1-8 are idempotent so a
+# database created before schema_version existed is adopted as-is.
+MIGRATIONS = [
+    (
+        1,
+        "articles table and updated_at trigger",
+        [
+            'CREATE EXTENSION IF NOT EXISTS "uuid-ossp";',
+            """
+            CREATE TABLE IF NOT EXISTS articles (
+                id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+                title TEXT NOT NULL UNIQUE,
+                summary TEXT,
+                source TEXT NOT NULL,
+                sent_to_telegram BOOLEAN NOT NULL DEFAULT FALSE,
+                created_at TIMESTAMP NOT NULL DEFAULT now(),
+                updated_at TIMESTAMP NOT NULL DEFAULT now()
+            );
+            """,
+            "ALTER TABLE articles ADD COLUMN IF NOT EXISTS farsi_title TEXT NULL;",
+            "ALTER TABLE articles ADD COLUMN IF NOT EXISTS farsi_summary TEXT NULL;",
+            """
+            CREATE OR REPLACE FUNCTION update_updated_at_column()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                NEW.updated_at = now();
+                RETURN NEW;
+            END;
+            $$ language 'plpgsql';
+            """,
+            """
+            DROP TRIGGER IF EXISTS set_updated_at ON articles;
+            CREATE TRIGGER set_updated_at
+            BEFORE UPDATE ON articles
+            FOR EACH ROW
+            EXECUTE PROCEDURE update_updated_at_column();
+            """,
+        ],
+    ),
+    (
+        2,
+        "articles full-text search",
+        # Weighted tsvectors kept up to date by Postgres. There is no Persian
+        # text search config, so Farsi uses 'simple' (no stemming) after
+        # folding Arabic yeh/kaf to their Persian forms.
+        [
+            """
+            ALTER TABLE articles
+            ADD COLUMN IF NOT EXISTS search_en tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(summary, '')), 'B')
+            ) STORED;
+            """,
+            f"""
+            ALTER TABLE articles
+            ADD COLUMN IF NOT EXISTS search_fa tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('simple', {queries.farsi_folded_sql("farsi_title")}), 'A') ||
+                setweight(to_tsvector('simple', {queries.farsi_folded_sql("farsi_summary")}), 'B')
+            ) STORED;
+            """,
+            "CREATE INDEX IF NOT EXISTS articles_search_en_idx ON articles USING GIN (search_en);",
+            "CREATE INDEX IF NOT EXISTS articles_search_fa_idx ON articles USING GIN (search_fa);",
+        ],
+    ),
+    (
+        3,
+        "articles keyset pagination indexes",
+        [
+            """
+            CREATE INDEX IF NOT EXISTS articles_created_at_idx
+            ON articles (created_at DESC, id DESC);
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS articles_source_created_at_idx
+            ON articles (source, created_at DESC, id DESC);
+            """,
+        ],
+    ),
+    (
+        4,
+        "cron_job_runs table",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS cron_job_runs (
+                id SERIAL PRIMARY KEY,
+                job_name TEXT NOT NULL,
+                scheduled_time TIMESTAMPTZ NOT NULL,
+                retry_count INT DEFAULT 0,
+                status TEXT CHECK (status IN ('pending', 'running', 'completed', 'failed')) DEFAULT 'pending',
+                last_error TEXT,
+                duration_seconds NUMERIC,
+                created_at TIMESTAMPTZ DEFAULT NOW(),
+                updated_at TIMESTAMPTZ DEFAULT NOW()
+            );
+            """,
+        ],
+    ),
+    (
+        5,
+        "outbox table",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS outbox (
+                id BIGSERIAL PRIMARY KEY,
+                article_id UUID,
+                topic TEXT NOT NULL,
+                locale TEXT NOT NULL,
+                chat_id BIGINT,
+                payload JSONB NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending'
+                    CHECK (status IN ('pending', 'sending', 'delivered', 'failed')),
+                attempts INT NOT NULL DEFAULT 0,
+                last_error TEXT,
+                next_attempt_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                locked_at TIMESTAMPTZ,
+                locked_by TEXT,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                delivered_at TIMESTAMPTZ
+            );
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS outbox_undelivered_idx
+            ON outbox (next_attempt_at, id)
+            WHERE status IN ('pending', 'sending');
+            """,
+        ],
+    ),
+    (
+        6,
+        "translation_memory table",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS translation_memory (
+                source_text TEXT PRIMARY KEY,
+                farsi_text TEXT NOT NULL,
+                approved BOOLEAN NOT NULL DEFAULT FALSE,
+                hits INT NOT NULL DEFAULT 0,
+                created_at TIMESTAMP NOT NULL DEFAULT now(),
+                updated_at TIMESTAMP NOT NULL DEFAULT now()
+            );
+            """,
+        ],
+    ),
+    (
+        7,
+        "telegram_subscriptions table",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS telegram_subscriptions (
+                topic TEXT NOT NULL,
+                locale TEXT NOT NULL,
+                chat_id BIGINT NOT NULL,
+                created_at TIMESTAMP NOT NULL DEFAULT now(),
+                PRIMARY KEY (topic, locale, chat_id)
+            );
+            """,
+        ],
+    ),
+    (
+        8,
+        "articles dedupe on a normalized title hash",
+        [
+            f"""
+            ALTER TABLE articles
+            ADD COLUMN IF NOT EXISTS title_hash BIGINT GENERATED ALWAYS AS (
+                {queries.title_hash_sql("title")}
+            ) STORED;
+            """,
+            # New articles claim their hash here first. Variants stored before
+            # normalization existed are kept; only new rows are deduplicated
+            """
+            CREATE TABLE IF NOT EXISTS article_keys (
+                title_hash BIGINT PRIMARY KEY,
+                created_at TIMESTAMP NOT NULL DEFAULT now()
+            );
+            """,
+            """
+            INSERT INTO article_keys (title_hash, created_at)
+            SELECT title_hash, min(created_at) FROM articles GROUP BY title_hash
+            ON CONFLICT DO NOTHING;
+            """,
+            # The 8-byte hash replaces the B-tree over full title text
+            "ALTER TABLE articles DROP CONSTRAINT IF EXISTS articles_title_key;",
+            "CREATE INDEX IF NOT EXISTS articles_source_hash_idx ON articles USING HASH (source);",
+        ],
+    ),
+    (
+        9,
+        "articles partitioned by month",
+        [
+            # Free the names the partitioned table and its indexes take over
+            "ALTER TABLE articles RENAME TO articles_unpartitioned;",
+            "ALTER TABLE articles_unpartitioned RENAME CONSTRAINT articles_pkey TO articles_unpartitioned_pkey;",
+            """
+            DROP INDEX articles_search_en_idx, articles_search_fa_idx,
+                articles_created_at_idx, articles_source_created_at_idx,
+                articles_source_hash_idx;
+            """,
+            # The primary key has to include the partition key
+            f"""
+            CREATE TABLE articles (
+                id UUID NOT NULL DEFAULT uuid_generate_v4(),
+                title TEXT NOT NULL,
+                summary TEXT,
+                source TEXT NOT NULL,
+                sent_to_telegram BOOLEAN NOT NULL DEFAULT FALSE,
+                created_at TIMESTAMP NOT NULL DEFAULT now(),
+                updated_at TIMESTAMP NOT NULL DEFAULT now(),
+                farsi_title TEXT NULL,
+                farsi_summary TEXT NULL,
+                search_en tsvector GENERATED ALWAYS AS (
+                    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                    setweight(to_tsvector('english', coalesce(summary, '')), 'B')
+                ) STORED,
+                search_fa tsvector GENERATED ALWAYS AS (
+                    setweight(to_tsvector('simple', {queries.farsi_folded_sql("farsi_title")}), 'A') ||
+                    setweight(to_tsvector('simple', {queries.farsi_folded_sql("farsi_summary")}), 'B')
+                ) STORED,
+                title_hash BIGINT GENERATED ALWAYS AS (
+                    {queries.title_hash_sql("title")}
+                ) STORED,
+                PRIMARY KEY (id, created_at)
+            ) PARTITION BY RANGE (created_at);
+            """,
+            "CREATE INDEX articles_search_en_idx ON articles USING GIN (search_en);",
+            "CREATE INDEX articles_search_fa_idx ON articles USING GIN (search_fa);",
+            "CREATE INDEX articles_created_at_idx ON articles (created_at DESC, id DESC);",
+            "CREATE INDEX articles_source_created_at_idx ON articles (source, created_at DESC, id DESC);",
+            "CREATE INDEX articles_source_hash_idx ON articles USING HASH (source);",
+            """
+            CREATE TRIGGER set_updated_at
+            BEFORE UPDATE ON articles
+            FOR EACH ROW
+            EXECUTE PROCEDURE update_updated_at_column();
+            """,
+            # One partition per month of existing data, plus the next three;
+            # ArticlePartitionService keeps creating them from here on
+            """
+            DO $$
+            DECLARE
+                month_start DATE;
+            BEGIN
+                FOR month_start IN
+                    SELECT generate_series(
+                        date_trunc('month', least(min(created_at), localtimestamp)),
+                        date_trunc('month', localtimestamp) + interval '3 months',
+                        interval '1 month'
+                    )::date
+                    FROM articles_unpartitioned
+                LOOP
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF articles FOR VALUES FROM (%L) TO (%L)',
+                        'articles_' || to_char(month_start, 'YYYY_MM'),
+                        month_start,
+                        month_start + interval '1 month'
+                    );
+                END LOOP;
+            END
+            $$;
+            """,
+            """
+            INSERT INTO articles (id, title, summary, source, sent_to_telegram,
+                created_at, updated_at, farsi_title, farsi_summary)
+            SELECT id, title, summary, source, sent_to_telegram,
+                created_at, updated_at, farsi_title, farsi_summary
+            FROM articles_unpartitioned;
+            """,
+            "DROP TABLE articles_unpartitioned;",
+        ],
+    ),
+    (
+        10,
+        "articles topic column",
+        [
+            "ALTER TABLE articles ADD COLUMN IF NOT EXISTS topic TEXT NULL;",
+            """
+            CREATE INDEX IF NOT EXISTS articles_topic_created_at_idx
+            ON articles (topic, created_at DESC, id DESC);
+            """,
+            # Earlier articles only recorded their topic on the outbox rows
+            """
+            UPDATE articles a
+            SET topic = o.topic
+            FROM (
+                SELECT DISTINCT ON (article_id) article_id, topic
+                FROM outbox
+                WHERE article_id IS NOT NULL
+                ORDER BY article_id, id
+            ) o
+            WHERE a.id = o.article_id AND a.topic IS NULL;
+            """,
+        ],
+    ),
+    (
+        11,
+        "articles partial index for the Farsi feed",
+        [
+            """
+            CREATE INDEX IF NOT EXISTS articles_farsi_created_at_idx
+            ON articles (created_at DESC, id DESC)
+            WHERE farsi_title IS NOT NULL AND farsi_summary IS NOT NULL;
+            """,
+        ],
+    ),
+    (
+        12,
+        "cron_job_runs unfinished-run index and daily stats",
+        [
+            """
+            CREATE INDEX IF NOT EXISTS cron_job_runs_unfinished_idx
+            ON cron_job_runs (job_name, scheduled_time)
+            WHERE status != 'completed' AND retry_count < 3;
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS cron_job_daily_stats (
+                job_name TEXT NOT NULL,
+                day DATE NOT NULL,
+                runs INT NOT NULL,
+                completed INT NOT NULL,
+                failed INT NOT NULL,
+                retries INT NOT NULL,
+                total_duration_seconds NUMERIC NOT NULL,
+                max_duration_seconds NUMERIC,
+                PRIMARY KEY (job_name, day)
+            );
+            """,
+        ],
+    ),
+    (
+        13,
+        "outbox progress of partially sent messages",
+        [
+            "ALTER TABLE outbox ADD COLUMN IF NOT EXISTS remaining JSONB;",
+        ],
+    ),
+    (
+        14,
+        "seeded_defaults marker table",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS seeded_defaults (
+                name TEXT PRIMARY KEY,
+                seeded_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            );
+            """,
+            # Deployments that already have subscriptions were seeded before
+            """
+            INSERT INTO seeded_defaults (name)
+            SELECT 'telegram_subscriptions'
+            WHERE EXISTS (SELECT 1 FROM telegram_subscriptions)
+            ON CONFLICT DO NOTHING;
+            """,
+        ],
+    ),
+    (
+        15,
+        "articles default partition",
+        [
+            # Catches rows outside the pre-created months (a long-missed
+            # maintenance run, imported history) instead of failing the insert
+            "CREATE TABLE IF NOT EXISTS articles_default PARTITION OF articles DEFAULT;",
+        ],
+    ),
+]
+
+
+class MigrationRunner:
+    """
+    Applies MIGRATIONS that are newer than the version recorded in
+    schema_version. An up-to-date database costs one SELECT; otherwise the
+    pending migrations run in a single transaction under an advisory lock,
+    so concurrent processes starting together migrate once.
+    """
+
+    def __init__(self, db_service, migrations: list = None):
+        self.db_service = db_service
+        self.logger = db_service.logger
+        self.migrations = migrations or MIGRATIONS
+        self.latest = self.migrations[-1][0]
+
+    def current_version(self, cur) -> int:
+        try:
+            cur.execute("SELECT coalesce(max(version), 0) FROM schema_version;")
+            return cur.fetchone()[0]
+        except errors.UndefinedTable:
+            cur.connection.rollback()
+            return 0
+
+    def run(self) -> int:
+        """Migrates to the latest version. Returns the number of migrations applied."""
+        with self.db_service.connection() as conn:
+            cur = conn.cursor()
+            if self.current_version(cur) >= self.latest:
+                conn.rollback()
+                cur.close()
+                self.logger.info(f"Schema is up to date (version {self.latest}).")
+                return 0
+
+            try:
+                cur.execute("SELECT pg_advisory_xact_lock(%s);", (MIGRATION_LOCK_ID,))
+                cur.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS schema_version (
+                        version INT PRIMARY KEY,
+                        description TEXT NOT NULL,
+                        applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+                    );
+                """
+                )
+
+                # Another process may have migrated while we waited for the lock
+                current = self.current_version(cur)
+                applied = 0
+                for version, description, statements in self.migrations:
+                    if version <= current:
+                        continue
+                    self.logger.info(f"Applying migration {version}: {description}")
+                    for statement in statements:
+                        cur.execute(statement)
+                    cur.execute(
+                        "INSERT INTO schema_version (version, description) VALUES (%s, %s);",
+                        (version, description),
+                    )
+                    applied += 1
+
+                conn.commit()
+            except psycopg2.Error:
+                conn.rollback()
+                raise
+            finally:
+                cur.close()
+
+        self.logger.info(
+            f"Schema migrated to version {self.latest} ({applied} applied)."
+        )
+        return applied
@@ -0,0 +1,205 @@
+import json
+from psycopg2.extras import Json, execute_values
+from app.db.base_service import BaseDatabaseService
+from app.db.subscription_service import SubscriptionService
+
+
+class OutboxService:
+    """
+    Postgres-backed outbox for Telegram delivery. Jobs enqueue one row per
+    locale and subscribed chat, so a failure in one chat is retried on its
+    own; delivery workers claim rows with FOR UPDATE SKIP LOCKED, so
+    several workers can drain the queue in parallel, and retry failures
+    with exponential backoff without touching the LLM again.
+
+    Jobs enqueue on the cursor that inserts the article, so an article is
+    never stored without its outbox rows. A message that failed partway
+    keeps the parts it has yet to send in `remaining`, and a retry
+    resumes from there.
+    """
+
+    def __init__(
+        self,
+        db_service: BaseDatabaseService,
+        subscriptions: SubscriptionService = None,
+    ):
+        self.db_service = db_service
+        self.subscriptions = subscriptions
+        self.logger = db_service.logger
+
+    def enqueue(
+        self,
+        headline: dict,
+        topic: str,
+        article_id: str = None,
+        locales=("english", "farsi"),
+        chat_id: int = None,
+        cur=None,
+    ) -> list:
+        """
+        Queues a headline for delivery, one row per locale and chat. Without
+        an explicit chat_id, every chat subscribed to the topic gets a row.
+        With `cur`, the rows are written in the caller's transaction and
+        committed by the caller. Returns the row ids.
+        """
+        targets = []
+        for locale in locales:
+            if chat_id is not None or self.subscriptions is None:
+                targets.append((locale, chat_id))
+            else:
+                targets.extend(
+                    (locale, subscribed)
+                    for subscribed in self.subscriptions.chats_for(topic, locale)
+                )
+
+        if not targets:
+            self.logger.warning(f"No outbox targets for {topic}, nothing enqueued")
+            return []
+
+        rows = [
+            (article_id, topic, locale, target, Json(headline))
+            for locale, target in targets
+        ]
+        if cur is not None:
+            ids = self._insert(cur, rows)
+        else:
+            with self.db_service.connection() as conn:
+                cur = conn.cursor()
+                ids = self._insert(cur, rows)
+                conn.commit()
+                cur.close()
+
+        self.logger.info(f"Enqueued {len(ids)} outbox message(s) for {topic}")
+        return ids
+
+    def _insert(self, cur, rows: list) -> list:
+        inserted = execute_values(
+            cur,
+            """
+            INSERT INTO outbox (article_id, topic, locale, chat_id, payload)
+            VALUES %s
+            RETURNING id;
+        """,
+            rows,
+            fetch=True,
+        )
+        return [row[0] for row in inserted]
+
+    def claim(self, worker_id: str, limit: int = 10, lease_seconds: int = 300) -> list:
+        """
+        Claims up to `limit` due rows for this worker. Rows stuck in
+        'sending' longer than `lease_seconds` (crashed worker) are reclaimed.
+        """
+        with self.db_service.connection() as conn:
+            cur = conn.cursor()
+
+            cur.execute(
+                """
+                UPDATE outbox
+                SET status = 'sending',
+                    locked_at = now(),
+                    locked_by = %s,
+                    attempts = attempts + 1
+                WHERE id IN (
+                    SELECT id FROM outbox
+                    WHERE (status = 'pending' AND next_attempt_at <= now())
+                       OR (status = 'sending' AND locked_at < now() - %s * interval '1 second')
+                    ORDER BY id
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING id, article_id, topic, locale, chat_id, payload, attempts, remaining;
+            """,
+                (worker_id, lease_seconds, limit),
+            )
+            rows = cur.fetchall()
+            conn.commit()
+            cur.close()
+
+        return sorted(
+            [
+                {
+                    "id": r[0],
+                    "article_id": str(r[1]) if r[1] else None,
+                    "topic": r[2],
+                    "locale": r[3],
+                    "chat_id": r[4],
+                    "payload": r[5] if isinstance(r[5], dict) else json.loads(r[5]),
+                    "attempts": r[6],
+                    "remaining": (
+                        r[7]
+                        if r[7] is None or isinstance(r[7], dict)
+                        else json.loads(r[7])
+                    ),
+                }
+                for r in rows
+            ],
+            key=lambda row: row["id"],
+        )
+
+    def mark_delivered(self, outbox_id: int):
+        """Marks a row delivered, and its article sent once all its rows are delivered."""
+        with self.db_service.connection() as conn:
+            cur = conn.cursor()
+
+            cur.execute(
+                """
+                WITH done AS (
+                    UPDATE outbox
+                    SET status = 'delivered', delivered_at = now(), locked_at = NULL,
+                        last_error = NULL, remaining = NULL
+                    WHERE id = %s
+                    RETURNING article_id
+                )
+                UPDATE articles
+                SET sent_to_telegram = TRUE
+                WHERE id = (SELECT article_id FROM done)
+                  AND NOT EXISTS (
+                      SELECT 1 FROM outbox
+                      WHERE article_id = (SELECT article_id FROM done)
+                        AND id <> %s
+                        AND status <> 'delivered'
+                  );
+            """,
+                (outbox_id, outbox_id),
+            )
+
+            conn.commit()
+            cur.close()
+
+    def mark_failed(
+        self,
+        outbox_id: int,
+        error_message: str,
+        max_attempts: int = 8,
+        remaining: dict = None,
+    ):
+        """
+        Schedules a retry with exponential backoff, or gives up after
+        max_attempts. `remaining` ({"chat_id", "requests"}) records the
+        parts not sent yet when the message failed partway; a retry sends
+        only those.
+        """
+        with self.db_service.connection() as conn:
+            cur = conn.cursor()
+
+            cur.execute(
+                """
+                UPDATE outbox
+                SET status = CASE WHEN attempts >= %s THEN 'failed' ELSE 'pending' END,
+                    last_error = %s,
+                    locked_at = NULL,
+                    remaining = coalesce(%s, remaining),
+                    next_attempt_at = now() + LEAST(power(2, attempts) * 30, 3600) * interval '1 second'
+                WHERE id = %s;
+            """,
+                (
+                    max_attempts,
+                    error_message,
+                    Json(remaining) if remaining is not None else None,
+                    outbox_id,
+                ),
+            )
+
+            conn.commit()
+            cur.close()
@@ -0,0 +1,210 @@
+import gzip
+import os
+import re
+from datetime import date
+from psycopg2 import sql
+from app.db.base_service import BaseDatabaseService
+
+PARTITION_NAME = re.compile(r"^articles_(\d{4})_(\d{2})$")
+
+DEFAULT_PARTITION = "articles_default"
+
+# Every non-generated column, for moving rows out of the default partition
+MOVED_COLUMNS = sql.SQL(
+    "id, title, summary, source, sent_to_telegram, created_at, updated_at, "
+    "farsi_title, farsi_summary, topic"
+)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"articles_{month:%Y_%m}"
+
+
+class ArticlePartitionService:
+    """
+    Maintains the monthly partitions of `articles`: creates the current
+    month and `months_ahead` future ones, and applies the retention policy.
+    Rows that landed in the default partition get their month's partition
+    as well and are moved into it.
+
+    With `retention_months` set, partitions that ended more than that many
+    months ago are detached, so listings and searches never touch them.
+    With `archive_dir` set as well, a detached partition is exported to
+    `<archive_dir>/<partition>.csv.gz` and dropped; otherwise it is kept
+    as a standalone table. Title keys of expired months are released too.
+    """
+
+    def __init__(
+        self,
+        db_service: BaseDatabaseService,
+        months_ahead: int = 3,
+        retention_months: int = None,
+        archive_dir: str = None,
+    ):
+        self.db_service = db_service
+        self.logger = db_service.logger
+        self.months_ahead = months_ahead
+        self.retention_months = retention_months
+        self.archive_dir = archive_dir
+
+    def partitions(self, cur) -> dict:
+        """Returns {month: partition name} for the attached monthly partitions."""
+        cur.execute(
+            """
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'articles'::regclass;
+        """
+        )
+        months = {}
+        for (name,) in cur.fetchall():
+            match = PARTITION_NAME.match(name)
+            if match:
+                months[date(int(match[1]), int(match[2]), 1)] = name
+        return months
+
+    def current_month(self, cur) -> date:
+        # The database clock fills created_at, so it decides the month
+        cur.execute("SELECT date_trunc('month', localtimestamp)::date;")
+        return cur.fetchone()[0]
+
+    def default_months(self, cur) -> set:
+        """Months of the rows currently held by the default partition."""
+        cur.execute(
+            sql.SQL(
+                "SELECT DISTINCT date_trunc('month', created_at)::date FROM {};"
+            ).format(sql.Identifier(DEFAULT_PARTITION))
+        )
+        return {row[0] for row in cur.fetchall()}
+
+    def ensure_partitions(self) -> list:
+        """
+        Creates missing partitions up to `months_ahead`, and for every month
+        with rows in the default partition. Returns their names.
+        """
+        created = []
+        with self.db_service.connection() as conn:
+            cur = conn.cursor()
+            # Keeps inserts from adding to the default partition while its
+            # rows are moved out
+            cur.execute(
+                sql.SQL("LOCK TABLE {} IN SHARE ROW EXCLUSIVE MODE;").format(
+                    sql.Identifier(DEFAULT_PARTITION)
+                )
+            )
+            current = self.current_month(cur)
+            existing = self.partitions(cur)
+            stranded = self.default_months(cur)
+            months = {
+                add_months(current, offset) for offset in range(self.months_ahead + 1)
+            }
+
+            for month in sorted((months | stranded) - set(existing)):
+                name = partition_name(month)
+                bounds = (month, add_months(month, 1))
+                if month in stranded:
+                    self._move_out_of_default(cur, bounds)
+                cur.execute(
+                    sql.SQL(
+                        "CREATE TABLE IF NOT EXISTS {} PARTITION OF articles FOR VALUES FROM (%s) TO (%s);"
+                    ).format(sql.Identifier(name)),
+                    bounds,
+                )
+                if month in stranded:
+                    cur.execute(
+                        sql.SQL(
+                            "INSERT INTO articles ({columns}) SELECT {columns} FROM articles_moved;"
+                        ).format(columns=MOVED_COLUMNS)
+                    )
+                    cur.execute("DROP TABLE articles_moved;")
+                created.append(name)
+
+            conn.commit()
+            cur.close()
+
+        if created:
+            self.logger.info(f"Created article partitions: {', '.join(created)}")
+        return created
+
+    def _move_out_of_default(self, cur, bounds: tuple):
+        """
+        Moves a month's rows from the default partition into the temp table
+        articles_moved; a partition cannot be created while the default
+        one holds rows in its range.
+        """
+        cur.execute(
+            sql.SQL(
+                "CREATE TEMP TABLE articles_moved AS SELECT {columns} FROM articles WITH NO DATA;"
+            ).format(columns=MOVED_COLUMNS)
+        )
+        cur.execute(
+            sql.SQL(
+                """
+                WITH moved AS (
+                    DELETE FROM {default}
+                    WHERE created_at >= %s AND created_at < %s
+                    RETURNING {columns}
+                )
+                INSERT INTO articles_moved SELECT * FROM moved;
+            """
+            ).format(default=sql.Identifier(DEFAULT_PARTITION), columns=MOVED_COLUMNS),
+            bounds,
+        )
+        self.logger.info(
+            f"Moving {cur.rowcount} article(s) from {DEFAULT_PARTITION} to their {bounds[0]:%Y-%m} partition"
+        )
+
+    def apply_retention(self) -> list:
+        """
+        Detaches (and archives, with `archive_dir`) partitions older than
+        the retention window. Returns the detached partition names.
+        """
+        if not self.retention_months:
+            return []
+
+        detached = []
+        with self.db_service.connection() as conn:
+            cur = conn.cursor()
+            cutoff = add_months(self.current_month(cur), -self.retention_months)
+
+            for month, name in sorted(self.partitions(cur).items()):
+                if add_months(month, 1) > cutoff:
+                    continue
+
+                cur.execute(
+                    sql.SQL("ALTER TABLE articles DETACH PARTITION {};").format(
+                        sql.Identifier(name)
+                    )
+                )
+                if self.archive_dir:
+                    self._export(cur, name)
+                    cur.execute(sql.SQL("DROP TABLE {};").format(sql.Identifier(name)))
+                detached.append(name)
+
+            cur.execute("DELETE FROM article_keys WHERE created_at < %s;", (cutoff,))
+            conn.commit()
+            cur.close()
+
+        if detached:
+            self.logger.info(
+                f"Detached article partitions older than {cutoff}: {', '.join(detached)}"
+            )
+        return detached
+
+    def _export(self, cur, name: str):
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = os.path.join(self.archive_dir, f"{name}.csv.gz")
+        with gzip.open(path, "wb") as archive:
+            cur.copy_expert(
+                sql.SQL("COPY {} TO STDOUT WITH (FORMAT csv, HEADER)")
+                .format(sql.Identifier(name))
+                .as_string(cur),
+                archive,
+            )
+        self.logger.info(f"Archived {name} to {path}")
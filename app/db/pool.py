@@ -0,0 +1,127 @@
+import threading
+import time
+import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from psycopg2.pool import ThreadedConnectionPool
+from app.metrics.db import get_db_metrics
+from app.utils.logger import setup_logger
+
+
+class ConnectionPool:
+    """
+    Thread-safe psycopg2 connection pool.
+
+    Unlike ThreadedConnectionPool on its own, callers wait up to `timeout`
+    seconds for a free connection instead of failing once `maxconn` are in
+    use. A connection that sat idle longer than `health_check_after` seconds
+    is checked with `SELECT 1` before it is handed out, and replaced if it
+    is broken. Connections are rolled back when returned, so no transaction
+    is left open between callers.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        minconn: int = 1,
+        maxconn: int = 10,
+        timeout: float = 30.0,
+        health_check_after: float = 30.0,
+        **connect_kwargs,
+    ):
+        self.name = name
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.health_check_after = health_check_after
+        self.logger = setup_logger(self.__class__.__name__)
+        self.metrics = get_db_metrics()
+
+        self._pool = ThreadedConnectionPool(minconn, maxconn, **connect_kwargs)
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._idle_since = {}
+        self.metrics.pool_created(name, maxconn)
+
+    def getconn(self):
+        start = time.monotonic()
+        if not self._slots.acquire(timeout=self.timeout):
+            self.metrics.acquire_timed_out(self.name)
+            raise RuntimeError(
+                f"Timed out after {self.timeout}s waiting for a database connection ({self.name})"
+            )
+
+        try:
+            conn = self._pool.getconn()
+            if not self._is_healthy(conn):
+                self.metrics.health_check_failed(self.name)
+                self.logger.warning(f"Replacing broken pooled connection ({self.name})")
+                self._pool.putconn(conn, close=True)
+                conn = self._pool.getconn()
+                self._idle_since.pop(id(conn), None)
+        except Exception:
+            self._slots.release()
+            raise
+
+        self.metrics.connection_acquired(self.name, time.monotonic() - start)
+        return conn
+
+    def putconn(self, conn):
+        try:
+            if not conn.closed and (
+                conn.get_transaction_status() != TRANSACTION_STATUS_IDLE
+            ):
+                conn.rollback()
+            self._pool.putconn(conn, close=bool(conn.closed))
+            # The pool closes connections beyond minconn; only track kept ones
+            if not conn.closed:
+                self._idle_since[id(conn)] = time.monotonic()
+        except psycopg2.Error as e:
+            self.logger.warning(f"Discarding connection that failed to reset: {e}")
+            self._pool.putconn(conn, close=True)
+        finally:
+            self._slots.release()
+            self.metrics.connection_released(self.name)
+
+    def _is_healthy(self, conn) -> bool:
+        # Checked-out connections are not tracked, so a later connection
+        # reusing this id() cannot inherit its timestamp
+        idle_since = self._idle_since.pop(id(conn), None)
+        if conn.closed:
+            return False
+
+        if (
+            idle_since is None
+            or time.monotonic() - idle_since < self.health_check_after
+        ):
+            return True
+
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1;")
+            cur.close()
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def closeall(self):
+        self._pool.closeall()
+        self._idle_since.clear()
+
+
+class PooledConnection:
+    """
+    A pooled psycopg2 connection. Behaves like the connection itself, but
+    close() hands it back to the pool instead of closing it, so callers
+    written against plain psycopg2.connect keep working.
+    """
+
+    def __init__(self, pool: ConnectionPool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def close(self):
+        if self._conn is not None:
+            self._pool.putconn(self._conn)
+            self._conn = None
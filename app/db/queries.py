@@ -0,0 +1,367 @@
+"""
+SQL shared by the sync (psycopg2) and async (psycopg 3) services. Both
+drivers use %s placeholders, so every statement and row mapping is
+written once here and the two service flavours cannot drift apart.
+"""
+
+import base64
+import hashlib
+import re
+import uuid
+from datetime import datetime
+
+# ---------------- articles ----------------
+
+# Arabic code points commonly typed for their Persian look-alikes
+FARSI_FOLDING = {"ي": "ی", "ى": "ی", "ك": "ک", "ة": "ه", "ۀ": "ه"}
+
+
+def fold_farsi(text: str) -> str:
+    """Folds Arabic yeh/kaf/teh marbuta to Persian, as search_fa does."""
+    return text.translate(str.maketrans(FARSI_FOLDING))
+
+
+def farsi_folded_sql(column: str) -> str:
+    """SQL expression applying the same folding as fold_farsi to a column."""
+    source = "".join(FARSI_FOLDING)
+    target = "".join(FARSI_FOLDING.values())
+    return f"translate(coalesce({column}, ''), '{source}', '{target}')"
+
+
+def title_hash_sql(column: str) -> str:
+    """
+    SQL expression for a 64-bit hash of the normalized title: lowercased,
+    with runs of whitespace and punctuation collapsed to one space, so
+    trivial variants of an LLM title collide.
+    """
+    normalized = f"btrim(regexp_replace(lower({column}), '[^[:alnum:]]+', ' ', 'g'))"
+    return f"('x' || substr(md5({normalized}), 1, 16))::bit(64)::bigint"
+
+
+def title_hash(title: str) -> int:
+    """
+    Client-side title hash for the SQLite backend. Not interchangeable with
+    title_hash_sql: Python's Unicode lower() and \\w differ from Postgres
+    lower() and [:alnum:] under the database locale, so some titles hash
+    differently. Hashes only ever compare within one backend.
+    """
+    normalized = re.sub(r"[\W_]+", " ", title.lower()).strip(" ")
+    value = int(hashlib.md5(normalized.encode()).hexdigest()[:16], 16)
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+# A partitioned table cannot hold a unique index without the partition
+# key, so titles are deduplicated through article_keys: an article is only
+# inserted when its normalized title hash was claimed there. Input rows are
+# (ord, title, summary, source, sent_to_telegram, farsi_title, farsi_summary,
+# topic);
+# the first row per hash, by ord, wins within a batch.
+_INSERT_ARTICLES = f"""
+    WITH input (ord, title, summary, source, sent_to_telegram, farsi_title, farsi_summary, topic) AS (
+        VALUES {{values}}
+    ),
+    hashed AS (
+        SELECT DISTINCT ON (title_hash) input.*, {title_hash_sql("input.title")} AS title_hash
+        FROM input
+        ORDER BY title_hash, ord
+    ),
+    claimed AS (
+        INSERT INTO article_keys (title_hash)
+        SELECT title_hash FROM hashed
+        ON CONFLICT DO NOTHING
+        RETURNING title_hash
+    )
+    INSERT INTO articles (title, summary, source, sent_to_telegram, farsi_title, farsi_summary, topic)
+    SELECT h.title, h.summary, h.source, h.sent_to_telegram::boolean, h.farsi_title, h.farsi_summary, h.topic
+    FROM hashed h
+    JOIN claimed USING (title_hash)
+    RETURNING id, title;
+"""
+
+CREATE_ARTICLE = _INSERT_ARTICLES.format(values="(0, %s, %s, %s, %s, %s, %s, %s)")
+
+# execute_values template; RETURNING title maps inserted ids back to the input
+CREATE_ARTICLES_BULK = _INSERT_ARTICLES.format(values="%s")
+
+GET_ARTICLE = """
+    SELECT id, title, summary, source, sent_to_telegram, created_at, updated_at, farsi_title, farsi_summary, topic
+    FROM articles
+    WHERE id = %s;
+"""
+
+# Releases the title key unless an older variant (kept by migration 8)
+# still holds it. Returns the number of articles deleted.
+DELETE_ARTICLE = """
+    WITH deleted AS (
+        DELETE FROM articles WHERE id = %s RETURNING id, title_hash
+    ),
+    released AS (
+        DELETE FROM article_keys k
+        USING deleted d
+        WHERE k.title_hash = d.title_hash
+          AND NOT EXISTS (
+              SELECT 1 FROM articles a
+              WHERE a.title_hash = d.title_hash AND a.id <> d.id
+          )
+    )
+    SELECT count(*) FROM deleted;
+"""
+
+
+def article_from_row(row) -> dict:
+    """Maps a GET_ARTICLE row."""
+    return {
+        "id": str(row[0]),
+        "title": row[1],
+        "summary": row[2],
+        "source": row[3],
+        "sent_to_telegram": row[4],
+        "created_at": row[5].isoformat(),
+        "updated_at": row[6].isoformat(),
+        "farsi_title": row[7],
+        "farsi_summary": row[8],
+        "topic": row[9],
+    }
+
+
+# Article columns callers may change
+UPDATABLE_COLUMNS = (
+    "title",
+    "summary",
+    "source",
+    "sent_to_telegram",
+    "farsi_title",
+    "farsi_summary",
+    "topic",
+)
+
+
+def update_article_query(article_id, **fields):
+    """
+    Builds the UPDATE for the given non-None fields.
+    Returns (query, params), or None when there is nothing to update.
+    """
+    assignments = []
+    values = []
+    for column in UPDATABLE_COLUMNS:
+        if fields.get(column) is not None:
+            assignments.append(f"{column} = %s")
+            values.append(fields[column])
+
+    if not assignments:
+        return None
+
+    values.append(article_id)
+    return f"UPDATE articles SET {', '.join(assignments)} WHERE id = %s;", tuple(values)
+
+
+def encode_cursor(created_at, article_id, rank=None) -> str:
+    """Opaque keyset cursor pointing just past the given row."""
+    parts = [created_at.isoformat(), str(article_id)]
+    if rank is not None:
+        parts.append(repr(float(rank)))
+    return base64.urlsafe_b64encode("|".join(parts).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    Returns (created_at, id, rank) from encode_cursor output; rank is None
+    for non-search listings. Raises ValueError for a malformed cursor.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        parts = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        created_at = datetime.fromisoformat(parts[0])
+        article_id = uuid.UUID(parts[1])
+        rank = float(parts[2]) if len(parts) > 2 else None
+    except (ValueError, IndexError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    return created_at, article_id, rank
+
+
+def list_articles_query(
+    source=None,
+    search=None,
+    start_date=None,
+    end_date=None,
+    limit=20,
+    after=None,
+    topic=None,
+    locale=None,
+):
+    """
+    Builds the filtered article listing. Returns (query, params).
+
+    Pages with keyset pagination: `after` is the cursor of the previous
+    page's last row, so every page is an index range scan that costs the
+    same as the first one (articles_created_at_idx, or the source/topic
+    index when filtering by one of them). The Farsi locale only lists
+    translated rows, served by the partial articles_farsi_created_at_idx.
+    """
+    # ts_rank is float4; as float8 the value the cursor carries (repr of a
+    # Python float) compares back exactly, so pages neither repeat nor skip
+    rank = "(ts_rank(search_en, q_en) + ts_rank(search_fa, q_fa))::float8"
+    query = """
+        SELECT id, title, summary, source, sent_to_telegram, created_at, farsi_title, farsi_summary, topic"""
+    params = []
+
+    if search:
+        # Web-search syntax ("quoted phrases", -exclusions, OR) against both
+        # languages; the GIN indexes on search_en and search_fa serve the OR
+        query += f""", {rank} AS rank
+        FROM articles,
+            websearch_to_tsquery('english', %s) AS q_en,
+            websearch_to_tsquery('simple', %s) AS q_fa
+        WHERE (search_en @@ q_en OR search_fa @@ q_fa)"""
+        params.extend([search, fold_farsi(search)])
+    else:
+        query += " FROM articles WHERE 1=1"
+
+    if source:
+        query += " AND source = %s"
+        params.append(source)
+
+    if topic:
+        query += " AND topic = %s"
+        params.append(topic)
+
+    if locale == "farsi":
+        # Repeats the partial index predicate so the planner can use it
+        query += (
+            " AND farsi_title IS NOT NULL AND farsi_summary IS NOT NULL"
+            " AND farsi_title <> '' AND farsi_summary <> ''"
+        )
+
+    if start_date:
+        query += " AND created_at >= %s"
+        params.append(start_date)
+
+    if end_date:
+        query += " AND created_at <= %s"
+        params.append(end_date)
+
+    if after:
+        created_at, article_id, after_rank = decode_cursor(after)
+        if search:
+            if after_rank is None:
+                raise ValueError("Cursor does not belong to a search listing")
+            query += f" AND ({rank}, created_at, id) < (%s::float8, %s, %s)"
+            params.extend([after_rank, created_at, article_id])
+        else:
+            query += " AND (created_at, id) < (%s, %s)"
+            params.extend([created_at, article_id])
+
+    if search:
+        query += f" ORDER BY {rank} DESC, created_at DESC, id DESC"
+    else:
+        query += " ORDER BY created_at DESC, id DESC"
+
+    # Exports pass limit=None and read the whole range through a cursor
+    if limit is not None:
+        query += " LIMIT %s"
+        params.append(limit)
+
+    return query, tuple(params)
+
+
+def listed_article_from_row(row) -> dict:
+    """Maps a list_articles_query row."""
+    article = {
+        "id": str(row[0]),
+        "title": row[1],
+        "summary": row[2],
+        "source": row[3],
+        "sent_to_telegram": row[4],
+        "created_at": row[5],
+        "farsi_title": row[6],
+        "farsi_summary": row[7],
+        "topic": row[8],
+    }
+    if len(row) > 9:
+        article["rank"] = row[9]
+    return article
+
+
+def next_cursor(articles: list, limit: int):
+    """Cursor for the page after `articles`, or None if this was the last page."""
+    if not articles or len(articles) < limit:
+        return None
+    last = articles[-1]
+    return encode_cursor(last["created_at"], last["id"], last.get("rank"))
+
+
+# ---------------- cron job runs ----------------
+
+# Served by the partial cron_job_runs_unfinished_idx
+GET_HANGING_JOBS = """
+    SELECT id, scheduled_time, retry_count
+    FROM cron_job_runs
+    WHERE job_name = %s
+      AND status != 'completed'
+      AND retry_count < 3
+    ORDER BY scheduled_time ASC;
+"""
+
+# Creates the run on its first attempt and marks it running again on
+# retries, so an attempt costs this statement plus one to finish it
+START_JOB_RUN = """
+    INSERT INTO cron_job_runs (id, job_name, scheduled_time, status)
+    VALUES (coalesce(%s::int, nextval('cron_job_runs_id_seq')), %s, %s, 'running')
+    ON CONFLICT (id) DO UPDATE
+    SET status = 'running', updated_at = NOW()
+    RETURNING id;
+"""
+
+MARK_JOB_COMPLETED = """
+    UPDATE cron_job_runs
+    SET status = 'completed', duration_seconds = %s, updated_at = NOW()
+    WHERE id = %s;
+"""
+
+MARK_JOB_FAILED = """
+    UPDATE cron_job_runs
+    SET status = 'failed',
+        retry_count = retry_count + 1,
+        last_error = %s,
+        duration_seconds = %s,
+        updated_at = NOW()
+    WHERE id = %s;
+"""
+
+
+# Folds finished runs (completed, or failed with no retries left) older
+# than the retention window into cron_job_daily_stats and deletes them
+COMPACT_JOB_RUNS = """
+    WITH compacted AS (
+        DELETE FROM cron_job_runs
+        WHERE (status = 'completed' OR retry_count >= 3)
+          AND scheduled_time < NOW() - %s * interval '1 day'
+        RETURNING job_name, scheduled_time, status, retry_count, duration_seconds
+    ),
+    aggregated AS (
+        INSERT INTO cron_job_daily_stats AS stats
+            (job_name, day, runs, completed, failed, retries, total_duration_seconds, max_duration_seconds)
+        SELECT job_name,
+               (scheduled_time AT TIME ZONE 'UTC')::date,
+               count(*),
+               count(*) FILTER (WHERE status = 'completed'),
+               count(*) FILTER (WHERE status != 'completed'),
+               coalesce(sum(retry_count), 0),
+               coalesce(sum(duration_seconds), 0),
+               max(duration_seconds)
+        FROM compacted
+        GROUP BY 1, 2
+        ON CONFLICT (job_name, day) DO UPDATE
+        SET runs = stats.runs + EXCLUDED.runs,
+            completed = stats.completed + EXCLUDED.completed,
+            failed = stats.failed + EXCLUDED.failed,
+            retries = stats.retries + EXCLUDED.retries,
+            total_duration_seconds = stats.total_duration_seconds + EXCLUDED.total_duration_seconds,
+            max_duration_seconds = greatest(stats.max_duration_seconds, EXCLUDED.max_duration_seconds)
+    )
+    SELECT count(*) FROM compacted;
+"""
+
+
+def hanging_job_from_row(row) -> dict:
+    return {"id": row[0], "scheduled_time": row[1], "retry_count": row[2]}
@@ -0,0 +1,114 @@
+import itertools
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+
+# Seconds the replica is behind the primary. A replica that has replayed
+# everything it received is current, however old its last transaction is.
+REPLICA_LAG = """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END::float8;
+"""
+
+
+def pool_name(db_url: str, prefix: str = "") -> str:
+    parsed_url = urlparse(db_url)
+    return f"{prefix}{parsed_url.hostname}/{parsed_url.path.lstrip('/')}"
+
+
+class ReplicaRouter:
+    """
+    Picks the database for article reads. Reads go to the read replicas in
+    turn, as long as their replay lag is within `max_staleness` seconds.
+    The services measure the lag with REPLICA_LAG at most every
+    `lag_check_interval` seconds per replica and report it to record_lag();
+    a replica found lagging is skipped until the next check.
+
+    Within `max_staleness` seconds of this process writing articles, reads
+    go to the primary, so callers see their own writes.
+
+    Shared by the sync and async services of one primary, so a write from
+    a job steers the next API read as well. A replica that failed is
+    skipped for `cooldown` seconds.
+    """
+
+    def __init__(
+        self,
+        replica_urls: list,
+        max_staleness: float = 5.0,
+        cooldown: float = 30.0,
+        lag_check_interval: float = 1.0,
+    ):
+        self.replica_urls = list(replica_urls)
+        self.max_staleness = max_staleness
+        self.cooldown = cooldown
+        self.lag_check_interval = lag_check_interval
+        self._cycle = itertools.cycle(self.replica_urls)
+        self._lock = threading.Lock()
+        self._last_write = float("-inf")
+        self._unavailable_until = {}
+        self._lag_checked_at = {}
+
+    def note_write(self):
+        self._last_write = time.monotonic()
+
+    def pick(self):
+        """Returns the replica URL to read from, or None for the primary."""
+        if not self.replica_urls:
+            return None
+        now = time.monotonic()
+        if now - self._last_write < self.max_staleness:
+            return None
+        with self._lock:
+            for _ in self.replica_urls:
+                replica_url = next(self._cycle)
+                if self._unavailable_until.get(replica_url, 0) <= now:
+                    return replica_url
+        return None
+
+    def mark_unavailable(self, replica_url: str):
+        with self._lock:
+            self._unavailable_until[replica_url] = time.monotonic() + self.cooldown
+
+    def lag_check_due(self, replica_url: str) -> bool:
+        last_check = self._lag_checked_at.get(replica_url, float("-inf"))
+        return time.monotonic() - last_check >= self.lag_check_interval
+
+    def record_lag(self, replica_url: str, lag: float) -> bool:
+        """Stores a lag measurement. Returns whether the replica is fresh enough."""
+        now = time.monotonic()
+        with self._lock:
+            self._lag_checked_at[replica_url] = now
+            if lag <= self.max_staleness:
+                return True
+            self._unavailable_until[replica_url] = now + self.lag_check_interval
+            return False
+
+
+# One router per primary URL
+_routers = {}
+_routers_lock = threading.Lock()
+
+
+def get_replica_router(db_url: str, replica_urls=None) -> ReplicaRouter:
+    """
+    Get the shared router for a primary. Replicas default to the
+    comma-separated DATABASE_REPLICA_URLS; staleness to
+    DB_REPLICA_MAX_STALENESS seconds, which bounds both the replay lag of
+    the replicas read from and the read-your-writes window.
+    """
+    with _routers_lock:
+        if db_url not in _routers:
+            if replica_urls is None:
+                replica_urls = os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+            elif isinstance(replica_urls, str):
+                replica_urls = [replica_urls]
+            _routers[db_url] = ReplicaRouter(
+                [url.strip() for url in replica_urls if url.strip()],
+                max_staleness=float(os.getenv("DB_REPLICA_MAX_STALENESS", "5")),
+            )
+        return _routers[db_url]
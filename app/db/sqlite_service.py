@@ -0,0 +1,706 @@
+import asyncio
+import os
+import re
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse
+from app.db import queries
+from app.utils.logger import setup_logger
+
+# Bump when SCHEMA changes; stored in PRAGMA user_version
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    summary TEXT,
+    source TEXT NOT NULL,
+    sent_to_telegram INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    farsi_title TEXT,
+    farsi_summary TEXT,
+    topic TEXT,
+    title_hash INTEGER NOT NULL UNIQUE
+);
+
+CREATE INDEX IF NOT EXISTS articles_created_at_idx ON articles (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS articles_source_created_at_idx ON articles (source, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS articles_topic_created_at_idx ON articles (topic, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS articles_farsi_created_at_idx ON articles (created_at DESC, id DESC)
+    WHERE farsi_title IS NOT NULL AND farsi_summary IS NOT NULL;
+
+-- Full-text index over the article columns; Farsi is folded like search_fa
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, summary, farsi_title, farsi_summary,
+    content='articles', content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, title, summary, farsi_title, farsi_summary)
+    VALUES (new.rowid, new.title, new.summary, fold_farsi(new.farsi_title), fold_farsi(new.farsi_summary));
+END;
+
+CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, summary, farsi_title, farsi_summary)
+    VALUES ('delete', old.rowid, old.title, old.summary, fold_farsi(old.farsi_title), fold_farsi(old.farsi_summary));
+END;
+
+CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, summary, farsi_title, farsi_summary)
+    VALUES ('delete', old.rowid, old.title, old.summary, fold_farsi(old.farsi_title), fold_farsi(old.farsi_summary));
+    INSERT INTO articles_fts (rowid, title, summary, farsi_title, farsi_summary)
+    VALUES (new.rowid, new.title, new.summary, fold_farsi(new.farsi_title), fold_farsi(new.farsi_summary));
+END;
+
+CREATE TABLE IF NOT EXISTS cron_job_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_name TEXT NOT NULL,
+    scheduled_time TEXT NOT NULL,
+    retry_count INTEGER DEFAULT 0,
+    status TEXT CHECK (status IN ('pending', 'running', 'completed', 'failed')) DEFAULT 'pending',
+    last_error TEXT,
+    duration_seconds REAL,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS cron_job_runs_unfinished_idx ON cron_job_runs (job_name, scheduled_time)
+    WHERE status != 'completed' AND retry_count < 3;
+
+CREATE TABLE IF NOT EXISTS cron_job_daily_stats (
+    job_name TEXT NOT NULL,
+    day TEXT NOT NULL,
+    runs INTEGER NOT NULL,
+    completed INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    retries INTEGER NOT NULL,
+    total_duration_seconds REAL NOT NULL,
+    max_duration_seconds REAL,
+    PRIMARY KEY (job_name, day)
+);
+"""
+
+ARTICLE_COLUMNS = "id, title, summary, source, sent_to_telegram, created_at, farsi_title, farsi_summary, topic"
+
+SEARCH_TOKENS = re.compile(r'-?"[^"]*"|\S+')
+
+
+def timestamp(value: datetime) -> str:
+    """Fixed-width text timestamp, so string order is time order."""
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def fts5_query(search: str):
+    """
+    Translates the web-search syntax /rss accepts ("quoted phrases",
+    -exclusions, or) into an FTS5 query. Returns None when nothing is left
+    to match.
+    """
+    include = []
+    exclude = []
+    for token in SEARCH_TOKENS.findall(queries.fold_farsi(search)):
+        if token.lower() == "or":
+            if include and include[-1] != "OR":
+                include.append("OR")
+            continue
+        negative = token.startswith("-") and len(token) > 1
+        term = token[1:] if negative else token
+        term = term.strip('"').replace('"', '""')
+        if not term.strip():
+            continue
+        (exclude if negative else include).append(f'"{term}"')
+
+    if include and include[-1] == "OR":
+        include.pop()
+    if not include:
+        return None
+    query = " ".join(include)
+    for term in exclude:
+        query = f"({query}) NOT {term}"
+    return query
+
+
+def article_from_row(row) -> dict:
+    """Maps an ARTICLE_COLUMNS row (plus rank when searching)."""
+    article = {
+        "id": row[0],
+        "title": row[1],
+        "summary": row[2],
+        "source": row[3],
+        "sent_to_telegram": bool(row[4]),
+        "created_at": datetime.fromisoformat(row[5]),
+        "farsi_title": row[6],
+        "farsi_summary": row[7],
+        "topic": row[8],
+    }
+    if len(row) > 9:
+        article["rank"] = row[9]
+    return article
+
+
+class SQLiteDatabaseService:
+    """
+    Embedded storage for single-node deployments, local runs and
+    benchmarks, selected with DATABASE_URL=sqlite:///path/to/news.db.
+    Each thread gets its own connection; WAL mode lets the API read while a
+    job writes. The schema is created on first use and only re-applied
+    when SCHEMA_VERSION changes.
+    """
+
+    def __init__(self, db_url: str = None):
+        self.db_url = db_url or os.getenv("DATABASE_URL")
+        parsed_url = urlparse(self.db_url)
+        if parsed_url.scheme != "sqlite":
+            raise RuntimeError(f"Not a sqlite:// URL: {self.db_url}")
+
+        # sqlite:///relative.db and sqlite:////absolute/path.db
+        self.path = parsed_url.path[1:]
+        # Every thread opens its own connection, and each in-memory
+        # connection would be a separate, empty database
+        if self.path in ("", ":memory:"):
+            raise RuntimeError(
+                f"SQLite needs a database file, in-memory databases are not supported: {self.db_url}"
+            )
+        self.logger = setup_logger(self.__class__.__name__)
+        self._local = threading.local()
+        self._init_schema()
+
+    def connect(self) -> sqlite3.Connection:
+        """Opens a new connection; prefer connection() for regular work."""
+        conn = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        conn.create_function(
+            "fold_farsi",
+            1,
+            lambda text: queries.fold_farsi(text) if text else text,
+            deterministic=True,
+        )
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """
+        Yields this thread's connection. Uncommitted work is rolled back
+        afterwards, as with the pooled Postgres connections.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self.connect()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+
+    # Single node: there are no replicas to route reads to
+    read_connection = connection
+
+    def read(self, fn):
+        with self.connection() as conn:
+            return fn(conn)
+
+    def note_write(self):
+        pass
+
+    def _init_schema(self):
+        with self.connection() as conn:
+            version = conn.execute("PRAGMA user_version;").fetchone()[0]
+            if version >= SCHEMA_VERSION:
+                return
+            conn.executescript(SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION};")
+            conn.commit()
+        self.logger.info(f"SQLite schema created (version {SCHEMA_VERSION}).")
+
+
+class SQLiteArticleService:
+    """ArticleService on SQLite, with FTS5 in place of the tsvector search."""
+
+    def __init__(self, db_service: SQLiteDatabaseService):
+        self.db_service = db_service
+        self.logger = db_service.logger
+
+    def _insert(self, cur, article: dict):
+        now = timestamp(datetime.now())
+        article_id = str(uuid.uuid4())
+        cur.execute(
+            """
+            INSERT INTO articles (id, title, summary, source, sent_to_telegram, created_at,
+                updated_at, farsi_title, farsi_summary, topic, title_hash)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (title_hash) DO NOTHING;
+        """,
+            (
+                article_id,
+                article["title"],
+                article.get("summary"),
+                article["source"],
+                bool(article.get("sent_to_telegram", False)),
+                now,
+                now,
+                article.get("farsi_title"),
+                article.get("farsi_summary"),
+                article.get("topic"),
+                queries.title_hash(article["title"]),
+            ),
+        )
+        return article_id if cur.rowcount == 1 else None
+
+    def create_article(
+        self,
+        title: str,
+        summary: str,
+        source: str,
+        sent_to_telegram=False,
+        farsi_title: str = None,
+        farsi_summary: str = None,
+        topic: str = None,
+        on_created=None,
+    ):
+        with self.db_service.connection() as conn:
+            cur = conn.cursor()
+            article_id = self._insert(
+                cur,
+                {
+                    "title": title,
+                    "summary": summary,
+                    "source": source,
+                    "sent_to_telegram": sent_to_telegram,
+                    "farsi_title": farsi_title,
+                    "farsi_summary": farsi_summary,
+                    "topic": topic,
+                },
+            )
+            if article_id and on_created is not None:
+                on_created(cur, article_id)
+            conn.commit()
+            cur.close()
+
+        if article_id:
+            self.logger.info(f"Created article {article_id}")
+        else:
+            self.logger.info(
+                f"Skipped insert: an article with the same normalized title as '{title}' exists."
+            )
+        return article_id
+
+    def create_articles_bulk(
+        self, articles: list, page_size: int = 1000, on_created=None
+    ) -> list:
+        """Same contract as ArticleService.create_articles_bulk, in one transaction."""
+        results = []
+        with self.db_service.connection() as conn:
+            cur = conn.cursor()
+            for position, article in enumerate(articles):
+                article_id = self._insert(cur, article)
+                if article_id and on_created is not None:
+                    on_created(cur, position, article_id)
+                results.append(
+                    {
+                        "title": article["title"],
+                        "id": article_id,
+                        "inserted": article_id is not None,
+                    }
+                )
+            conn.commit()
+            cur.close()
+
+        inserted = sum(result["inserted"] for result in results)
+        self.logger.info(
+            f"Bulk insert: {inserted} created, {len(articles) - inserted} skipped"
+        )
+        return results
+
+    def get_article(self, article_id):
+        with self.db_service.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT id, title, summary, source, sent_to_telegram, created_at, updated_at,
+                    farsi_title, farsi_summary, topic
+                FROM articles
+                WHERE id = ?;
+            """,
+                (str(uuid.UUID(article_id)),),
+            )
+            row = cur.fetchone()
+            cur.close()
+
+        if not row:
+            return None
+        return {
+            "id": row[0],
+            "title": row[1],
+            "summary": row[2],
+            "source": row[3],
+            "sent_to_telegram": bool(row[4]),
+            "created_at": datetime.fromisoformat(row[5]).isoformat(),
+            "updated_at": datetime.fromisoformat(row[6]).isoformat(),
+            "farsi_title": row[7],
+            "farsi_summary": row[8],
+            "topic": row[9],
+        }
+
+    def update_article(self, article_id, **fields):
+        """
+        Same contract as ArticleService.update_article. Raises ValueError
+        when the new title normalizes to another article's title.
+        """
+        values = {
+            column: fields[column]
+            for column in queries.UPDATABLE_COLUMNS
+            if fields.get(column) is not None
+        }
+        if not values:
+            return False
+
+        # Columns Postgres maintains itself: updated_at, and the generated title_hash
+        values["updated_at"] = timestamp(datetime.now())
+        if "title" in values:
+            values["title_hash"] = queries.title_hash(values["title"])
+        assignments = ", ".join(f"{column} = ?" for column in values)
+
+        with self.db_service.connection() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute(
+                    f"UPDATE articles SET {assignments} WHERE id = ?;",
+                    (*values.values(), str(uuid.UUID(article_id))),
+                )
+            except sqlite3.IntegrityError:
+                raise ValueError(
+                    f"Another article already has the normalized title '{values['title']}'."
+                )
+            conn.commit()
+            cur.close()
+
+        self.logger.info(f"Updated article {article_id}")
+        return True
+
+    def delete_article(self, article_id):
+        with self.db_service.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "DELETE FROM articles WHERE id = ?;", (str(uuid.UUID(article_id)),)
+            )
+            deleted = cur.rowcount
+            conn.commit()
+            cur.close()
+
+        self.logger.info(
+            f"Deleted article {article_id}"
+            if deleted
+            else f"No article found for {article_id}"
+        )
+        return deleted > 0
+
+    def _list_query(
+        self,
+        source=None,
+        search=None,
+        start_date=None,
+        end_date=None,
+        limit=20,
+        after=None,
+        topic=None,
+        locale=None,
+    ):
+        """SQLite version of queries.list_articles_query; returns None for no rows."""
+        conditions = []
+        params = []
+
+        if search:
+            match = fts5_query(search)
+            if match is None:
+                return None
+            # bm25 is lower for better matches
+            query = f"""
+                SELECT {ARTICLE_COLUMNS}, rank FROM (
+                    SELECT a.*, -bm25(articles_fts) AS rank
+                    FROM articles_fts JOIN articles a ON a.rowid = articles_fts.rowid
+                    WHERE articles_fts MATCH ?
+                )"""
+            params.append(match)
+        else:
+            query = f"SELECT {ARTICLE_COLUMNS} FROM articles"
+
+        if source:
+            conditions.append("source = ?")
+            params.append(source)
+        if topic:
+            conditions.append("topic = ?")
+            params.append(topic)
+        if locale == "farsi":
+            conditions.append(
+                "farsi_title IS NOT NULL AND farsi_summary IS NOT NULL"
+                " AND farsi_title <> '' AND farsi_summary <> ''"
+            )
+        if start_date:
+            conditions.append("created_at >= ?")
+            params.append(timestamp(start_date))
+        if end_date:
+            conditions.append("created_at <= ?")
+            params.append(timestamp(end_date))
+
+        if after:
+            created_at, article_id, after_rank = queries.decode_cursor(after)
+            if search:
+                if after_rank is None:
+                    raise ValueError("Cursor does not belong to a search listing")
+                conditions.append("(rank, created_at, id) < (?, ?, ?)")
+                params.extend([after_rank, timestamp(created_at), str(article_id)])
+            else:
+                conditions.append("(created_at, id) < (?, ?)")
+                params.extend([timestamp(created_at), str(article_id)])
+
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        if search:
+            query += " ORDER BY rank DESC, created_at DESC, id DESC"
+        else:
+            query += " ORDER BY created_at DESC, id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        return query, tuple(params)
+
+    def list_articles_filtered(self, **filters):
+        list_query = self._list_query(**filters)
+        if list_query is None:
+            return []
+
+        with self.db_service.read_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(*list_query)
+            rows = cur.fetchall()
+            cur.close()
+
+        return [article_from_row(row) for row in rows]
+
+    def list_articles_page(self, limit=20, after=None, **filters):
+        """Same contract as ArticleService.list_articles_page."""
+        articles = self.list_articles_filtered(limit=limit, after=after, **filters)
+        return articles, queries.next_cursor(articles, limit)
+
+    def export_articles(self, batch_size: int = 5000, **filters):
+        """
+        Same contract as ArticleService.export_articles. Uses its own
+        connection, so batches can be pulled from any thread.
+        """
+        list_query = self._list_query(limit=None, **filters)
+        if list_query is None:
+            return
+
+        conn = self.db_service.connect()
+        try:
+            cur = conn.cursor()
+            cur.execute(*list_query)
+            while rows := cur.fetchmany(batch_size):
+                yield [article_from_row(row) for row in rows]
+            cur.close()
+        finally:
+            conn.close()
+
+
+class SQLiteCronJobDBService:
+    """CronJobDBService on SQLite."""
+
+    def __init__(self, db_service: SQLiteDatabaseService):
+        self.db_service = db_service
+        self.logger = db_service.logger
+
+    def start_job_run(
+        self, job_name: str, scheduled_time: datetime, job_id: int = None
+    ) -> int:
+        with self.db_service.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                INSERT INTO cron_job_runs (id, job_name, scheduled_time, status)
+                VALUES (?, ?, ?, 'running')
+                ON CONFLICT (id) DO UPDATE
+                SET status = 'running', updated_at = CURRENT_TIMESTAMP
+                RETURNING id;
+            """,
+                (job_id, job_name, scheduled_time.astimezone(timezone.utc).isoformat()),
+            )
+            job_id = cur.fetchone()[0]
+            conn.commit()
+            cur.close()
+        return job_id
+
+    def get_hanging_jobs(self, job_name: str) -> list:
+        """Jobs stuck in 'running' state after crash."""
+        with self.db_service.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT id, scheduled_time, retry_count
+                FROM cron_job_runs
+                WHERE job_name = ?
+                  AND status != 'completed'
+                  AND retry_count < 3
+                ORDER BY scheduled_time ASC;
+            """,
+                (job_name,),
+            )
+            rows = cur.fetchall()
+            cur.close()
+        return [
+            queries.hanging_job_from_row(
+                (row[0], datetime.fromisoformat(row[1]), row[2])
+            )
+            for row in rows
+        ]
+
+    def mark_job_completed(self, job_id: int, duration: float):
+        self._run_update(
+            """
+            UPDATE cron_job_runs
+            SET status = 'completed', duration_seconds = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?;
+        """,
+            (duration, job_id),
+        )
+
+    def mark_job_failed(self, job_id: int, error_message: str, duration: float):
+        self._run_update(
+            """
+            UPDATE cron_job_runs
+            SET status = 'failed',
+                retry_count = retry_count + 1,
+                last_error = ?,
+                duration_seconds = ?,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?;
+        """,
+            (error_message, duration, job_id),
+        )
+
+    def compact_job_runs(self, retention_days: int = 30) -> int:
+        """Same contract as CronJobDBService.compact_job_runs."""
+        cutoff = (
+            datetime.now(timezone.utc) - timedelta(days=retention_days)
+        ).isoformat()
+        finished = "(status = 'completed' OR retry_count >= 3) AND scheduled_time < ?"
+
+        with self.db_service.connection() as conn:
+            cur = conn.cursor()
+            # SQLite only parses an upsert after INSERT ... SELECT when the SELECT
+            # has a WHERE clause; the finished-runs filter provides it
+            cur.execute(
+                f"""
+                INSERT INTO cron_job_daily_stats AS stats
+                    (job_name, day, runs, completed, failed, retries, total_duration_seconds, max_duration_seconds)
+                SELECT job_name,
+                       substr(scheduled_time, 1, 10),
+                       count(*),
+                       sum(status = 'completed'),
+                       sum(status != 'completed'),
+                       coalesce(sum(retry_count), 0),
+                       coalesce(sum(duration_seconds), 0),
+                       max(duration_seconds)
+                FROM cron_job_runs
+                WHERE {finished}
+                GROUP BY 1, 2
+                ON CONFLICT (job_name, day) DO UPDATE
+                SET runs = stats.runs + excluded.runs,
+                    completed = stats.completed + excluded.completed,
+                    failed = stats.failed + excluded.failed,
+                    retries = stats.retries + excluded.retries,
+                    total_duration_seconds = stats.total_duration_seconds + excluded.total_duration_seconds,
+                    max_duration_seconds = coalesce(
+                        max(stats.max_duration_seconds, excluded.max_duration_seconds),
+                        stats.max_duration_seconds,
+                        excluded.max_duration_seconds
+                    );
+            """,
+                (cutoff,),
+            )
+            cur.execute(f"DELETE FROM cron_job_runs WHERE {finished};", (cutoff,))
+            compacted = cur.rowcount
+            conn.commit()
+            cur.close()
+        return compacted
+
+    def _run_update(self, query: str, params: tuple):
+        with self.db_service.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(query, params)
+            conn.commit()
+            cur.close()
+
+
+class AsyncSQLiteArticleService:
+    """
+    AsyncArticleService over SQLiteArticleService: each call runs in a
+    worker thread, so the event loop never waits on the database file.
+    """
+
+    def __init__(self, articles: SQLiteArticleService):
+        self.articles = articles
+        self.logger = articles.logger
+
+    async def create_article(self, *args, **kwargs):
+        return await asyncio.to_thread(self.articles.create_article, *args, **kwargs)
+
+    async def get_article(self, article_id):
+        return await asyncio.to_thread(self.articles.get_article, article_id)
+
+    async def update_article(self, article_id, **fields):
+        return await asyncio.to_thread(
+            self.articles.update_article, article_id, **fields
+        )
+
+    async def delete_article(self, article_id):
+        return await asyncio.to_thread(self.articles.delete_article, article_id)
+
+    async def list_articles_filtered(self, **filters):
+        return await asyncio.to_thread(self.articles.list_articles_filtered, **filters)
+
+    async def list_articles_page(self, limit=20, after=None, **filters):
+        return await asyncio.to_thread(
+            self.articles.list_articles_page, limit=limit, after=after, **filters
+        )
+
+    async def export_articles(self, batch_size: int = 5000, **filters):
+        batches = self.articles.export_articles(batch_size=batch_size, **filters)
+        try:
+            while batch := await asyncio.to_thread(next, batches, None):
+                yield batch
+        finally:
+            batches.close()
+
+
+class AsyncSQLiteCronJobDBService:
+    """AsyncCronJobDBService over SQLiteCronJobDBService, run in worker threads."""
+
+    def __init__(self, jobs: SQLiteCronJobDBService):
+        self.jobs = jobs
+        self.logger = jobs.logger
+
+    async def start_job_run(
+        self, job_name: str, scheduled_time: datetime, job_id: int = None
+    ) -> int:
+        return await asyncio.to_thread(
+            self.jobs.start_job_run, job_name, scheduled_time, job_id
+        )
+
+    async def get_hanging_jobs(self, job_name: str) -> list:
+        return await asyncio.to_thread(self.jobs.get_hanging_jobs, job_name)
+
+    async def mark_job_completed(self, job_id: int, duration: float):
+        await asyncio.to_thread(self.jobs.mark_job_completed, job_id, duration)
+
+    async def mark_job_failed(self, job_id: int, error_message: str, duration: float):
+        await asyncio.to_thread(
+            self.jobs.mark_job_failed, job_id, error_message, duration
+        )
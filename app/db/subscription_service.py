@@ -0,0 +1,124 @@
+import os
+import threading
+from cachetools import TTLCache
+from app.db.base_service import BaseDatabaseService
+
+# Subscriptions with this topic receive every topic
+ALL_TOPICS = "*"
+
+# Channels subscribed to all topics on first start
+DEFAULT_CHANNEL_ENVS = {"english": "ENGLISH_CHANNEL_ID", "farsi": "FARSI_CHANNEL_ID"}
+
+
+class SubscriptionService:
+    """
+    Maps (topic, locale) to the Telegram chats that receive it: per-topic
+    and regional channels and groups. Lookups are cached for `cache_ttl`
+    seconds since the outbox resolves them for every enqueued headline.
+
+    On first start, ENGLISH_CHANNEL_ID and FARSI_CHANNEL_ID are subscribed
+    to all topics, which keeps the previous behaviour. This happens once:
+    a marker in seeded_defaults keeps a later unsubscribe from being undone
+    on restart.
+    """
+
+    def __init__(self, db_service: BaseDatabaseService, cache_ttl: float = 60.0):
+        self.db_service = db_service
+        self.logger = db_service.logger
+        self.cache = TTLCache(maxsize=1024, ttl=cache_ttl)
+        self._lock = threading.Lock()
+        self._seed_defaults()
+
+    def _seed_defaults(self):
+        channels = {
+            env: (locale, os.getenv(env))
+            for locale, env in DEFAULT_CHANNEL_ENVS.items()
+            if os.getenv(env)
+        }
+        if not channels:
+            return
+
+        with self.db_service.connection() as conn:
+            cur = conn.cursor()
+            # Only the process that sets the marker seeds
+            cur.execute(
+                """
+                INSERT INTO seeded_defaults (name) VALUES ('telegram_subscriptions')
+                ON CONFLICT DO NOTHING
+                RETURNING name;
+            """
+            )
+            if cur.fetchone() is not None:
+                for env, (locale, chat_id) in channels.items():
+                    cur.execute(
+                        """
+                        INSERT INTO telegram_subscriptions (topic, locale, chat_id)
+                        VALUES (%s, %s, %s)
+                        ON CONFLICT DO NOTHING;
+                    """,
+                        (ALL_TOPICS, locale, int(chat_id)),
+                    )
+                    self.logger.info(f"Subscribed {env} to all {locale} topics.")
+
+            conn.commit()
+            cur.close()
+
+    def subscribe(self, topic: str, locale: str, chat_id: int):
+        with self.db_service.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                INSERT INTO telegram_subscriptions (topic, locale, chat_id)
+                VALUES (%s, %s, %s)
+                ON CONFLICT DO NOTHING;
+            """,
+                (topic, locale, chat_id),
+            )
+            conn.commit()
+            cur.close()
+
+        with self._lock:
+            self.cache.clear()
+
+    def unsubscribe(self, topic: str, locale: str, chat_id: int):
+        with self.db_service.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                DELETE FROM telegram_subscriptions
+                WHERE topic = %s AND locale = %s AND chat_id = %s;
+            """,
+                (topic, locale, chat_id),
+            )
+            conn.commit()
+            cur.close()
+
+        with self._lock:
+            self.cache.clear()
+
+    def chats_for(self, topic: str, locale: str) -> list:
+        """Returns the chat ids subscribed to `topic` in `locale`."""
+        key = (topic, locale)
+        with self._lock:
+            if key in self.cache:
+                return self.cache[key]
+
+        with self.db_service.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT DISTINCT chat_id FROM telegram_subscriptions
+                WHERE topic IN (%s, %s) AND locale = %s
+                ORDER BY chat_id;
+            """,
+                (topic, ALL_TOPICS, locale),
+            )
+            chat_ids = [row[0] for row in cur.fetchall()]
+            cur.close()
+
+        if not chat_ids:
+            self.logger.warning(f"No Telegram chats subscribed to {topic}/{locale}")
+
+        with self._lock:
+            self.cache[key] = chat_ids
+        return chat_ids
@@ -0,0 +1,126 @@
+import re
+import threading
+from cachetools import LRUCache
+from app.db.base_service import BaseDatabaseService
+
+
+class TranslationMemoryService:
+    """
+    English -> Farsi segment store (team and competition names, section
+    headers, recurring titles). Backed by Postgres with an in-process LRU
+    in front of it, so known segments are filled in locally and only new
+    text is sent to the LLM.
+
+    Approved entries are never overwritten by captured ones.
+    """
+
+    def __init__(self, db_service: BaseDatabaseService, cache_size: int = 4096):
+        self.db_service = db_service
+        self.logger = db_service.logger
+        self.cache = LRUCache(maxsize=cache_size)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return re.sub(r"\s+", " ", text).strip()
+
+    def lookup(self, segments: list) -> dict:
+        """Returns {segment: farsi} for every segment already in memory."""
+        found = {}
+        misses = []
+
+        with self._lock:
+            for segment in segments:
+                key = self.normalize(segment)
+                if key in self.cache:
+                    found[segment] = self.cache[key]
+                else:
+                    misses.append(segment)
+
+        if not misses:
+            return found
+
+        keys = list({self.normalize(segment) for segment in misses})
+        with self.db_service.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                UPDATE translation_memory
+                SET hits = hits + 1
+                WHERE source_text = ANY(%s)
+                RETURNING source_text, farsi_text;
+            """,
+                (keys,),
+            )
+            rows = dict(cur.fetchall())
+            conn.commit()
+            cur.close()
+
+        with self._lock:
+            for key, farsi in rows.items():
+                self.cache[key] = farsi
+
+        for segment in misses:
+            farsi = rows.get(self.normalize(segment))
+            if farsi:
+                found[segment] = farsi
+
+        return found
+
+    def remember(self, pairs: dict, approved: bool = False):
+        """Stores English -> Farsi pairs. Captured pairs never replace approved ones."""
+        rows = [
+            (self.normalize(source), farsi.strip(), approved)
+            for source, farsi in pairs.items()
+            if source and source.strip() and farsi and farsi.strip()
+        ]
+        if not rows:
+            return
+
+        with self.db_service.connection() as conn:
+            cur = conn.cursor()
+            cur.executemany(
+                """
+                INSERT INTO translation_memory (source_text, farsi_text, approved)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (source_text) DO UPDATE
+                SET farsi_text = EXCLUDED.farsi_text,
+                    approved = EXCLUDED.approved,
+                    updated_at = now()
+                WHERE NOT translation_memory.approved OR EXCLUDED.approved;
+            """,
+                rows,
+            )
+            conn.commit()
+            cur.close()
+
+        with self._lock:
+            for source, farsi, _ in rows:
+                # Drop rather than set: an approved row may have won the upsert
+                self.cache.pop(source, None)
+
+        self.logger.info(f"Stored {len(rows)} translation memory segment(s)")
+
+    def translate(self, segments: list, translator=None) -> dict:
+        """
+        Returns {segment: farsi} for all segments it can resolve. Segments
+        not in memory are sent to `translator` (a callable taking a list of
+        English segments and returning {segment: farsi}) and remembered.
+        If the translator fails, the missing segments are left out.
+        """
+        segments = list(dict.fromkeys(s for s in segments if s and s.strip()))
+        found = self.lookup(segments)
+        missing = [s for s in segments if s not in found]
+
+        if missing and translator is not None:
+            try:
+                translated = translator(missing)
+            except Exception as e:
+                self.logger.error(
+                    f"Translating {len(missing)} segment(s) failed, leaving them untranslated: {e}"
+                )
+                return found
+            self.remember(translated)
+            found.update({s: translated[s] for s in missing if translated.get(s)})
+
+        return found
@@ -0,0 +1,375 @@
+"""
+Local stand-in for the external APIs the jobs talk to, for offline
+end-to-end runs and benchmarks.
+
+Serves:
+  - Gemini `streamGenerateContent` (SSE), returning JSON that is valid for
+    whatever `responseSchema` the request carries (default, Ukraine and
+    football schemas alike), with configurable per-chunk latency and
+    error injection.
+  - football-data.org v4 matches/standings, under /football/v4.
+  - Telegram Bot API sendMessage/sendPhoto/sendMediaGroup, under /telegram.
+  - Synthetic RSS feeds under /feeds/{name}.xml and article pages with
+    og:image tags under /articles/{n}.
+
+Usage:
+    python -m app.devtools.gemini_stub --port 8081 --chunk-latency 0.05
+
+Then point the app at it:
+    GEMINI_BASE_URL=http://localhost:8081
+    FOOTBALL_DATA_BASE_URL=http://localhost:8081/football/v4
+    TELEGRAM_API_URL=http://localhost:8081/telegram
+"""
+
+import argparse
+import asyncio
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from urllib.parse import parse_qsl
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+TEAMS = {
+    "PL": ["Arsenal FC", "Chelsea FC", "Liverpool FC", "Manchester City FC"],
+    "PD": ["Real Madrid CF", "FC Barcelona", "Club Atlético de Madrid", "Sevilla FC"],
+    "BL1": [
+        "FC Bayern München",
+        "Borussia Dortmund",
+        "Bayer 04 Leverkusen",
+        "RB Leipzig",
+    ],
+    "CL": [
+        "Paris Saint-Germain FC",
+        "FC Internazionale Milano",
+        "Arsenal FC",
+        "Real Madrid CF",
+    ],
+}
+
+COMPETITION_NAMES = {
+    "PL": "Premier League",
+    "PD": "Primera Division",
+    "BL1": "Bundesliga",
+    "CL": "UEFA Champions League",
+}
+
+LOREM_EN = (
+    "Officials confirmed the update on Monday, adding that further details "
+    "would follow later in the week."
+)
+LOREM_FA = "مقامات روز دوشنبه این خبر را تأیید کردند و گفتند جزئیات بیشتر در ادامه هفته اعلام می‌شود."
+
+
+class StubConfig:
+    def __init__(
+        self,
+        first_chunk_latency: float = 0.5,
+        chunk_latency: float = 0.05,
+        chunk_size: int = 64,
+        array_items: int = 3,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        midstream_error_rate: float = 0.0,
+        malformed_rate: float = 0.0,
+        model_latency: dict = None,
+        telegram_throttle_rate: float = 0.0,
+        seed: int = None,
+    ):
+        self.first_chunk_latency = first_chunk_latency
+        self.chunk_latency = chunk_latency
+        self.chunk_size = chunk_size
+        self.array_items = array_items
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.midstream_error_rate = midstream_error_rate
+        self.malformed_rate = malformed_rate
+        self.model_latency = model_latency or {}
+        self.telegram_throttle_rate = telegram_throttle_rate
+        self.random = random.Random(seed)
+
+
+def fake_value(schema: dict, name: str, base_url: str, config: StubConfig, index=0):
+    """Builds a value that satisfies a Gemini (OpenAPI subset) schema."""
+    schema_type = (schema.get("type") or "STRING").upper()
+
+    if schema_type == "OBJECT":
+        return {
+            key: fake_value(sub, key, base_url, config, index)
+            for key, sub in (schema.get("properties") or {}).items()
+        }
+    if schema_type == "ARRAY":
+        items = schema.get("items") or {"type": "STRING"}
+        count = 1 if name == "sources" else config.array_items
+        return [fake_value(items, name, base_url, config, i) for i in range(count)]
+    if schema_type in ("INTEGER", "NUMBER"):
+        return index
+    if schema_type == "BOOLEAN":
+        return True
+
+    if schema.get("enum"):
+        return schema["enum"][0]
+    if name == "sources" or "link" in name or "url" in name:
+        return f"{base_url}/articles/{config.random.randint(1, 10_000)}"
+    if name.startswith("farsi"):
+        return f"{name} {index + 1}: {LOREM_FA}"
+    return f"{name} {index + 1}: {LOREM_EN}"
+
+
+def gemini_chunk(text: str, model: str, finish: bool = False, usage: dict = None):
+    candidate = {
+        "content": {"parts": [{"text": text}], "role": "model"},
+        "index": 0,
+    }
+    if finish:
+        candidate["finishReason"] = "STOP"
+    chunk = {"candidates": [candidate], "modelVersion": model}
+    if usage:
+        chunk["usageMetadata"] = usage
+    return f"data: {json.dumps(chunk, ensure_ascii=False)}\r\n\r\n"
+
+
+def prompt_length(body: dict) -> int:
+    length = 0
+    for content in (body.get("contents") or []) + [body.get("systemInstruction") or {}]:
+        for part in content.get("parts") or []:
+            length += len(part.get("text") or "")
+    return length
+
+
+def fake_match(code: str, day: datetime, index: int, now: datetime, rng) -> dict:
+    teams = TEAMS.get(code, TEAMS["PL"])
+    home, away = teams[(2 * index) % len(teams)], teams[(2 * index + 1) % len(teams)]
+    kickoff = day.replace(hour=15 + 2 * index, minute=0, second=0, microsecond=0)
+    finished = kickoff + timedelta(hours=2) < now
+    return {
+        "competition": {"code": code, "name": COMPETITION_NAMES.get(code, code)},
+        "utcDate": kickoff.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "status": "FINISHED" if finished else "TIMED",
+        "homeTeam": {"name": home},
+        "awayTeam": {"name": away},
+        "score": {
+            "fullTime": {
+                "home": rng.randint(0, 4) if finished else None,
+                "away": rng.randint(0, 4) if finished else None,
+            }
+        },
+    }
+
+
+def stub_file_id(photo: str) -> str:
+    """A file_id for a photo URL; photos sent by file_id keep theirs."""
+    if photo and photo.startswith("stub-"):
+        return photo
+    return f"stub-{abs(hash(photo))}"
+
+
+def create_app(config: StubConfig) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/{api_version}/models/{model}:streamGenerateContent")
+    async def stream_generate_content(api_version: str, model: str, request: Request):
+        body = await request.json()
+        base_url = str(request.base_url).rstrip("/")
+
+        if config.random.random() < config.error_rate:
+            return JSONResponse(
+                status_code=config.error_status,
+                content={
+                    "error": {
+                        "code": config.error_status,
+                        "message": "Injected error from gemini stub",
+                        "status": "UNAVAILABLE",
+                    }
+                },
+            )
+
+        generation_config = body.get("generationConfig") or {}
+        schema = generation_config.get("responseSchema") or {"type": "STRING"}
+        output = json.dumps(
+            fake_value(schema, "root", base_url, config), ensure_ascii=False
+        )
+        if config.random.random() < config.malformed_rate:
+            output = output[: len(output) // 2]
+
+        pieces = [
+            output[i : i + config.chunk_size]
+            for i in range(0, len(output), config.chunk_size)
+        ] or [""]
+        midstream_error = config.random.random() < config.midstream_error_rate
+        scale = config.model_latency.get(model, 1.0)
+        usage = {
+            "promptTokenCount": prompt_length(body) // 4,
+            "candidatesTokenCount": len(output) // 4,
+            "totalTokenCount": (prompt_length(body) + len(output)) // 4,
+        }
+
+        async def events():
+            await asyncio.sleep(config.first_chunk_latency * scale)
+            for i, piece in enumerate(pieces):
+                if i:
+                    await asyncio.sleep(config.chunk_latency * scale)
+                if midstream_error and i == len(pieces) // 2:
+                    raise RuntimeError("Injected mid-stream failure")
+                last = i == len(pieces) - 1
+                yield gemini_chunk(
+                    piece, model, finish=last, usage=usage if last else None
+                )
+
+        logger.info(f"{model}: streaming {len(output)} chars in {len(pieces)} chunks")
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/football/v4/competitions/{code}/matches")
+    async def football_matches(code: str, dateFrom: str, dateTo: str):
+        now = datetime.now(timezone.utc)
+        start = datetime.fromisoformat(dateFrom).replace(tzinfo=timezone.utc)
+        end = datetime.fromisoformat(dateTo).replace(tzinfo=timezone.utc)
+        matches = []
+        day = start
+        while day <= end:
+            for index in range(2):
+                matches.append(fake_match(code, day, index, now, config.random))
+            day += timedelta(days=1)
+        return {"matches": matches}
+
+    @app.get("/football/v4/competitions/{code}/standings")
+    async def football_standings(code: str):
+        teams = TEAMS.get(code, TEAMS["PL"])
+        table = [
+            {
+                "position": position,
+                "team": {"name": team},
+                "playedGames": 10,
+                "won": 10 - position,
+                "draw": position - 1,
+                "lost": 1,
+                "points": 3 * (10 - position) + position - 1,
+                "goalDifference": 12 - 3 * position,
+            }
+            for position, team in enumerate(teams, 1)
+        ]
+        return {
+            "competition": {"name": COMPETITION_NAMES.get(code, code)},
+            "standings": [{"type": "TOTAL", "table": table}],
+        }
+
+    @app.post("/telegram/bot{token}/{method}")
+    async def telegram(token: str, method: str, request: Request):
+        # Parsed by hand so the stub does not need python-multipart
+        raw = (await request.body()).decode("utf-8")
+        if request.headers.get("content-type", "").startswith("application/json"):
+            form = json.loads(raw or "{}")
+        else:
+            form = dict(parse_qsl(raw))
+        await asyncio.sleep(config.chunk_latency)
+        if config.random.random() < config.telegram_throttle_rate:
+            return JSONResponse(
+                status_code=429,
+                content={
+                    "ok": False,
+                    "error_code": 429,
+                    "description": "Too Many Requests: retry after 1",
+                    "parameters": {"retry_after": 1},
+                },
+            )
+        result = {
+            "message_id": config.random.randint(1, 1_000_000),
+            "chat": {"id": form.get("chat_id")},
+            "date": int(datetime.now(timezone.utc).timestamp()),
+        }
+        if method == "sendPhoto":
+            result["photo"] = [{"file_id": stub_file_id(form.get("photo"))}]
+        if method == "sendMediaGroup":
+            media = json.loads(form.get("media") or "[]")
+            result = [
+                dict(
+                    result,
+                    message_id=result["message_id"] + i,
+                    photo=[{"file_id": stub_file_id(item.get("media"))}],
+                )
+                for i, item in enumerate(media)
+            ]
+        return {"ok": True, "result": result}
+
+    @app.get("/feeds/{name}.xml")
+    async def feed(name: str, request: Request):
+        base_url = str(request.base_url).rstrip("/")
+        now = datetime.now(timezone.utc)
+        items = "".join(
+            f"<item><title>{name} headline {i}</title>"
+            f"<link>{base_url}/articles/{i}</link>"
+            f"<description>{LOREM_EN}</description>"
+            f"<pubDate>{format_datetime(now - timedelta(minutes=10 * i))}</pubDate></item>"
+            for i in range(1, 11)
+        )
+        xml = (
+            '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f"<title>{name}</title><link>{base_url}</link>{items}</channel></rss>"
+        )
+        return Response(content=xml, media_type="application/rss+xml")
+
+    @app.get("/articles/{article_id}")
+    async def article_page(article_id: int, request: Request):
+        base_url = str(request.base_url).rstrip("/")
+        html = (
+            f'<html><head><meta property="og:image" content="{base_url}/images/{article_id}.png">'
+            f"</head><body>{LOREM_EN}</body></html>"
+        )
+        return Response(content=html, media_type="text/html")
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline Gemini stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--first-chunk-latency", type=float, default=0.5)
+    parser.add_argument("--chunk-latency", type=float, default=0.05)
+    parser.add_argument("--chunk-size", type=int, default=64)
+    parser.add_argument("--array-items", type=int, default=3)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--midstream-error-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--model-latency",
+        action="append",
+        default=[],
+        metavar="MODEL=FACTOR",
+        help="Scale latencies for one model, e.g. gemini-2.5-flash=4",
+    )
+    parser.add_argument("--telegram-throttle-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    model_latency = {}
+    for item in args.model_latency:
+        model, factor = item.split("=", 1)
+        model_latency[model] = float(factor)
+
+    config = StubConfig(
+        first_chunk_latency=args.first_chunk_latency,
+        chunk_latency=args.chunk_latency,
+        chunk_size=args.chunk_size,
+        array_items=args.array_items,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        midstream_error_rate=args.midstream_error_rate,
+        malformed_rate=args.malformed_rate,
+        model_latency=model_latency,
+        telegram_throttle_rate=args.telegram_throttle_rate,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
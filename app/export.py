@@ -0,0 +1,58 @@
+"""
+Exports articles to a file or stdout, streaming through a server-side
+cursor so memory use stays flat however many rows match.
+
+    python -m app.export --format parquet --output articles.parquet --topic tech
+"""
+
+import argparse
+import sys
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+from app.db.backend import create_article_service
+from app.utils.export import EXPORT_FORMATS, encode_batches, get_encoder
+
+
+def parse_date(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="ndjson")
+    parser.add_argument("--output", help="Output file (default: stdout)")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--topic")
+    parser.add_argument("--locale", choices=["english", "farsi"])
+    parser.add_argument("--source")
+    parser.add_argument("--search")
+    parser.add_argument("--start-date", type=parse_date, help="YYYY-MM-DD")
+    parser.add_argument("--end-date", type=parse_date, help="YYYY-MM-DD")
+    args = parser.parse_args()
+
+    load_dotenv()
+    encoder = get_encoder(args.format)
+    article_service = create_article_service()
+    batches = article_service.export_articles(
+        batch_size=args.batch_size,
+        topic=args.topic,
+        locale=args.locale,
+        source=args.source,
+        search=args.search,
+        start_date=args.start_date,
+        end_date=args.end_date,
+    )
+
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for chunk in encode_batches(encoder, batches):
+            output.write(chunk)
+    finally:
+        if args.output:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@ import asyncio
 import time
 from app.utils.logger import setup_logger
 from app.metrics.cronjob import get_metrics
-from app.db.job_service import CronJobDBService
+from app.db.backend import create_job_db_services
 
 
 class AbstractCronJob(ABC):
@@ -21,7 +21,9 @@ class AbstractCronJob(ABC):
         self.logger = setup_logger(self.__class__.__name__)
         self.enable_metrics = enable_metrics
         self.max_retries = max_retries
-        self.db_service = CronJobDBService()
+        # The sync service migrates the schema; everything that runs on the
+        # event loop goes through the async one
+        self.db_service, self.async_db_service = create_job_db_services()
 
         if self.enable_metrics:
             self.metrics = get_metrics()
@@ -29,10 +31,8 @@ class AbstractCronJob(ABC):
                 self.job_name, self.cron_expression, self.__class__.__name__
             )
 
-        self._retry_hanging_jobs()
-
-    def _retry_hanging_jobs(self):
-        hanging_jobs = self.db_service.get_hanging_jobs(self.job_name)
+    async def _retry_hanging_jobs(self):
+        hanging_jobs = await self.async_db_service.get_hanging_jobs(self.job_name)
         if hanging_jobs:
             self.logger.info(
                 f"[{self.job_name}] 🔄 Found {len(hanging_jobs)} hanging jobs from crash. Retrying..."
@@ -59,10 +59,12 @@ class AbstractCronJob(ABC):
     ):
         if job_id is None:
             scheduled_time = datetime.now(timezone.utc)
-            job_id = self.db_service.create_job_run(self.job_name, scheduled_time)
 
         while attempt <= self.max_retries:
-            self.db_service.mark_job_running(job_id)
+            # Creates the run on the first attempt, one statement either way
+            job_id = await self.async_db_service.start_job_run(
+                self.job_name, scheduled_time, job_id
+            )
             start_time = time.monotonic()
             start_metric_time = None
 
@@ -82,7 +84,7 @@ class AbstractCronJob(ABC):
                     self.logger.info(
                         f"[{self.job_name}] ✅ Job completed in {duration}s."
                     )
-                    self.db_service.mark_job_completed(job_id, duration)
+                    await self.async_db_service.mark_job_completed(job_id, duration)
                     if self.enable_metrics and start_metric_time is not None:
                         self.metrics.execution_succeeded(
                             self.job_name, start_metric_time
@@ -96,7 +98,7 @@ class AbstractCronJob(ABC):
                 self.logger.error(
                     f"[{self.job_name}] ❌ Error in job: {e}", exc_info=True
                 )
-                self.db_service.mark_job_failed(job_id, str(e), duration)
+                await self.async_db_service.mark_job_failed(job_id, str(e), duration)
                 if self.enable_metrics and start_metric_time is not None:
                     self.metrics.execution_failed(self.job_name, start_metric_time)
 
@@ -115,6 +117,8 @@ class AbstractCronJob(ABC):
             self.metrics.job_started(self.job_name)
 
         try:
+            await self._retry_hanging_jobs()
+
             self.logger.info(
                 f"[{self.job_name}] 🔁 Cron job scheduled: {self.cron_expression}"
             )
@@ -1,29 +1,82 @@
+import re
+from datetime import date
 from app.jobs.base import AbstractCronJob
 from app.db.article_service import ArticleService
+from app.db.outbox_service import OutboxService
+from app.db.translation_service import TranslationMemoryService
 from app.utils.football_data import FootballDataClient
+from app.utils.football_render import FootballRenderer
 from app.utils.ai import GeminiClient
-from app.utils.telegram import send_to_telegram
+from app.utils.translation import GeminiSegmentTranslator
+
+
+def store_headlines(
+    article_service: ArticleService,
+    outbox_service: OutboxService,
+    topic: str,
+    headlines: list,
+) -> list:
+    """
+    Stores rendered headlines with one bulk insert and, in the same
+    transaction, queues the new ones for delivery in both languages.
+    Duplicates are neither stored nor re-sent.
+    """
+
+    def enqueue(cur, position, article_id):
+        outbox_service.enqueue(
+            headlines[position], topic, article_id=article_id, cur=cur
+        )
+
+    return article_service.create_articles_bulk(
+        [
+            {
+                "title": headline["title"],
+                "summary": headline["summary"],
+                "source": "",
+                "farsi_title": headline["farsi_title"],
+                "farsi_summary": headline["farsi_summary"],
+                "topic": topic,
+            }
+            for headline in headlines
+        ],
+        on_created=enqueue if outbox_service is not None else None,
+    )
+
+
+# Team names in FootballDataClient.format_match_for_llm lines
+MATCH_TEAM = re.compile(r"(?:home|away)_team=([^|]*)")
 
 
 class FootballWeekSummary(AbstractCronJob):
     def __init__(
         self,
         article_service: ArticleService,
+        outbox_service: OutboxService,
         cron_expression: str,
         job_name: str,
+        translation_memory: TranslationMemoryService = None,
     ):
         super().__init__(cron_expression, job_name)
         self.topic = "football_upcoming_week"
         self.article_service = article_service
+        self.outbox_service = outbox_service
+        self.translation_memory = translation_memory
 
     def run(self):
         """
-        Synchronous run method for thread execution
+        Synchronous run method for thread execution.
+        Titles are rendered locally; the LLM writes the match previews.
         """
         football_client = FootballDataClient()
         summary_inputs = football_client.prep_next_week_summary()
+        week_start = date.fromisoformat(football_client.get_next_week_date_range()[0])
+        renderer = FootballRenderer(
+            translation_memory=self.translation_memory,
+            translator=GeminiSegmentTranslator(job=self.job_name),
+        )
 
         llm_client = GeminiClient(
+            job=self.job_name,
             system_instruction=[
                 "You will receive a list of games and standings for a competition",
                 "Your task is to summarize it for a Telegram audience using a clear and concise format.",
@@ -74,48 +127,50 @@ class FootballWeekSummary(AbstractCronJob):
                 """,
                 "Your response must be in valid JSON following this format:",
                 "- `article`: an object containing:",
-                "   - `title`: A concise string (e.g. '[Competition name] upcoming week preview')",
-                "   - `farsi_title`: A Farsi translation of the title",
                 "   - `summary`: List of games in the mentioned format",
                 "   - `farsi_summary`: translation of the summary to farsi, it does not have to be exact translation make sure it has a natural flow to it",
                 "All English fields must be clear and suitable for public audiences.",
                 "All Farsi fields must be accurate translations maintaining the same meaning and tone.",
-            ]
+            ],
         )
 
+        headlines = []
         for summary_input in summary_inputs:
             articles = llm_client.generate(str(summary_input))["articles"]
 
             if len(articles) == 0:
                 continue
 
+            titles = renderer.render_week_titles(
+                summary_input["competition"], week_start
+            )
+            team_names = set(MATCH_TEAM.findall("\n".join(summary_input["matches"])))
+
             for article in articles:
 
                 if not article:
                     self.logger.info("✅ done - no article generated")
                     continue
 
+                renderer.capture_team_names(
+                    article["summary"], article["farsi_summary"], team_names
+                )
+
                 # Create the result dictionary compatible with send_to_telegram
                 headline = {
-                    "title": article["title"],
-                    "farsi_title": article["farsi_title"],
+                    "title": titles["title"],
+                    "farsi_title": titles["farsi_title"],
                     "summary": "\n" + article["summary"],
                     "farsi_summary": "\n" + article["farsi_summary"],
                     "sources": [""],
                 }
 
-                # Save to database
-                self.article_service.create_article(
-                    headline["title"],
-                    headline["summary"],
-                    "",
-                    farsi_title=headline["farsi_title"],
-                    farsi_summary=headline["farsi_summary"],
-                    sent_to_telegram=True,
-                )
-                # Send to Telegram in both languages
-                send_to_telegram(headline, self.topic, locale="english")
-                send_to_telegram(headline, self.topic, locale="farsi")
+                headlines.append(headline)
+
+        # Save every competition's preview in one transaction
+        store_headlines(
+            self.article_service, self.outbox_service, self.topic, headlines
+        )
 
         return True
 
@@ -124,91 +179,61 @@ class FootballYesterdayResults(AbstractCronJob):
     def __init__(
         self,
         article_service: ArticleService,
+        outbox_service: OutboxService,
         cron_expression: str,
         job_name: str,
+        llm_intro: bool = False,
+        translation_memory: TranslationMemoryService = None,
     ):
         super().__init__(cron_expression, job_name)
         self.topic = "football_upcoming_week"
+        self.llm_route = "football_results"
         self.article_service = article_service
+        self.outbox_service = outbox_service
+        self.llm_intro = llm_intro
+        self.translation_memory = translation_memory
 
     def run(self):
         """
-        Synchronous run method for thread execution
+        Synchronous run method for thread execution.
+        Results are rendered locally; only the optional intro goes to the LLM.
         """
         football_client = FootballDataClient()
-        summary_inputs = football_client.prep_last_day_summary()
-
-        llm_client = GeminiClient(
-            system_instruction=[
-                "You will receive a list of games for a football competition.",
-                "Your task is to summarize it for a Telegram audience using a clear and concise format.",
-                "Focus on the results of the matches and provide short but engaging recaps.",
-                "Use informative section headers with relevant emojis to improve readability. Add a new line after each section you write to keep readability high.",
-                "Ensure the summary is well-structured, compact, and not overly long.",
-                """
-                You will receive match data in the following format:
-                {
-                'competition': 'PL',
-                'matches': [
-                    'competition=Premier League|home_team=Aston Villa FC|away_team=Newcastle United FC|utc_date=2025-08-16T11:30:00Z|tehran_date=2025-08-16T15:00:00+03:30|status=finished|score=0-0',
-                    ...
-                ]
-                }
-
-                Rules:
-                - Always display the local Tehran time (from `tehran_date_shamsi` in farsi and `tehran_date_gregorian` in english).
-                - Ignore the `utc_date` in the output.
-                - Use the `score` exactly as provided (format: Home – Away).
-                - `status` will be 'finished' → summarize only completed matches.
-
-                For each match, output in this format (with real line breaks, not escaped):
-                
-                ⚽ {Home Team} {Home Score} – {Away Score} {Away Team}  
-                📅 Date: {DD MMM YYYY, HH:MM Tehran time}  
-                """,
-                "Your response must be in valid JSON following this format:",
-                "- `article`: an object containing:",
-                "   - `title`: A concise string (e.g. '[Competition name] matchday results - [Date]')",
-                "   - `farsi_title`: A Farsi translation of the title",
-                "   - `summary`: List of games in the mentioned format (with real line breaks for readability)",
-                "   - `farsi_summary`: A natural-sounding translation of the summary to Farsi (does not need to be literal word-for-word, but must flow well in Persian).",
-                "All English fields must be clear, concise, and suitable for public audiences.",
-                "All Farsi fields must be accurate translations maintaining the same meaning and tone.",
-            ]
+        renderer = FootballRenderer(
+            translation_memory=self.translation_memory,
+            translator=GeminiSegmentTranslator(job=self.job_name, route=self.llm_route),
         )
 
-        for summary_input in summary_inputs:
-            articles = llm_client.generate(str(summary_input))["articles"]
+        headlines = []
+        for competition in football_client.prep_last_day_matches():
+            article = renderer.render_results(competition["matches"])
 
-            if len(articles) == 0:
+            if not article:
+                self.logger.info(
+                    f"✅ done - no finished matches for {competition['competition']}"
+                )
                 continue
 
-            for article in articles:
-                if not article:
-                    self.logger.info("✅ done - no article generated")
-                    continue
+            if self.llm_intro:
+                article = renderer.add_llm_intro(
+                    article, job=self.job_name, route=self.llm_route
+                )
 
-                # Create the result dictionary compatible with send_to_telegram
-                headline = {
-                    "title": article["title"],
-                    "farsi_title": article["farsi_title"],
-                    "summary": "\n" + article["summary"],
-                    "farsi_summary": "\n" + article["farsi_summary"],
-                    "sources": [""],
-                }
+            # Create the result dictionary compatible with send_to_telegram
+            headline = {
+                "title": article["title"],
+                "farsi_title": article["farsi_title"],
+                "summary": "\n" + article["summary"],
+                "farsi_summary": "\n" + article["farsi_summary"],
+                "sources": [""],
+            }
 
-                # Save to database
-                self.article_service.create_article(
-                    headline["title"],
-                    headline["summary"],
-                    "",
-                    farsi_title=headline["farsi_title"],
-                    farsi_summary=headline["farsi_summary"],
-                    sent_to_telegram=True,
-                )
-                # Send to Telegram in both languages
-                send_to_telegram(headline, self.topic, locale="english")
-                send_to_telegram(headline, self.topic, locale="farsi")
+            headlines.append(headline)
+
+        # Save every competition's post in one transaction
+        store_headlines(
+            self.article_service, self.outbox_service, self.topic, headlines
+        )
 
         return True
 
@@ -217,90 +242,60 @@ class FootballTodayGameNotification(AbstractCronJob):
     def __init__(
         self,
         article_service: ArticleService,
+        outbox_service: OutboxService,
         cron_expression: str,
         job_name: str,
+        llm_intro: bool = False,
+        translation_memory: TranslationMemoryService = None,
     ):
         super().__init__(cron_expression, job_name)
         self.topic = "football_upcoming_week"
+        self.llm_route = "football_today"
         self.article_service = article_service
+        self.outbox_service = outbox_service
+        self.llm_intro = llm_intro
+        self.translation_memory = translation_memory
 
     def run(self):
         """
-        Synchronous run method for thread execution
+        Synchronous run method for thread execution.
+        Kickoff times are rendered locally; only the optional intro goes to the LLM.
         """
         football_client = FootballDataClient()
-        summary_inputs = football_client.prep_today_summary()
-
-        llm_client = GeminiClient(
-            system_instruction=[
-                "You will receive a list of games for a football competition.",
-                "Your task is to summarize it for a Telegram audience using a clear and concise format.",
-                "Focus on notifying users of today's games with the local Tehran kickoff times.",
-                "Use informative section headers with relevant emojis to improve readability. Add a new line after each section you write to keep readability high.",
-                "Ensure the summary is well-structured, compact, and not overly long.",
-                """
-            You will receive match data in the following format:
-            {
-            'competition': 'PL',
-            'matches': [
-                'competition=Premier League|home_team=Aston Villa FC|away_team=Newcastle United FC|utc_date=2025-08-16T11:30:00Z|tehran_date=2025-08-16T15:00:00+03:30|status=scheduled',
-                ...
-            ]
-            }
-
-            Rules:
-            - Always display the local Tehran time (from `tehran_date_shamsi` in farsi and `tehran_date_gregorian` in english).
-            - Ignore the `utc_date` in the output.
-            - Do not display scores (since matches have not started).
-            - `status` will be 'scheduled' → only show matches happening today.
-
-            For each match, output in this format (with real line breaks, not escaped):
-            
-            ⚽ {Home Team} 🆚 {Away Team}  
-            🕒 Kickoff: {DD MMM YYYY, HH:MM Tehran time}  
-            """,
-                "Your response must be in valid JSON following this format:",
-                "- `article`: an object containing:",
-                "   - `title`: A concise string (e.g. '[Competition name] today’s matches - [Date]')",
-                "   - `farsi_title`: A Farsi translation of the title",
-                "   - `summary`: List of games in the mentioned format (with real line breaks for readability)",
-                "   - `farsi_summary`: A natural-sounding translation of the summary to Farsi (does not need to be literal word-for-word, but must flow well in Persian).",
-                "All English fields must be clear, concise, and suitable for public audiences.",
-                "All Farsi fields must be accurate translations maintaining the same meaning and tone.",
-            ]
+        renderer = FootballRenderer(
+            translation_memory=self.translation_memory,
+            translator=GeminiSegmentTranslator(job=self.job_name, route=self.llm_route),
         )
 
-        for summary_input in summary_inputs:
-            articles = llm_client.generate(str(summary_input))["articles"]
+        headlines = []
+        for competition in football_client.prep_today_matches():
+            article = renderer.render_today(competition["matches"])
 
-            if len(articles) == 0:
+            if not article:
+                self.logger.info(
+                    f"✅ done - no scheduled matches for {competition['competition']}"
+                )
                 continue
 
-            for article in articles:
-                if not article:
-                    self.logger.info("✅ done - no article generated")
-                    continue
+            if self.llm_intro:
+                article = renderer.add_llm_intro(
+                    article, job=self.job_name, route=self.llm_route
+                )
 
-                # Create the result dictionary compatible with send_to_telegram
-                headline = {
-                    "title": article["title"],
-                    "farsi_title": article["farsi_title"],
-                    "summary": "\n" + article["summary"],
-                    "farsi_summary": "\n" + article["farsi_summary"],
-                    "sources": [""],
-                }
+            # Create the result dictionary compatible with send_to_telegram
+            headline = {
+                "title": article["title"],
+                "farsi_title": article["farsi_title"],
+                "summary": "\n" + article["summary"],
+                "farsi_summary": "\n" + article["farsi_summary"],
+                "sources": [""],
+            }
 
-                # Save to database
-                self.article_service.create_article(
-                    headline["title"],
-                    headline["summary"],
-                    "",
-                    farsi_title=headline["farsi_title"],
-                    farsi_summary=headline["farsi_summary"],
-                    sent_to_telegram=True,
-                )
-                # Send to Telegram in both languages
-                send_to_telegram(headline, self.topic, locale="english")
-                send_to_telegram(headline, self.topic, locale="farsi")
+            headlines.append(headline)
+
+        # Save every competition's post in one transaction
+        store_headlines(
+            self.article_service, self.outbox_service, self.topic, headlines
+        )
 
         return True
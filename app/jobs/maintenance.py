@@ -0,0 +1,45 @@
+from app.jobs.base import AbstractCronJob
+from app.db.partition_service import ArticlePartitionService
+
+
+class ArticlePartitionMaintenance(AbstractCronJob):
+    """
+    Keeps future article partitions in place and applies the retention
+    policy. Partitions are created several months ahead, so a missed run
+    only matters if the job stays down for that long.
+    """
+
+    def __init__(
+        self,
+        partition_service: ArticlePartitionService,
+        cron_expression: str,
+        job_name: str,
+    ):
+        super().__init__(cron_expression, job_name)
+        self.partition_service = partition_service
+
+    def run(self):
+        created = self.partition_service.ensure_partitions()
+        detached = self.partition_service.apply_retention()
+        self.logger.info(
+            f"[{self.job_name}] 🗂️ {len(created)} partitions created, {len(detached)} detached"
+        )
+        return True
+
+
+class JobRunCompaction(AbstractCronJob):
+    """
+    Keeps cron_job_runs small: finished runs older than `retention_days`
+    are folded into daily aggregates in cron_job_daily_stats.
+    """
+
+    def __init__(self, cron_expression: str, job_name: str, retention_days: int = 30):
+        super().__init__(cron_expression, job_name)
+        self.retention_days = retention_days
+
+    def run(self):
+        compacted = self.db_service.compact_job_runs(self.retention_days)
+        self.logger.info(
+            f"[{self.job_name}] 🧹 Compacted {compacted} job runs older than {self.retention_days} days"
+        )
+        return True
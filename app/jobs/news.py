@@ -1,7 +1,8 @@
+import os
 from app.jobs.base import AbstractCronJob
 from app.db.article_service import ArticleService
+from app.db.outbox_service import OutboxService
 from app.utils.ai import GeminiClient
-from app.utils.telegram import send_to_telegram
 from app.utils.news import NewsAggregatorTool
 
 
@@ -9,6 +10,7 @@ class NewsAggregator(AbstractCronJob):
     def __init__(
         self,
         article_service: ArticleService,
+        outbox_service: OutboxService,
         cron_expression: str,
         job_name: str,
         topic: str,
@@ -20,6 +22,7 @@ class NewsAggregator(AbstractCronJob):
         super().__init__(cron_expression, job_name)
         self.topic = topic
         self.article_service = article_service
+        self.outbox_service = outbox_service
         self.max_per_source = max_per_source
         self.max_weighted_selection = max_weighted_selection
         self.max_articles = max_articles
@@ -39,7 +42,8 @@ class NewsAggregator(AbstractCronJob):
             f"⏳ Task started - aggregate {self.topic} news - max_age: {self.max_age_hours} hours and max_articles: {self.max_articles}"
         )
 
-        aggregator = NewsAggregatorTool(f"app/rss-feed/{self.topic}.txt")
+        feed_dir = os.getenv("RSS_FEED_DIR", "app/rss-feed")
+        aggregator = NewsAggregatorTool(f"{feed_dir}/{self.topic}.txt")
         aggregator.filter_recent(
             self.max_age_hours
         ).filter_summary().filter_duplicates()
@@ -59,25 +63,39 @@ class NewsAggregator(AbstractCronJob):
             self.logger.info("✅ done - no news found")
             return True
 
-        llm_client = GeminiClient()
+        llm_client = GeminiClient(job=self.job_name)
         headlines = llm_client.generate(summary_input)["articles"]
 
+        # Store the whole batch in one transaction
+        rows = []
+        stored = []
         for headline in headlines:
             try:
-                self.article_service.create_article(
-                    headline["title"],
-                    headline["summary"],
-                    headline["sources"][0],
-                    farsi_title=headline["farsi_title"],
-                    farsi_summary=headline["farsi_summary"],
-                    sent_to_telegram=True,
+                rows.append(
+                    {
+                        "title": headline["title"],
+                        "summary": headline["summary"],
+                        "source": headline["sources"][0],
+                        "farsi_title": headline["farsi_title"],
+                        "farsi_summary": headline["farsi_summary"],
+                        "topic": self.topic,
+                    }
                 )
+                stored.append(headline)
+            except (KeyError, IndexError) as e:
+                self.logger.error(f"Skipping malformed headline: {e}")
 
-                send_to_telegram(headline, self.topic, locale="english")
-                send_to_telegram(headline, self.topic, locale="farsi")
+        def enqueue(cur, position, article_id):
+            # Delivery happens in OutboxDeliveryWorker; duplicates are not re-sent
+            self.outbox_service.enqueue(
+                stored[position], self.topic, article_id=article_id, cur=cur
+            )
 
-            except Exception as e:
-                self.logger.error(f"Failed to send article: {e}")
+        # Articles and their outbox rows commit together; a failure fails
+        # the run, so the scheduler retries it
+        self.article_service.create_articles_bulk(
+            rows, on_created=enqueue if self.outbox_service is not None else None
+        )
 
         self.logger.info(f"✅ Task Ended - aggregated {self.topic} news")
         return True
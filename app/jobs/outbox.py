@@ -0,0 +1,184 @@
+import asyncio
+import os
+import socket
+import uuid
+from app.db.outbox_service import OutboxService
+from app.utils.logger import setup_logger
+from app.utils.telegram import (
+    build_digest_requests,
+    build_telegram_requests,
+    headline_image,
+)
+from app.utils.telegram_client import PartialSendError, get_telegram_client
+
+
+class OutboxDeliveryWorker:
+    """
+    Drains the Telegram outbox. Runs independently of the generation jobs;
+    any number of workers (in one or several processes) can run side by
+    side since rows are claimed with SKIP LOCKED. Claimed rows for
+    different chats are sent concurrently, each chat paced by the
+    client's rate scheduler.
+
+    In digest mode, short headlines claimed together for the same chat,
+    locale and topic are sent as one message (or one photo album) instead
+    of one message each.
+
+    A headline can take several requests (photo, then text parts). When a
+    send fails partway, the unsent requests are stored on the row and the
+    retry sends only those, so parts already delivered are not repeated.
+    """
+
+    def __init__(
+        self,
+        outbox_service: OutboxService,
+        worker_id: str = None,
+        batch_size: int = 100,
+        poll_interval: float = 5.0,
+        lease_seconds: int = 300,
+        max_attempts: int = 8,
+        digest: bool = False,
+        digest_max_summary: int = 600,
+    ):
+        self.outbox_service = outbox_service
+        self.worker_id = (
+            worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        )
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.digest = digest
+        self.digest_max_summary = digest_max_summary
+        self.logger = setup_logger(self.__class__.__name__)
+
+    def drain_once(self) -> int:
+        """Claims and delivers one batch. Returns the number of rows claimed."""
+        rows = self.outbox_service.claim(
+            self.worker_id, limit=self.batch_size, lease_seconds=self.lease_seconds
+        )
+        if not rows:
+            return 0
+
+        # Partially sent rows resume with their stored requests
+        resumed = [row for row in rows if row["remaining"]]
+        fresh = [row for row in rows if not row["remaining"]]
+
+        # Fetch each article's preview image once, not once per locale
+        images = {}
+        for row in fresh:
+            image_key = row["article_id"] or row["id"]
+            if image_key not in images:
+                images[image_key] = headline_image(row["payload"])
+
+        groups = self._digest_groups(fresh) if self.digest else [[row] for row in fresh]
+
+        # Render each message once per article and locale; fan-out rows for
+        # other chats reuse the same requests
+        rendered = {}
+        batches = [
+            (row["remaining"]["chat_id"], row["remaining"]["requests"])
+            for row in resumed
+        ]
+        for group in groups:
+            first = group[0]
+            article_keys = tuple(row["article_id"] or row["id"] for row in group)
+            render_key = (article_keys, first["locale"], first["topic"])
+            if first["chat_id"] is None or render_key not in rendered:
+                group_images = [images[key] for key in article_keys]
+                if len(group) > 1:
+                    rendered[render_key] = build_digest_requests(
+                        [row["payload"] for row in group],
+                        first["topic"],
+                        first["locale"],
+                        chat_id=first["chat_id"],
+                        image_urls=group_images,
+                    )
+                else:
+                    rendered[render_key] = build_telegram_requests(
+                        first["payload"],
+                        first["topic"],
+                        first["locale"],
+                        chat_id=first["chat_id"],
+                        image_url=group_images[0],
+                    )
+
+            chat_id, requests_to_send = rendered[render_key]
+            if first["chat_id"] is not None:
+                chat_id = first["chat_id"]
+            batches.append((chat_id, requests_to_send))
+        groups = [[row] for row in resumed] + groups
+
+        client = get_telegram_client()
+        results = client.run(client.send_batches(batches))
+
+        for group, (chat_id, requests_to_send), result in zip(groups, batches, results):
+            if not isinstance(result, Exception):
+                for row in group:
+                    self.outbox_service.mark_delivered(row["id"])
+                continue
+
+            if not isinstance(result, PartialSendError):
+                for row in group:
+                    self.logger.error(
+                        f"[{self.worker_id}] ❌ Outbox message {row['id']} failed (attempt {row['attempts']}): {result}"
+                    )
+                    self.outbox_service.mark_failed(
+                        row["id"], str(result), max_attempts=self.max_attempts
+                    )
+                continue
+
+            # The unsent parts cover the whole group (a digest carries every
+            # row's headline), so the first row takes them over and the
+            # others are done
+            first, others = group[0], group[1:]
+            self.logger.error(
+                f"[{self.worker_id}] ❌ Outbox message {first['id']} failed after {result.sent} part(s) (attempt {first['attempts']}): {result}"
+            )
+            self.outbox_service.mark_failed(
+                first["id"],
+                str(result),
+                max_attempts=self.max_attempts,
+                remaining={
+                    "chat_id": chat_id,
+                    "requests": requests_to_send[result.sent :],
+                },
+            )
+            for row in others:
+                self.outbox_service.mark_delivered(row["id"])
+
+        self.logger.info(
+            f"[{self.worker_id}] 📬 Processed {len(rows)} outbox message(s)"
+        )
+        return len(rows)
+
+    def _digest_groups(self, rows) -> list:
+        """
+        Groups short headlines by (chat, locale, topic), keeping claim order.
+        Long headlines, which would not fit a digest anyway, stay on their own.
+        """
+        groups = {}
+        for row in rows:
+            headline = row["payload"]
+            field = "farsi_summary" if row["locale"] == "farsi" else "summary"
+            summary = headline.get(field) or headline.get("summary", "")
+            if len(summary) > self.digest_max_summary:
+                groups[("single", row["id"])] = [row]
+            else:
+                key = (row["chat_id"], row["locale"], row["topic"])
+                groups.setdefault(key, []).append(row)
+        return list(groups.values())
+
+    async def start(self):
+        self.logger.info(f"[{self.worker_id}] 📮 Outbox delivery worker started")
+        while True:
+            try:
+                claimed = await asyncio.to_thread(self.drain_once)
+            except Exception as e:
+                self.logger.error(
+                    f"[{self.worker_id}] ❌ Outbox worker error: {e}", exc_info=True
+                )
+                claimed = 0
+
+            if claimed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
@@ -1,21 +1,52 @@
 from app.jobs.base import AbstractCronJob
 from app.db.article_service import ArticleService
+from app.db.outbox_service import OutboxService
+from app.db.translation_service import TranslationMemoryService
 from app.scrapers.isw import ISWReportScraper
 from app.utils.ai import GeminiClient
-from app.utils.telegram import send_to_telegram
+from app.utils.translation import GeminiSegmentTranslator
 from google.genai import types
 
 
+# Section headers are rendered locally; their Farsi comes from translation memory
+SECTION_HEADERS = {
+    "political_developments": "🏛️ Political developments",
+    "economical_developments": "💰 Economic developments",
+    "air_war": "✈️ Air war",
+    "changes_on_ground": "🪖 Changes on ground",
+    "other": "📌 Other updates",
+}
+
+
 class UkraineSummary(AbstractCronJob):
     def __init__(
         self,
         article_service: ArticleService,
+        outbox_service: OutboxService,
         cron_expression: str,
         job_name: str,
+        translation_memory: TranslationMemoryService = None,
     ):
         super().__init__(cron_expression, job_name)
         self.topic = "ukraine_war_daily_update"
+        self.llm_route = "ukraine_summary"
         self.article_service = article_service
+        self.outbox_service = outbox_service
+        self.translation_memory = translation_memory
+
+    def farsi_section_headers(self) -> dict:
+        headers = list(SECTION_HEADERS.values())
+        translator = GeminiSegmentTranslator(job=self.job_name, route=self.llm_route)
+        if self.translation_memory is None:
+            try:
+                return translator(headers)
+            except Exception as e:
+                # Sections render without a header, as for unknown keys
+                self.logger.error(
+                    f"[{self.job_name}] ❌ Translating section headers failed: {e}"
+                )
+                return {}
+        return self.translation_memory.translate(headers, translator)
 
     def run(self):
         """
@@ -25,10 +56,12 @@ class UkraineSummary(AbstractCronJob):
         summary_input = scraper.run()
 
         llm_client = GeminiClient(
+            job=self.job_name,
+            route=self.llm_route,
             system_instruction=[
                 "You will receive a single ISW (Institute for the Study of War) report.",
                 "Your task is to summarize it for a Telegram audience using a clear and concise format.",
-                "Use informative section headers with relevant emojis to improve readability. Also add new line when required.",
+                "Do not add section headers to the body fields, they are added automatically. Use new lines when required.",
                 "Use only the information from the provided article — do not invent or add external context.",
                 "Ensure the summary is well-structured and not overly long.",
                 "Your response must be in valid JSON following this format:",
@@ -116,17 +149,25 @@ class UkraineSummary(AbstractCronJob):
             self.logger.info("✅ done - no article generated")
             return True
 
+        farsi_headers = self.farsi_section_headers()
+
         # Build English summary from body sections
         english_body_sections = []
-        for _, content in article["body"].items():
+        for key, content in article["body"].items():
             if content:  # Only add non-empty sections
-                english_body_sections.append(content)
+                header = SECTION_HEADERS.get(key)
+                english_body_sections.append(
+                    f"{header}\n{content}" if header else content
+                )
 
         # Build Farsi summary from farsi_body sections
         farsi_body_sections = []
-        for _, content in article["farsi_body"].items():
+        for key, content in article["farsi_body"].items():
             if content:  # Only add non-empty sections
-                farsi_body_sections.append(content)
+                header = farsi_headers.get(SECTION_HEADERS.get(key))
+                farsi_body_sections.append(
+                    f"{header}\n{content}" if header else content
+                )
 
         # Create the result dictionary compatible with send_to_telegram
         headline = {
@@ -137,19 +178,22 @@ class UkraineSummary(AbstractCronJob):
             "sources": [scraper.get_source()],
         }
 
-        # Save to database
+        def enqueue(cur, article_id):
+            # Queue for delivery in both languages; duplicates are not re-sent
+            self.outbox_service.enqueue(
+                headline, self.topic, article_id=article_id, cur=cur
+            )
+
+        # Save to database together with its outbox rows
         self.article_service.create_article(
             headline["title"],
             headline["summary"],
             scraper.get_source(),
             farsi_title=headline["farsi_title"],
             farsi_summary=headline["farsi_summary"],
-            sent_to_telegram=True,
+            topic=self.topic,
+            on_created=enqueue if self.outbox_service is not None else None,
         )
 
-        # Send to Telegram in both languages
-        send_to_telegram(headline, self.topic, locale="english")
-        send_to_telegram(headline, self.topic, locale="farsi")
-
         self.logger.info(f"✅ Task Ended - aggregated {self.topic} news")
         return True
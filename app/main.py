@@ -9,12 +9,15 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import asyncio
+import os
 
 # ---------------- Internals ------------------------------
 from app.utils.logger import setup_logger
 
 from app.jobs.news import NewsAggregator
 from app.jobs.ukraine import UkraineSummary
+from app.jobs.outbox import OutboxDeliveryWorker
+from app.jobs.maintenance import ArticlePartitionMaintenance, JobRunCompaction
 from app.jobs.football import (
     FootballWeekSummary,
     FootballYesterdayResults,
@@ -22,9 +25,14 @@ from app.jobs.football import (
 )
 
 from app.db.base_service import BaseDatabaseService
-from app.db.article_service import ArticleService
+from app.db.backend import create_article_service, is_sqlite
+from app.db.translation_service import TranslationMemoryService
+from app.db.outbox_service import OutboxService
+from app.db.subscription_service import SubscriptionService
+from app.db.partition_service import ArticlePartitionService
+from app.db.async_service import get_async_database
 
-from app.api import health, rss, metrics
+from app.api import health, rss, metrics, export
 
 # --------------------------------------------------------
 
@@ -36,15 +44,41 @@ app = FastAPI()
 app.include_router(rss.router)
 app.include_router(health.router)
 app.include_router(metrics.router)
+app.include_router(export.router)
 
 
 @app.on_event("startup")
 async def start_scheduler():
-    base_service = BaseDatabaseService()
-    article_service = ArticleService(base_service)
+    article_service = create_article_service()
+
+    # The embedded SQLite backend stores articles and job runs only: no
+    # Telegram outbox, translation memory or partitions
+    translation_memory = None
+    outbox_service = None
+    partition_service = None
+    if is_sqlite():
+        logger.warning(
+            "⚠️ SQLite backend: Telegram delivery is off. Jobs still call Gemini "
+            "and store articles, but nothing is posted to Telegram."
+        )
+    else:
+        base_service = BaseDatabaseService()
+        translation_memory = TranslationMemoryService(base_service)
+        subscription_service = SubscriptionService(base_service)
+        outbox_service = OutboxService(base_service, subscription_service)
+
+        retention_months = os.getenv("ARTICLE_RETENTION_MONTHS")
+        partition_service = ArticlePartitionService(
+            base_service,
+            retention_months=int(retention_months) if retention_months else None,
+            archive_dir=os.getenv("ARTICLE_ARCHIVE_DIR") or None,
+        )
+        # Make sure this month's partition exists before any job inserts
+        partition_service.ensure_partitions()
 
     general_news_job = NewsAggregator(
         article_service,
+        outbox_service,
         "0 */2 * * *",
         "General News Aggregator",
         topic="general",
@@ -56,6 +90,7 @@ async def start_scheduler():
 
     sport_news_job = NewsAggregator(
         article_service,
+        outbox_service,
         "30 2 * * *",
         "🏈 Sport News Aggregator",
         topic="sports",
@@ -67,6 +102,7 @@ async def start_scheduler():
 
     defense_news_job = NewsAggregator(
         article_service,
+        outbox_service,
         "30 3 * * *",
         "🛡️ Defense News Aggregator",
         topic="defense",
@@ -78,6 +114,7 @@ async def start_scheduler():
 
     environment_news_job = NewsAggregator(
         article_service,
+        outbox_service,
         "30 4 * * *",
         "🌱 Environment News Aggregator",
         topic="environment",
@@ -89,6 +126,7 @@ async def start_scheduler():
 
     tech_news_job = NewsAggregator(
         article_service,
+        outbox_service,
         "30 5 * * *",
         "💻 Tech News Aggregator",
         topic="tech",
@@ -100,6 +138,7 @@ async def start_scheduler():
 
     programming_news_job = NewsAggregator(
         article_service,
+        outbox_service,
         "30 6 * * *",
         "👨‍💻 Programming News Aggregator",
         topic="programming",
@@ -110,21 +149,45 @@ async def start_scheduler():
     )  # every day
 
     ukraine_summary_job = UkraineSummary(
-        article_service, "30 7 * * *", "🇺🇦 Ukraine War Tracker"
+        article_service,
+        outbox_service,
+        "30 7 * * *",
+        "🇺🇦 Ukraine War Tracker",
+        translation_memory=translation_memory,
     )
 
     football_yesterday_recap_job = FootballYesterdayResults(
-        article_service, "30 8 * * *", "⚽ Football Yesterday Recap"
+        article_service,
+        outbox_service,
+        "30 8 * * *",
+        "⚽ Football Yesterday Recap",
+        translation_memory=translation_memory,
     )
 
     football_today_notification_job = FootballTodayGameNotification(
-        article_service, "35 8 * * *", "📢 Football Today Notification"
+        article_service,
+        outbox_service,
+        "35 8 * * *",
+        "📢 Football Today Notification",
+        translation_memory=translation_memory,
     )
 
     football_weekly_job = FootballWeekSummary(
-        article_service, "30 9 * * 4", "📅 Football Next Week Preview"
+        article_service,
+        outbox_service,
+        "30 9 * * 4",
+        "📅 Football Next Week Preview",
+        translation_memory=translation_memory,
     )
 
+    job_run_compaction_job = JobRunCompaction(
+        "15 1 * * *",
+        "🧹 Job Run Compaction",
+        retention_days=int(os.getenv("JOB_RUN_RETENTION_DAYS", "30")),
+    )  # every day
+
+    asyncio.create_task(job_run_compaction_job.start())
+
     asyncio.create_task(general_news_job.start())
     asyncio.create_task(sport_news_job.start())
     asyncio.create_task(defense_news_job.start())
@@ -138,4 +201,28 @@ async def start_scheduler():
     asyncio.create_task(football_today_notification_job.start())
     asyncio.create_task(football_weekly_job.start())
 
+    if partition_service is not None:
+        partition_maintenance_job = ArticlePartitionMaintenance(
+            partition_service,
+            "0 1 * * *",
+            "🗂️ Article Partition Maintenance",
+        )  # every day
+        asyncio.create_task(partition_maintenance_job.start())
+
+    # Telegram delivery runs separately from generation, see OutboxDeliveryWorker
+    if outbox_service is not None:
+        for _ in range(int(os.getenv("OUTBOX_WORKERS", "2"))):
+            asyncio.create_task(
+                OutboxDeliveryWorker(
+                    outbox_service,
+                    digest=os.getenv("OUTBOX_DIGEST", "false").lower() == "true",
+                ).start()
+            )
+
     logger.info("✅ All jobs scheduled with staggered times.")
+
+
+@app.on_event("shutdown")
+async def close_database():
+    if not is_sqlite():
+        await get_async_database().close()
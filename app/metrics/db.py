@@ -0,0 +1,78 @@
+from typing import Optional
+from prometheus_client import Counter, Gauge, Histogram
+
+
+class DatabaseMetrics:
+    """
+    Handles all Prometheus metrics for database connection pools.
+    """
+
+    def __init__(self):
+        self.pool_size = Gauge(
+            "db_pool_size",
+            "Maximum number of connections in the pool",
+            ["pool"],
+        )
+
+        self.pool_in_use = Gauge(
+            "db_pool_connections_in_use",
+            "Connections currently checked out of the pool",
+            ["pool"],
+        )
+
+        self.pool_wait_seconds = Histogram(
+            "db_pool_wait_seconds",
+            "Time spent waiting for a free pooled connection",
+            ["pool"],
+            buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, float("inf")),
+        )
+
+        self.pool_timeouts_total = Counter(
+            "db_pool_timeouts_total",
+            "Checkouts that gave up waiting for a free connection",
+            ["pool"],
+        )
+
+        self.pool_health_check_failures_total = Counter(
+            "db_pool_health_check_failures_total",
+            "Pooled connections found broken and replaced",
+            ["pool"],
+        )
+
+        self.reads_total = Counter(
+            "db_reads_total",
+            "Routed article reads by target: replica, primary (recent write) or fallback (replica unavailable, lagging or failed mid-query)",
+            ["route"],
+        )
+
+    def pool_created(self, pool: str, maxconn: int):
+        self.pool_size.labels(pool=pool).set(maxconn)
+
+    def connection_acquired(self, pool: str, wait: float):
+        """Called when a connection is checked out, with the time waited."""
+        self.pool_wait_seconds.labels(pool=pool).observe(wait)
+        self.pool_in_use.labels(pool=pool).inc()
+
+    def connection_released(self, pool: str):
+        self.pool_in_use.labels(pool=pool).dec()
+
+    def acquire_timed_out(self, pool: str):
+        self.pool_timeouts_total.labels(pool=pool).inc()
+
+    def health_check_failed(self, pool: str):
+        self.pool_health_check_failures_total.labels(pool=pool).inc()
+
+    def read_routed(self, route: str):
+        self.reads_total.labels(route=route).inc()
+
+
+# Global metrics instance - singleton pattern
+_metrics_instance: Optional[DatabaseMetrics] = None
+
+
+def get_db_metrics() -> DatabaseMetrics:
+    """Get the global database metrics instance."""
+    global _metrics_instance
+    if _metrics_instance is None:
+        _metrics_instance = DatabaseMetrics()
+    return _metrics_instance
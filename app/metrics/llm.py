@@ -0,0 +1,149 @@
+from typing import Optional
+from prometheus_client import Counter, Histogram
+
+
+class LLMMetrics:
+    """
+    Handles all Prometheus metrics for LLM calls.
+    """
+
+    def __init__(self):
+        latency_buckets = (
+            0.5,
+            1.0,
+            2.5,
+            5.0,
+            10.0,
+            20.0,
+            30.0,
+            60.0,
+            90.0,
+            120.0,
+            float("inf"),
+        )
+        token_buckets = (
+            100,
+            500,
+            1000,
+            2500,
+            5000,
+            10000,
+            25000,
+            50000,
+            100000,
+            float("inf"),
+        )
+
+        self.requests_total = Counter(
+            "llm_requests_total",
+            "Total number of LLM requests",
+            ["job_name", "model", "status"],  # status: success, error, cancelled
+        )
+
+        self.request_duration_seconds = Histogram(
+            "llm_request_duration_seconds",
+            "Total time spent on an LLM request, including streaming",
+            ["job_name", "model"],
+            buckets=latency_buckets,
+        )
+
+        self.time_to_first_chunk_seconds = Histogram(
+            "llm_time_to_first_chunk_seconds",
+            "Time until the first streamed chunk arrives",
+            ["job_name", "model"],
+            buckets=latency_buckets,
+        )
+
+        self.prompt_tokens = Histogram(
+            "llm_prompt_tokens",
+            "Prompt token count reported by usage metadata",
+            ["job_name", "model"],
+            buckets=token_buckets,
+        )
+
+        self.output_tokens = Histogram(
+            "llm_output_tokens",
+            "Output (candidates) token count reported by usage metadata",
+            ["job_name", "model"],
+            buckets=token_buckets,
+        )
+
+        self.thinking_tokens = Histogram(
+            "llm_thinking_tokens",
+            "Thinking token count reported by usage metadata",
+            ["job_name", "model"],
+            buckets=token_buckets,
+        )
+
+        self.stream_bytes_total = Counter(
+            "llm_stream_bytes_total",
+            "Total bytes of response text streamed",
+            ["job_name", "model"],
+        )
+
+        self.json_parse_failures_total = Counter(
+            "llm_json_parse_failures_total",
+            "Responses that could not be parsed or validated as JSON",
+            ["job_name", "model"],
+        )
+
+        self.hedged_requests_total = Counter(
+            "llm_hedged_requests_total",
+            "Requests re-sent to a fallback model because the primary was slow or failed",
+            ["job_name", "model", "fallback_model"],
+        )
+
+    def request_finished(
+        self,
+        job_name: str,
+        model: str,
+        status: str,
+        duration: float,
+        first_chunk_after: Optional[float],
+        bytes_streamed: int,
+        usage=None,
+    ):
+        """Called when a streamed request ends (successfully or not)."""
+        labels = {"job_name": job_name or "unknown", "model": model}
+        self.requests_total.labels(status=status, **labels).inc()
+        self.request_duration_seconds.labels(**labels).observe(duration)
+        self.stream_bytes_total.labels(**labels).inc(bytes_streamed)
+
+        if first_chunk_after is not None:
+            self.time_to_first_chunk_seconds.labels(**labels).observe(first_chunk_after)
+
+        if usage is not None:
+            if usage.prompt_token_count is not None:
+                self.prompt_tokens.labels(**labels).observe(usage.prompt_token_count)
+            if usage.candidates_token_count is not None:
+                self.output_tokens.labels(**labels).observe(
+                    usage.candidates_token_count
+                )
+            if usage.thoughts_token_count is not None:
+                self.thinking_tokens.labels(**labels).observe(
+                    usage.thoughts_token_count
+                )
+
+    def json_parse_failed(self, job_name: str, model: str):
+        """Called when a response is not valid JSON for the schema."""
+        self.json_parse_failures_total.labels(
+            job_name=job_name or "unknown", model=model
+        ).inc()
+
+    def request_hedged(self, job_name: str, model: str, fallback_model: str):
+        """Called when a fallback request is fired."""
+        self.hedged_requests_total.labels(
+            job_name=job_name or "unknown", model=model, fallback_model=fallback_model
+        ).inc()
+
+
+# Global metrics instance - singleton pattern
+_metrics_instance: Optional[LLMMetrics] = None
+
+
+def get_llm_metrics() -> LLMMetrics:
+    """Get the global LLM metrics instance."""
+    global _metrics_instance
+    if _metrics_instance is None:
+        _metrics_instance = LLMMetrics()
+    return _metrics_instance
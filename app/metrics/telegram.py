@@ -0,0 +1,83 @@
+from typing import Optional
+from prometheus_client import Counter, Histogram
+
+
+class TelegramMetrics:
+    """
+    Handles all Prometheus metrics for Telegram delivery.
+    """
+
+    def __init__(self):
+        self.requests_total = Counter(
+            "telegram_requests_total",
+            "Total number of Telegram Bot API requests",
+            ["chat_id", "method", "status"],  # status: success, throttled, error
+        )
+
+        self.send_duration_seconds = Histogram(
+            "telegram_send_duration_seconds",
+            "Time spent on a Telegram send, including retries and backoff",
+            ["chat_id", "method"],
+            buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, float("inf")),
+        )
+
+        self.throttled_total = Counter(
+            "telegram_throttled_total",
+            "Number of 429 responses received from Telegram",
+            ["chat_id"],
+        )
+
+        self.retry_after_seconds_total = Counter(
+            "telegram_retry_after_seconds_total",
+            "Total seconds spent waiting on Telegram retry_after",
+            ["chat_id"],
+        )
+
+        self.pacing_wait_seconds_total = Counter(
+            "telegram_pacing_wait_seconds_total",
+            "Total seconds sends waited on the per-chat rate scheduler",
+            ["chat_id"],
+        )
+
+        self.file_id_cache_total = Counter(
+            "telegram_file_id_cache_total",
+            "Photo sends served from a cached Telegram file_id (hit) or by URL (miss)",
+            ["result"],
+        )
+
+    def request_finished(self, chat_id, method: str, status: str):
+        """Called after every Bot API request attempt."""
+        self.requests_total.labels(
+            chat_id=str(chat_id), method=method, status=status
+        ).inc()
+
+    def send_finished(self, chat_id, method: str, duration: float):
+        """Called when a send completes, after all its retries."""
+        self.send_duration_seconds.labels(chat_id=str(chat_id), method=method).observe(
+            duration
+        )
+
+    def throttled(self, chat_id, retry_after: float):
+        """Called when Telegram answers 429 Too Many Requests."""
+        self.throttled_total.labels(chat_id=str(chat_id)).inc()
+        self.retry_after_seconds_total.labels(chat_id=str(chat_id)).inc(retry_after)
+
+    def paced(self, chat_id, seconds: float):
+        """Called when a send was delayed by the rate scheduler."""
+        self.pacing_wait_seconds_total.labels(chat_id=str(chat_id)).inc(seconds)
+
+    def file_id_lookup(self, result: str):
+        """Called for every photo sent, with 'hit' or 'miss'."""
+        self.file_id_cache_total.labels(result=result).inc()
+
+
+# Global metrics instance - singleton pattern
+_metrics_instance: Optional[TelegramMetrics] = None
+
+
+def get_telegram_metrics() -> TelegramMetrics:
+    """Get the global Telegram metrics instance."""
+    global _metrics_instance
+    if _metrics_instance is None:
+        _metrics_instance = TelegramMetrics()
+    return _metrics_instance
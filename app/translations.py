@@ -0,0 +1,42 @@
+"""
+Adds approved English -> Farsi pairs to the translation memory. Approved
+pairs are used as-is and never replaced by captured LLM translations.
+
+    python -m app.translations "Real Madrid CF" "رئال مادرید"
+    python -m app.translations --csv glossary.csv
+"""
+
+import argparse
+import csv
+
+from dotenv import load_dotenv
+
+from app.db.base_service import BaseDatabaseService
+from app.db.translation_service import TranslationMemoryService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("source", nargs="?", help="English segment")
+    parser.add_argument("farsi", nargs="?", help="Its Farsi translation")
+    parser.add_argument("--csv", help="CSV file of source,farsi rows to approve")
+    args = parser.parse_args()
+
+    pairs = {}
+    if args.csv:
+        with open(args.csv, newline="", encoding="utf-8") as f:
+            pairs.update({row[0]: row[1] for row in csv.reader(f) if len(row) >= 2})
+    if args.source or args.farsi:
+        if not (args.source and args.farsi):
+            parser.error("give both the English segment and its Farsi translation")
+        pairs[args.source] = args.farsi
+    if not pairs:
+        parser.error("nothing to approve: give a pair or --csv")
+
+    load_dotenv()
+    translation_memory = TranslationMemoryService(BaseDatabaseService())
+    translation_memory.remember(pairs, approved=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,55 @@
 import os
 import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from typing import Union, List
 from google import genai
 from google.genai import types
+from app.utils.llm_router import get_router
+from app.metrics.llm import get_llm_metrics
 
 
 class GeminiClient:
     def __init__(
         self,
         api_key: str = None,
-        model: str = "gemini-2.5-flash",
+        model: str = None,
         system_instruction: Union[str, List[str]] = None,
         response_schema: genai.types.Schema = None,
+        job: str = None,
+        route: str = None,
+        hedge: bool = True,
+        base_url: str = None,
     ):
+        """
+        Args:
+            model: Pin every call to this model. When omitted the model and
+                thinking budget are picked by the global ModelRouter.
+            job: Job name, used to label metrics.
+            route: Stable name of the call site, used for routing overrides
+                (see llm_router.DEFAULT_ROUTE_OVERRIDES).
+            hedge: Fire a request at the fallback model when the primary is
+                slower than its learned latency percentile.
+            base_url: Override the Gemini API endpoint (defaults to the
+                GEMINI_BASE_URL environment variable), e.g. to point at the
+                local stand-in in app/devtools/gemini_stub.py.
+        """
+        self.base_url = base_url or os.environ.get("GEMINI_BASE_URL")
         self.api_key = api_key or os.environ.get("GEMINI_API_KEY")
+        if self.base_url and not self.api_key:
+            # The stand-in server does not check keys, but the SDK requires one
+            self.api_key = "offline"
         self.model = model
-        self.client = genai.Client(api_key=self.api_key)
+        self.job = job
+        self.route = route
+        self.hedge = hedge
+        self.router = get_router()
+        self.metrics = get_llm_metrics()
+        http_options = (
+            types.HttpOptions(base_url=self.base_url) if self.base_url else None
+        )
+        self.client = genai.Client(api_key=self.api_key, http_options=http_options)
         self.system_instruction = self._build_system_instruction(system_instruction)
         self.response_schema = response_schema or self._default_schema()
 
@@ -80,7 +114,27 @@ class GeminiClient:
             },
         )
 
-    def generate(self, prompt: str) -> dict:
+    def _route(self, prompt: str) -> dict:
+        if self.model:
+            return {
+                "key": f"{self.model}:pinned",
+                "model": self.model,
+                "thinking_budget": 5000,
+                "fallback": None,
+            }
+        return self.router.route(prompt, name=self.route)
+
+    def _is_valid(self, result: dict) -> bool:
+        required = self.response_schema.required or []
+        return isinstance(result, dict) and all(key in result for key in required)
+
+    def _generate_once(
+        self,
+        prompt: str,
+        model: str,
+        thinking_budget: int,
+        cancelled: threading.Event = None,
+    ) -> dict:
         contents = [
             types.Content(
                 role="user",
@@ -89,24 +143,105 @@ class GeminiClient:
         ]
 
         config = types.GenerateContentConfig(
-            thinking_config=types.ThinkingConfig(thinking_budget=5000),
+            thinking_config=types.ThinkingConfig(thinking_budget=thinking_budget),
             response_mime_type="application/json",
             response_schema=self.response_schema,
             system_instruction=self.system_instruction,
         )
 
         output = ""
-        for chunk in self.client.models.generate_content_stream(
-            model=self.model,
-            contents=contents,
-            config=config,
-        ):
-            if chunk.text:
-                output += chunk.text
+        usage = None
+        bytes_streamed = 0
+        first_chunk_after = None
+        status = "error"
+        start = time.monotonic()
 
         try:
-            return json.loads(output)
-        except json.JSONDecodeError as e:
-            raise ValueError(
-                f"Failed to parse JSON response: {e}\n\nRaw output:\n{output}"
+            for chunk in self.client.models.generate_content_stream(
+                model=model,
+                contents=contents,
+                config=config,
+            ):
+                if first_chunk_after is None:
+                    first_chunk_after = time.monotonic() - start
+                if cancelled is not None and cancelled.is_set():
+                    # The other request already won, stop consuming the stream
+                    status = "cancelled"
+                    return None
+                if chunk.usage_metadata is not None:
+                    usage = chunk.usage_metadata
+                if chunk.text:
+                    output += chunk.text
+                    bytes_streamed += len(chunk.text.encode("utf-8"))
+
+            try:
+                result = json.loads(output)
+            except json.JSONDecodeError as e:
+                self.metrics.json_parse_failed(self.job, model)
+                raise ValueError(
+                    f"Failed to parse JSON response: {e}\n\nRaw output:\n{output}"
+                )
+
+            if not self._is_valid(result):
+                self.metrics.json_parse_failed(self.job, model)
+                raise ValueError(f"Response is missing required fields:\n{output}")
+
+            status = "success"
+            return result
+        finally:
+            self.metrics.request_finished(
+                self.job,
+                model,
+                status,
+                time.monotonic() - start,
+                first_chunk_after,
+                bytes_streamed,
+                usage,
             )
+
+    def _timed_call(self, prompt: str, route: dict, cancelled: threading.Event):
+        start = time.monotonic()
+        result = self._generate_once(
+            prompt, route["model"], route["thinking_budget"], cancelled
+        )
+        # A call cancelled because the other one won took at least this long;
+        # dropping it would leave only fast samples and drag hedge_after down
+        if result is not None or (cancelled is not None and cancelled.is_set()):
+            self.router.record_latency(route, time.monotonic() - start)
+        return result
+
+    def generate(self, prompt: str) -> dict:
+        route = self._route(prompt)
+        hedge_after = self.router.hedge_after(route) if self.hedge else None
+
+        if hedge_after is None:
+            return self._timed_call(prompt, route, None)
+
+        fallback = dict(route["fallback"], key=f"{route['fallback']['model']}:hedge")
+        cancelled = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=2)
+
+        try:
+            primary = executor.submit(self._timed_call, prompt, route, cancelled)
+            done, _ = wait([primary], timeout=hedge_after)
+            if primary in done and primary.exception() is None:
+                return primary.result()
+
+            # Primary is slow (or already failed): race it against the fallback
+            self.metrics.request_hedged(self.job, route["model"], fallback["model"])
+            pending = {
+                primary,
+                executor.submit(self._timed_call, prompt, fallback, cancelled),
+            }
+            errors = []
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is None and future.result() is not None:
+                        return future.result()
+                    errors.append(future.exception())
+
+            raise errors[0]
+        finally:
+            cancelled.set()
+            executor.shutdown(wait=False)
@@ -0,0 +1,176 @@
+import csv
+import io
+import json
+
+# Columns of an exported article, in list_articles_query order
+EXPORT_COLUMNS = [
+    "id",
+    "title",
+    "summary",
+    "source",
+    "sent_to_telegram",
+    "created_at",
+    "farsi_title",
+    "farsi_summary",
+    "topic",
+]
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class NdjsonEncoder:
+    """One JSON object per line."""
+
+    def start(self) -> bytes:
+        return b""
+
+    def encode(self, articles: list) -> bytes:
+        lines = []
+        for article in articles:
+            row = {column: article[column] for column in EXPORT_COLUMNS}
+            row["created_at"] = row["created_at"].isoformat()
+            lines.append(json.dumps(row, ensure_ascii=False))
+        return ("\n".join(lines) + "\n").encode() if lines else b""
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class CsvEncoder:
+    """RFC 4180 CSV with a header row."""
+
+    def __init__(self):
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue().encode()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+    def start(self) -> bytes:
+        self._writer.writerow(EXPORT_COLUMNS)
+        return self._drain()
+
+    def encode(self, articles: list) -> bytes:
+        for article in articles:
+            row = [article[column] for column in EXPORT_COLUMNS]
+            row[EXPORT_COLUMNS.index("created_at")] = article["created_at"].isoformat()
+            self._writer.writerow(row)
+        return self._drain()
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class _ChunkSink:
+    """File-like object ParquetWriter writes to; the encoder drains it per batch."""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+class ParquetEncoder:
+    """
+    Parquet with one row group per batch, so only the current batch is held
+    in memory. Needs the optional pyarrow package.
+    """
+
+    def __init__(self):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError(
+                "Parquet export requires pyarrow (pip install pyarrow)"
+            ) from e
+
+        self._pa = pa
+        self._schema = pa.schema(
+            [
+                ("id", pa.string()),
+                ("title", pa.string()),
+                ("summary", pa.string()),
+                ("source", pa.string()),
+                ("sent_to_telegram", pa.bool_()),
+                ("created_at", pa.timestamp("us")),
+                ("farsi_title", pa.string()),
+                ("farsi_summary", pa.string()),
+                ("topic", pa.string()),
+            ]
+        )
+        self._sink = _ChunkSink()
+        self._writer = pq.ParquetWriter(self._sink, self._schema, compression="zstd")
+
+    def start(self) -> bytes:
+        return self._sink.drain()
+
+    def encode(self, articles: list) -> bytes:
+        if articles:
+            columns = {
+                column: [article[column] for article in articles]
+                for column in EXPORT_COLUMNS
+            }
+            self._writer.write_table(
+                self._pa.Table.from_pydict(columns, schema=self._schema)
+            )
+        return self._sink.drain()
+
+    def finish(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+
+def get_encoder(export_format: str):
+    """
+    Returns a fresh encoder for `export_format`. Raises ValueError for an
+    unknown format and RuntimeError when parquet is requested without pyarrow.
+    """
+    encoders = {"ndjson": NdjsonEncoder, "csv": CsvEncoder, "parquet": ParquetEncoder}
+    if export_format not in encoders:
+        raise ValueError(
+            f"Unknown export format {export_format!r}; use one of {', '.join(encoders)}"
+        )
+    return encoders[export_format]()
+
+
+def encode_batches(encoder, batches):
+    """Yields the encoded bytes for an iterable of article batches."""
+    yield encoder.start()
+    for batch in batches:
+        yield encoder.encode(batch)
+    yield encoder.finish()
+
+
+async def encode_batches_async(encoder, batches):
+    """Async counterpart of encode_batches for an async iterable of batches."""
+    yield encoder.start()
+    async for batch in batches:
+        yield encoder.encode(batch)
+    yield encoder.finish()
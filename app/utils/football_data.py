@@ -11,7 +11,7 @@ load_dotenv()
 
 
 class FootballDataClient:
-    BASE_URL = "https://api.football-data.org/v4"
+    BASE_URL = os.getenv("FOOTBALL_DATA_BASE_URL", "https://api.football-data.org/v4")
 
     def __init__(self, competitions=None):
         self.api_key = os.getenv("FOOTBALL_API_KEY")
@@ -73,8 +73,8 @@ class FootballDataClient:
 
         return next_friday.date().isoformat(), next_thursday.date().isoformat()
 
-    def format_match_for_llm(self, match):
-        """Format match data for LLM consumption."""
+    def parse_match(self, match):
+        """Extract the fields we use from a football-data match, with Tehran times."""
         status_map = {
             "SCHEDULED": "scheduled",
             "TIMED": "scheduled",
@@ -83,13 +83,7 @@ class FootballDataClient:
             "FINISHED": "finished",
         }
 
-        competition = match.get("competition", {}).get("name", "Unknown")
-        home_team = match["homeTeam"]["name"]
-        away_team = match["awayTeam"]["name"]
         utc_date = match["utcDate"]
-        status = status_map.get(match.get("status", "UNKNOWN"), "unknown")
-        home_score = match["score"]["fullTime"]["home"]
-        away_score = match["score"]["fullTime"]["away"]
 
         # Convert UTC to Tehran time
         utc_dt = datetime.fromisoformat(utc_date.replace("Z", "+00:00"))
@@ -98,13 +92,29 @@ class FootballDataClient:
 
         jalali_dt = jdatetime.datetime.fromgregorian(datetime=tehran_dt)
 
-        tehran_date_gregorian = tehran_dt.isoformat()
-        tehran_date_shamsi = jalali_dt.strftime("%Y-%m-%d %H:%M:%S")
+        return {
+            "competition": match.get("competition", {}).get("name", "Unknown"),
+            "home_team": match["homeTeam"]["name"],
+            "away_team": match["awayTeam"]["name"],
+            "utc_date": utc_date,
+            "tehran_dt": tehran_dt,
+            "jalali_dt": jalali_dt,
+            "status": status_map.get(match.get("status", "UNKNOWN"), "unknown"),
+            "home_score": match["score"]["fullTime"]["home"],
+            "away_score": match["score"]["fullTime"]["away"],
+        }
+
+    def format_match_for_llm(self, match):
+        """Format match data for LLM consumption."""
+        parsed = self.parse_match(match)
+
+        tehran_date_gregorian = parsed["tehran_dt"].isoformat()
+        tehran_date_shamsi = parsed["jalali_dt"].strftime("%Y-%m-%d %H:%M:%S")
 
         return (
-            f"competition={competition}|home_team={home_team}|away_team={away_team}|"
-            f"utc_date={utc_date}|tehran_date_shamsi={tehran_date_shamsi}|tehran_date_gregorian={tehran_date_gregorian}|status={status}|"
-            f"score={home_score}-{away_score}"
+            f"competition={parsed['competition']}|home_team={parsed['home_team']}|away_team={parsed['away_team']}|"
+            f"utc_date={parsed['utc_date']}|tehran_date_shamsi={tehran_date_shamsi}|tehran_date_gregorian={tehran_date_gregorian}|status={parsed['status']}|"
+            f"score={parsed['home_score']}-{parsed['away_score']}"
         )
 
     def format_standings_for_llm(self, standings):
@@ -154,56 +164,45 @@ class FootballDataClient:
 
         return summaries
 
-    def prep_last_day_summary(self):
-        """Generate LLM-friendly summary of yesterday's match results."""
-        yesterday = (datetime.now() - timedelta(days=1)).date().isoformat()
-        summaries = []
+    def get_matches_by_competition(self, date_from, date_to):
+        """Fetch raw matches per competition, skipping competitions with none."""
+        results = []
 
         for competition in self.competitions:
             try:
                 matches = self.get_matches_for_competition(
-                    competition, yesterday, yesterday
+                    competition, date_from, date_to
                 )
 
                 if not matches:
                     continue
 
-                formatted_matches = [
-                    self.format_match_for_llm(match) for match in matches
-                ]
-
-                summary = {"competition": competition, "matches": formatted_matches}
-
-                summaries.append(summary)
+                results.append({"competition": competition, "matches": matches})
 
             except requests.RequestException as e:
                 self.logger.error(f"Error fetching data for {competition}: {e}")
                 continue
 
-        return summaries
+        return results
 
-    def prep_today_summary(self):
-        """Generate LLM-friendly summary of today's matches."""
+    def prep_last_day_matches(self):
+        """Structured (parsed) yesterday's matches per competition, for local rendering."""
+        yesterday = (datetime.now() - timedelta(days=1)).date().isoformat()
+        return [
+            {
+                "competition": group["competition"],
+                "matches": [self.parse_match(m) for m in group["matches"]],
+            }
+            for group in self.get_matches_by_competition(yesterday, yesterday)
+        ]
+
+    def prep_today_matches(self):
+        """Structured (parsed) today's matches per competition, for local rendering."""
         today = datetime.now().date().isoformat()
-        summaries = []
-
-        for competition in self.competitions:
-            try:
-                matches = self.get_matches_for_competition(competition, today, today)
-
-                if not matches:
-                    continue
-
-                formatted_matches = [
-                    self.format_match_for_llm(match) for match in matches
-                ]
-
-                summary = {"competition": competition, "matches": formatted_matches}
-
-                summaries.append(summary)
-
-            except requests.RequestException as e:
-                self.logger.error(f"Error fetching data for {competition}: {e}")
-                continue
-
-        return summaries
+        return [
+            {
+                "competition": group["competition"],
+                "matches": [self.parse_match(m) for m in group["matches"]],
+            }
+            for group in self.get_matches_by_competition(today, today)
+        ]
@@ -0,0 +1,319 @@
+import jdatetime
+from datetime import date
+from google.genai import types
+from app.utils.ai import GeminiClient
+from app.utils.logger import setup_logger
+
+# English -> Farsi names, keyed by the names football-data.org returns
+TEAM_NAMES_FA = {
+    # Premier League
+    "AFC Bournemouth": "بورنموث",
+    "Arsenal FC": "آرسنال",
+    "Aston Villa FC": "استون ویلا",
+    "Brentford FC": "برنتفورد",
+    "Brighton & Hove Albion FC": "برایتون",
+    "Burnley FC": "برنلی",
+    "Chelsea FC": "چلسی",
+    "Crystal Palace FC": "کریستال پالاس",
+    "Everton FC": "اورتون",
+    "Fulham FC": "فولام",
+    "Leeds United FC": "لیدز یونایتد",
+    "Liverpool FC": "لیورپول",
+    "Manchester City FC": "منچسترسیتی",
+    "Manchester United FC": "منچستریونایتد",
+    "Newcastle United FC": "نیوکاسل",
+    "Nottingham Forest FC": "ناتینگهام فارست",
+    "Sunderland AFC": "ساندرلند",
+    "Tottenham Hotspur FC": "تاتنهام",
+    "West Ham United FC": "وستهام",
+    "Wolverhampton Wanderers FC": "ولورهمپتون",
+    # Primera Division
+    "Athletic Club": "اتلتیک بیلبائو",
+    "CA Osasuna": "اوساسونا",
+    "Club Atlético de Madrid": "اتلتیکو مادرید",
+    "Deportivo Alavés": "آلاوس",
+    "Elche CF": "الچه",
+    "FC Barcelona": "بارسلونا",
+    "Getafe CF": "ختافه",
+    "Girona FC": "ژیرونا",
+    "Levante UD": "لوانته",
+    "Rayo Vallecano de Madrid": "رایو وایکانو",
+    "RC Celta de Vigo": "سلتاویگو",
+    "RCD Espanyol de Barcelona": "اسپانیول",
+    "RCD Mallorca": "مایورکا",
+    "Real Betis Balompié": "رئال بتیس",
+    "Real Madrid CF": "رئال مادرید",
+    "Real Oviedo": "رئال اویدو",
+    "Real Sociedad de Fútbol": "رئال سوسیداد",
+    "Sevilla FC": "سویا",
+    "Valencia CF": "والنسیا",
+    "Villarreal CF": "ویارئال",
+    # Bundesliga
+    "1. FC Heidenheim 1846": "هایدنهایم",
+    "1. FC Köln": "کلن",
+    "1. FC Union Berlin": "اونیون برلین",
+    "1. FSV Mainz 05": "ماینتس",
+    "Bayer 04 Leverkusen": "بایر لورکوزن",
+    "Borussia Dortmund": "بوروسیا دورتموند",
+    "Borussia Mönchengladbach": "بوروسیا مونشن‌گلادباخ",
+    "Eintracht Frankfurt": "آینتراخت فرانکفورت",
+    "FC Augsburg": "آگسبورگ",
+    "FC Bayern München": "بایرن مونیخ",
+    "FC St. Pauli 1910": "سنت پائولی",
+    "Hamburger SV": "هامبورگ",
+    "RB Leipzig": "لایپزیگ",
+    "SC Freiburg": "فرایبورگ",
+    "SV Werder Bremen": "وردر برمن",
+    "TSG 1899 Hoffenheim": "هوفنهایم",
+    "VfB Stuttgart": "اشتوتگارت",
+    "VfL Wolfsburg": "ولفسبورگ",
+    # Other Champions League regulars
+    "AC Milan": "میلان",
+    "AFC Ajax": "آژاکس",
+    "AS Monaco FC": "موناکو",
+    "Atalanta BC": "آتالانتا",
+    "Club Brugge KV": "کلوب بروژ",
+    "FC Internazionale Milano": "اینتر",
+    "FC Porto": "پورتو",
+    "Galatasaray SK": "گالاتاسرای",
+    "Juventus FC": "یوونتوس",
+    "Olympique de Marseille": "مارسی",
+    "Paris Saint-Germain FC": "پاری سن ژرمن",
+    "PSV": "پی‌اس‌وی",
+    "Sport Lisboa e Benfica": "بنفیکا",
+    "Sporting Clube de Portugal": "اسپورتینگ لیسبون",
+    "SSC Napoli": "ناپولی",
+}
+
+COMPETITION_NAMES_FA = {
+    "Premier League": "لیگ برتر انگلیس",
+    "Primera Division": "لالیگا",
+    "Bundesliga": "بوندسلیگا",
+    "UEFA Champions League": "لیگ قهرمانان اروپا",
+}
+
+JALALI_MONTHS_FA = [
+    "فروردین",
+    "اردیبهشت",
+    "خرداد",
+    "تیر",
+    "مرداد",
+    "شهریور",
+    "مهر",
+    "آبان",
+    "آذر",
+    "دی",
+    "بهمن",
+    "اسفند",
+]
+
+PERSIAN_DIGITS = str.maketrans("0123456789", "۰۱۲۳۴۵۶۷۸۹")
+
+
+def to_persian_digits(value) -> str:
+    return str(value).translate(PERSIAN_DIGITS)
+
+
+class FootballRenderer:
+    """
+    Renders the fixed-format football posts (results and today's games)
+    and the weekly preview titles locally in English and Farsi from parsed
+    matches (see FootballDataClient.parse_match), instead of asking the
+    LLM to do it.
+
+    Names missing from the translation tables are looked up in the
+    translation memory (and, through `translator`, sent to the LLM once);
+    without one they are left in English. Team names the LLM writes in
+    the weekly preview are captured into the memory for the other posts.
+    """
+
+    def __init__(
+        self,
+        team_names_fa: dict = None,
+        competition_names_fa: dict = None,
+        translation_memory=None,
+        translator=None,
+    ):
+        self.team_names_fa = team_names_fa or TEAM_NAMES_FA
+        self.competition_names_fa = competition_names_fa or COMPETITION_NAMES_FA
+        self.translation_memory = translation_memory
+        self.translator = translator
+        self.learned_fa = {}
+        self.logger = setup_logger(self.__class__.__name__)
+
+    def team_fa(self, name: str) -> str:
+        return self.team_names_fa.get(name) or self.learned_fa.get(name, name)
+
+    def competition_fa(self, name: str) -> str:
+        return self.competition_names_fa.get(name) or self.learned_fa.get(name, name)
+
+    def _resolve_names(self, matches: list):
+        """Fill in names missing from the static tables in one memory lookup."""
+        names = {m["competition"] for m in matches} - set(self.competition_names_fa)
+        for m in matches:
+            names.update({m["home_team"], m["away_team"]} - set(self.team_names_fa))
+        self._resolve(names)
+
+    def _resolve(self, names: set):
+        if self.translation_memory is None:
+            return
+
+        names = set(names) - set(self.learned_fa)
+        if names:
+            self.learned_fa.update(
+                self.translation_memory.translate(sorted(names), self.translator)
+            )
+
+    def capture_team_names(
+        self, summary: str, farsi_summary: str, team_names: set
+    ) -> dict:
+        """
+        Learns team names from an LLM-written post: pairs the names of its
+        English and Farsi `Home 🆚 Away` lines, in order, and stores those
+        naming one of `team_names` in the translation memory. Nothing is
+        captured when the two languages list a different number of games.
+        """
+        english = [self._versus_names(line) for line in summary.splitlines()]
+        farsi = [self._versus_names(line) for line in farsi_summary.splitlines()]
+        english = [names for names in english if names]
+        farsi = [names for names in farsi if names]
+        if len(english) != len(farsi):
+            return {}
+
+        pairs = {}
+        for english_names, farsi_names in zip(english, farsi):
+            for name, farsi_name in zip(english_names, farsi_names):
+                if name in team_names and name not in self.team_names_fa:
+                    pairs[name] = farsi_name
+
+        if pairs:
+            self.learned_fa.update(pairs)
+            if self.translation_memory is not None:
+                self.translation_memory.remember(pairs)
+        return pairs
+
+    @staticmethod
+    def _versus_names(line: str):
+        """(home, away) of a `... | Home 🆚 Away` line, None for other lines."""
+        if line.count("🆚") != 1:
+            return None
+        home, away = line.split("🆚")
+        home = home.rsplit("|", 1)[-1].strip(" *")
+        away = away.strip(" *")
+        return (home, away) if home and away else None
+
+    def date_en(self, match, with_time=True) -> str:
+        fmt = "%d %b %Y, %H:%M" if with_time else "%d %b %Y"
+        return match["tehran_dt"].strftime(fmt)
+
+    def date_fa(self, match, with_time=True) -> str:
+        jalali = match["jalali_dt"]
+        date = f"{jalali.day} {JALALI_MONTHS_FA[jalali.month - 1]} {jalali.year}"
+        if with_time:
+            date += f"، ساعت {jalali.strftime('%H:%M')}"
+        return to_persian_digits(date)
+
+    def render_results(self, matches: list) -> dict:
+        """Finished matches of one competition -> article dict, None if nothing finished."""
+        finished = [m for m in matches if m["status"] == "finished"]
+        if not finished:
+            return None
+
+        self._resolve_names(finished)
+
+        competition = finished[0]["competition"]
+        summary, farsi_summary = [], []
+
+        for m in finished:
+            summary.append(
+                f"⚽ {m['home_team']} {m['home_score']} – {m['away_score']} {m['away_team']}\n"
+                f"📅 Date: {self.date_en(m)} Tehran time"
+            )
+            farsi_summary.append(
+                f"⚽ {self.team_fa(m['home_team'])} {to_persian_digits(m['home_score'])} – "
+                f"{to_persian_digits(m['away_score'])} {self.team_fa(m['away_team'])}\n"
+                f"📅 تاریخ: {self.date_fa(m)} به وقت تهران"
+            )
+
+        return {
+            "title": f"{competition} matchday results - {self.date_en(finished[0], False)}",
+            "farsi_title": f"نتایج {self.competition_fa(competition)} - {self.date_fa(finished[0], False)}",
+            "summary": "\n\n".join(summary),
+            "farsi_summary": "\n\n".join(farsi_summary),
+        }
+
+    def render_today(self, matches: list) -> dict:
+        """Scheduled matches of one competition -> article dict, None if nothing scheduled."""
+        scheduled = [m for m in matches if m["status"] == "scheduled"]
+        if not scheduled:
+            return None
+
+        self._resolve_names(scheduled)
+
+        scheduled.sort(key=lambda m: m["tehran_dt"])
+        competition = scheduled[0]["competition"]
+        summary, farsi_summary = [], []
+
+        for m in scheduled:
+            summary.append(
+                f"⚽ {m['home_team']} 🆚 {m['away_team']}\n"
+                f"🕒 Kickoff: {self.date_en(m)} Tehran time"
+            )
+            farsi_summary.append(
+                f"⚽ {self.team_fa(m['home_team'])} 🆚 {self.team_fa(m['away_team'])}\n"
+                f"🕒 شروع بازی: {self.date_fa(m)} به وقت تهران"
+            )
+
+        return {
+            "title": f"{competition} today's matches - {self.date_en(scheduled[0], False)}",
+            "farsi_title": f"بازی‌های امروز {self.competition_fa(competition)} - {self.date_fa(scheduled[0], False)}",
+            "summary": "\n\n".join(summary),
+            "farsi_summary": "\n\n".join(farsi_summary),
+        }
+
+    def render_week_titles(self, competition: str, week_start: date) -> dict:
+        """Titles of a competition's preview of the week starting `week_start`."""
+        if competition not in self.competition_names_fa:
+            self._resolve({competition})
+        jalali = jdatetime.date.fromgregorian(date=week_start)
+        jalali_date = f"{jalali.day} {JALALI_MONTHS_FA[jalali.month - 1]} {jalali.year}"
+        return {
+            "title": f"{competition} upcoming week preview - {week_start:%d %b %Y}",
+            "farsi_title": f"پیش‌نمایش هفته آینده {self.competition_fa(competition)} - "
+            f"{to_persian_digits(jalali_date)}",
+        }
+
+    def add_llm_intro(self, article: dict, job: str = None, route: str = None) -> dict:
+        """
+        Prepends a short free-text intro, in both languages, written by the LLM.
+        The match lines themselves are never sent back through the LLM output.
+        If the LLM call fails the article is returned without an intro.
+        """
+        llm_client = GeminiClient(
+            job=job,
+            route=route,
+            system_instruction=[
+                "You will receive a list of football matches for a Telegram post.",
+                "Write one short, engaging intro sentence for the post. Do not list the matches or invent facts.",
+                "Return JSON with `intro` (English) and `farsi_intro` (natural-sounding Farsi).",
+            ],
+            response_schema=types.Schema(
+                type=types.Type.OBJECT,
+                required=["intro", "farsi_intro"],
+                properties={
+                    "intro": types.Schema(type=types.Type.STRING),
+                    "farsi_intro": types.Schema(type=types.Type.STRING),
+                },
+            ),
+        )
+        try:
+            intro = llm_client.generate(f"{article['title']}\n\n{article['summary']}")
+        except Exception as e:
+            self.logger.error(f"LLM intro failed, rendering without it: {e}")
+            return article
+
+        return dict(
+            article,
+            summary=f"{intro['intro']}\n\n{article['summary']}",
+            farsi_summary=f"{intro['farsi_intro']}\n\n{article['farsi_summary']}",
+        )
@@ -0,0 +1,162 @@
+import math
+import threading
+from collections import defaultdict, deque
+from typing import Optional
+
+
+# Prompt size tiers (upper bound in characters, inclusive). Every prompt falls
+# into the first tier whose bound it does not exceed. A tier may name its own
+# hedge `fallback`; otherwise the router-wide one is used.
+DEFAULT_TIERS = [
+    {
+        "name": "small",
+        "max_chars": 4_000,
+        "model": "gemini-2.5-flash-lite",
+        "thinking_budget": 1024,
+        "fallback": {"model": "gemini-2.5-flash", "thinking_budget": 0},
+    },
+    {
+        "name": "medium",
+        "max_chars": 40_000,
+        "model": "gemini-2.5-flash",
+        "thinking_budget": 5000,
+    },
+    {
+        "name": "large",
+        "max_chars": None,
+        "model": "gemini-2.5-pro",
+        "thinking_budget": 8192,
+    },
+]
+
+DEFAULT_FALLBACK = {"model": "gemini-2.5-flash-lite", "thinking_budget": 0}
+
+# Overrides keyed by the `route` name callers pass to GeminiClient. Route
+# names are stable identifiers, unlike the job display names.
+DEFAULT_ROUTE_OVERRIDES = {
+    # Long ISW reports once a day: accuracy matters more than latency
+    "ukraine_summary": {"model": "gemini-2.5-pro", "thinking_budget": 8192},
+    # Only one-line intros and team/competition name translations
+    "football_results": {
+        "model": "gemini-2.5-flash-lite",
+        "thinking_budget": 0,
+    },
+    "football_today": {
+        "model": "gemini-2.5-flash-lite",
+        "thinking_budget": 0,
+    },
+}
+
+
+class LatencyTracker:
+    """
+    Keeps a rolling window of call latencies per route key and answers
+    percentile queries over it.
+    """
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float):
+        with self._lock:
+            self._samples[key].append(seconds)
+
+    def count(self, key: str) -> int:
+        with self._lock:
+            return len(self._samples[key])
+
+    def percentile(self, key: str, q: float) -> Optional[float]:
+        """Nearest-rank percentile, q in (0, 1]. None when there is no history."""
+        with self._lock:
+            samples = sorted(self._samples[key])
+        if not samples:
+            return None
+        rank = max(1, math.ceil(q * len(samples)))
+        return samples[rank - 1]
+
+
+class ModelRouter:
+    """
+    Picks the model and thinking budget for a prompt and decides when a
+    hedged request to the fallback model should be fired.
+
+    Routing is by prompt size tier, optionally overridden per route name.
+    The hedge delay is the `hedge_percentile` latency of the primary route,
+    learned from its own history; until `min_samples` calls have been seen
+    the static `initial_hedge_after` is used instead (None disables hedging).
+    """
+
+    def __init__(
+        self,
+        tiers: list = None,
+        overrides: dict = None,
+        fallback: dict = None,
+        hedge_percentile: float = 0.95,
+        min_samples: int = 10,
+        initial_hedge_after: Optional[float] = 60.0,
+    ):
+        self.tiers = tiers or DEFAULT_TIERS
+        self.overrides = DEFAULT_ROUTE_OVERRIDES if overrides is None else overrides
+        self.fallback = fallback or DEFAULT_FALLBACK
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self.initial_hedge_after = initial_hedge_after
+        self.latency = LatencyTracker()
+
+    def _tier_for(self, prompt: str) -> dict:
+        size = len(prompt)
+        for tier in self.tiers:
+            if tier["max_chars"] is None or size <= tier["max_chars"]:
+                return tier
+        return self.tiers[-1]
+
+    def route(self, prompt: str, name: str = None) -> dict:
+        """
+        Returns a route dict with `key`, `model`, `thinking_budget` and
+        the `fallback` route (None when hedging is not possible).
+        """
+        tier = self._tier_for(prompt)
+        route = {
+            "key": tier["name"],
+            "model": tier["model"],
+            "thinking_budget": tier["thinking_budget"],
+        }
+
+        override = self.overrides.get(name) if name else None
+        if override:
+            route.update(override)
+            route["key"] = f"{name}:{tier['name']}"
+
+        route["key"] = f"{route['model']}:{route['key']}"
+
+        fallback = dict(tier.get("fallback") or self.fallback)
+        if fallback["model"] == route["model"]:
+            fallback = None
+        route["fallback"] = fallback
+        return route
+
+    def hedge_after(self, route: dict) -> Optional[float]:
+        """Seconds to wait on the primary before firing the fallback."""
+        if not route.get("fallback"):
+            return None
+        if self.latency.count(route["key"]) < self.min_samples:
+            return self.initial_hedge_after
+        return self.latency.percentile(route["key"], self.hedge_percentile)
+
+    def record_latency(self, route: dict, seconds: float):
+        self.latency.record(route["key"], seconds)
+
+
+# Global router instance - shared so latency history survives across
+# the per-run GeminiClient instances the jobs create.
+_router_instance: Optional[ModelRouter] = None
+
+
+def get_router() -> ModelRouter:
+    """Get the global model router instance."""
+    global _router_instance
+    if _router_instance is None:
+        _router_instance = ModelRouter()
+    return _router_instance
@@ -1,30 +1,63 @@
 import os
 import re
+import json
 import requests
 import warnings
+from bisect import bisect_left, bisect_right
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup
+from app.utils.telegram_client import get_telegram_client
 
 
-# Get default chat IDs from environment
-english_default_chat_id = os.getenv("ENGLISH_CHANNEL_ID")
-farsi_default_chat_id = os.getenv("FARSI_CHANNEL_ID")
+def default_chat_id(locale="english"):
+    """
+    Returns the default channel of a locale from ENGLISH_CHANNEL_ID or
+    FARSI_CHANNEL_ID. Read on use, so importing this module needs neither.
+    """
+    env = "FARSI_CHANNEL_ID" if locale == "farsi" else "ENGLISH_CHANNEL_ID"
+    chat_id = os.getenv(env)
+    if not chat_id:
+        raise RuntimeError(f"{env} environment variable is not set.")
+    return int(chat_id)
 
-if not english_default_chat_id:
-    raise RuntimeError("ENGLISH_CHANNEL_ID environment variable is not set.")
-if not farsi_default_chat_id:
-    raise RuntimeError("FARSI_CHANNEL_ID environment variable is not set.")
 
 # Telegram message length limit
 TELEGRAM_MAX_LENGTH = 4096
+# Caption limit for photos, and maximum number of items in a sendMediaGroup album
+TELEGRAM_MAX_CAPTION_LENGTH = 1024
+TELEGRAM_MAX_ALBUM_SIZE = 10
+
+
+# MarkdownV2 special characters and their escapes, built once. A chain of
+# str.replace calls measured several times faster than str.translate or a
+# regex for both short titles and long summaries; the backslash goes first.
+MARKDOWN_V2_ESCAPES = tuple((c, f"\\{c}") for c in "\\_*[]()~`>#+-=|{}.!")
+
+# Chunk boundaries by priority: paragraph, line, sentence end, word
+BREAK_PATTERNS = (
+    re.compile(r"\s*\n\s*\n\s*"),
+    re.compile(r"\s*\n\s*"),
+    re.compile(r"(?<=[.!?؟…])\s+"),
+    re.compile(r"\s+"),
+)
+ASTRAL_RE = re.compile("[\U00010000-\U0010ffff]")
 
 
 def escape_markdown_v2(text):
     """
     Escapes special characters for Telegram MarkdownV2 format.
     """
-    special_chars = r"_[]()~`>#+-=|{}.!\\"
-    return re.sub(rf"([{re.escape(special_chars)}])", r"\\\1", text)
+    for char, escaped in MARKDOWN_V2_ESCAPES:
+        if char in text:
+            text = text.replace(char, escaped)
+    return text
+
+
+def telegram_length(text):
+    """
+    Length of text as Telegram counts it, in UTF-16 code units.
+    """
+    return len(text.encode("utf-16-le")) // 2
 
 
 def extract_image_from_url(url):
@@ -54,27 +87,69 @@ def extract_image_from_url(url):
     return None
 
 
-def split_text_intelligently(text):
+def chunk_offsets(text, max_chunk_size):
     """
-    Splits text intelligently by paragraphs, then sentences if needed.
-    Returns list of text chunks.
+    Splits text into (start, end) spans of at most max_chunk_size UTF-16
+    units, without copying it. Each span ends at the last paragraph break
+    that fits, else the last line break, else sentence end, else word
+    boundary; a single word longer than the limit is cut. Never cuts an
+    escape sequence in half, so it works on escaped MarkdownV2 as well.
     """
-    # First try splitting by double newlines (paragraphs)
-    paragraphs = text.split("\n\n")
-
-    if len(paragraphs) > 1:
-        return paragraphs
-
-    # If no double newlines, try single newlines
-    lines = text.split("\n")
-
-    if len(lines) > 1:
-        return lines
-
-    # If no newlines, split by sentences
-    # Use regex to split on sentence endings while preserving the punctuation
-    sentences = re.split(r"(?<=[.!?])\s+", text)
-    return [s.strip() for s in sentences if s.strip()]
+    # UTF-16 offset of a position: one extra unit per astral character before it
+    astral = [m.start() for m in ASTRAL_RE.finditer(text)]
+
+    def units(pos):
+        return pos + bisect_left(astral, pos) if astral else pos
+
+    # Each break level is only scanned the first time a chunk needs it
+    levels = [None] * len(BREAK_PATTERNS)
+
+    def breaks(level):
+        if levels[level] is None:
+            found = [m.span() for m in BREAK_PATTERNS[level].finditer(text)]
+            levels[level] = ([units(s) for s, _ in found], found)
+        return levels[level]
+
+    spans = []
+    start = len(text) - len(text.lstrip())
+    end_of_text = len(text.rstrip())
+
+    while start < end_of_text and units(end_of_text) - units(start) > max_chunk_size:
+        budget = units(start) + max_chunk_size
+
+        # Last break of the highest priority level that fits
+        cut = None
+        for level in range(len(BREAK_PATTERNS)):
+            break_units, break_spans = breaks(level)
+            k = bisect_right(break_units, budget) - 1
+            if k >= 0 and break_spans[k][0] > start:
+                cut = break_spans[k]
+                break
+
+        if cut is not None:
+            spans.append((start, cut[0]))
+            start = cut[1]
+            continue
+
+        # No break fits: cut the word, keeping escape sequences whole
+        end = min(start + max_chunk_size, end_of_text)
+        while units(end) > budget:
+            end -= 1
+        backslashes = 0
+        while end - backslashes - 1 >= start and text[end - backslashes - 1] == "\\":
+            backslashes += 1
+        if backslashes % 2:
+            end -= 1
+        end = max(end, start + 1)
+
+        spans.append((start, end))
+        gap = BREAK_PATTERNS[-1].match(text, end)
+        start = gap.end() if gap else end
+
+    if start < end_of_text:
+        spans.append((start, end_of_text))
+
+    return spans
 
 
 def chunk_summary(summary, max_chunk_size=3000):
@@ -82,78 +157,27 @@ def chunk_summary(summary, max_chunk_size=3000):
     Chunks the summary into smaller pieces that fit within Telegram limits.
     Leaves room for title, source, and formatting.
     """
-    if len(summary) <= max_chunk_size:
-        return [summary]
+    return [summary[start:end] for start, end in chunk_offsets(summary, max_chunk_size)]
 
-    chunks = []
-    text_parts = split_text_intelligently(summary)
 
-    current_chunk = ""
+def format_sources_md2(sources):
+    """
+    Formats source URLs as comma-separated MarkdownV2 links labelled by domain.
+    """
+    # Normalize sources into a list
+    if isinstance(sources, str):
+        sources = [sources]
 
-    for part in text_parts:
-        # Check if adding this part would exceed the limit
-        test_chunk = current_chunk + ("\n\n" if current_chunk else "") + part
+    # Format sources as clickable links
+    formatted_sources = []
+    for url in sources:
+        safe_url = url.replace(")", "%29").replace("(", "%28")
+        domain = urlparse(url).netloc
+        domain_label = domain.replace("www.", "")
+        label = escape_markdown_v2(domain_label)
+        formatted_sources.append(f"[{label}]({safe_url})")
 
-        if len(test_chunk) <= max_chunk_size:
-            current_chunk = test_chunk
-        else:
-            # If current_chunk has content, save it and start new chunk
-            if current_chunk:
-                chunks.append(current_chunk)
-                current_chunk = part
-            else:
-                # Single part is too long, need to split it further
-                # Split by sentences if it's a paragraph, or by words as last resort
-                if len(part) > max_chunk_size:
-                    sub_parts = split_text_intelligently(part)
-                    for sub_part in sub_parts:
-                        if len(sub_part) <= max_chunk_size:
-                            if (
-                                current_chunk
-                                and len(current_chunk + "\n\n" + sub_part)
-                                <= max_chunk_size
-                            ):
-                                current_chunk += "\n\n" + sub_part
-                            else:
-                                if current_chunk:
-                                    chunks.append(current_chunk)
-                                current_chunk = sub_part
-                        else:
-                            # Last resort: split by words
-                            words = sub_part.split()
-                            temp_chunk = ""
-                            for word in words:
-                                test_temp = (
-                                    temp_chunk + (" " if temp_chunk else "") + word
-                                )
-                                if len(test_temp) <= max_chunk_size:
-                                    temp_chunk = test_temp
-                                else:
-                                    if temp_chunk:
-                                        if current_chunk:
-                                            chunks.append(current_chunk)
-                                            current_chunk = ""
-                                        chunks.append(temp_chunk)
-                                    temp_chunk = word
-
-                            if temp_chunk:
-                                if (
-                                    current_chunk
-                                    and len(current_chunk + " " + temp_chunk)
-                                    <= max_chunk_size
-                                ):
-                                    current_chunk += " " + temp_chunk
-                                else:
-                                    if current_chunk:
-                                        chunks.append(current_chunk)
-                                    current_chunk = temp_chunk
-                else:
-                    current_chunk = part
-
-    if current_chunk:
-        chunks.append(current_chunk)
-
-    return chunks
+    return ", ".join(formatted_sources)
 
 
 def format_article_md2(title, summary, sources, tag, locale="english"):
@@ -168,64 +192,47 @@ def format_article_md2(title, summary, sources, tag, locale="english"):
         tag (str): Topic tag
         locale (str): Language locale ('english' or 'farsi')
     """
+    # Everything is escaped once; the summary is chunked after escaping so
+    # the limit holds for what Telegram actually receives
     escaped_title = escape_markdown_v2(title)
+    escaped_summary = escape_markdown_v2(summary)
     escaped_tag = escape_markdown_v2(f"#{tag}")
-
-    # Normalize sources into a list
-    if isinstance(sources, str):
-        sources = [sources]
-
-    # Format sources as clickable links
-    formatted_sources = []
-    for url in sources:
-        safe_url = url.replace(")", "%29").replace("(", "%28")
-        domain = urlparse(url).netloc
-        domain_label = domain.replace("www.", "")
-        label = escape_markdown_v2(domain_label)
-        formatted_sources.append(f"[{label}]({safe_url})")
-
-    sources_text = ", ".join(formatted_sources)
+    sources_text = format_sources_md2(sources)
 
     # Prepare source section based on locale
     if locale == "farsi":
         source_section = f"*منبع:* {sources_text}\n\n{escaped_tag}"
         summary_label = "*خلاصه:*"
+        part_word = "بخش"
     else:
         source_section = f"*Source:* {sources_text}\n\n{escaped_tag}"
         summary_label = "*Summary:*"
+        part_word = "Part"
 
-    # Calculate available space for summary
+    # Single message if everything fits
     title_section = f"*{escaped_title}*\n\n"
-    base_message_size = (
-        len(title_section) + len(source_section) + len(f"{summary_label} ") + 50
-    )  # buffer
-    max_summary_size = TELEGRAM_MAX_LENGTH - base_message_size
-
-    # Check if we need to split
-    if len(summary) <= max_summary_size:
-        # Single message
-        escaped_summary = escape_markdown_v2(summary)
-        message = (
-            f"{title_section}{summary_label} {escaped_summary}\n\n{source_section}"
-        )
+    message = f"{title_section}{summary_label} {escaped_summary}\n\n{source_section}"
+    if telegram_length(message) <= TELEGRAM_MAX_LENGTH:
         return [message]
 
+    # Calculate available space for summary, leaving room for the part number
+    base_message_size = telegram_length(
+        f"*{escaped_title}{escape_markdown_v2(f' ({part_word} 999)')}*\n\n"
+        f"{summary_label} \n\n{source_section}"
+    )
+    max_summary_size = TELEGRAM_MAX_LENGTH - base_message_size
+
     # Multiple messages needed
-    summary_chunks = chunk_summary(summary, max_summary_size)
+    spans = chunk_offsets(escaped_summary, max_summary_size)
     messages = []
 
-    for i, chunk in enumerate(summary_chunks, 1):
-        escaped_chunk = escape_markdown_v2(chunk)
-
+    for i, (start, end) in enumerate(spans, 1):
         # Add part number to title for multi-part messages
-        if len(summary_chunks) > 1:
-            part_word = "بخش" if locale == "farsi" else "Part"
-            part_title = f"{title} ({part_word} {i})"
-        else:
-            part_title = title
-        title_section = f"*{escape_markdown_v2(part_title)}*\n\n"
+        part_suffix = escape_markdown_v2(f" ({part_word} {i})")
+        title_section = f"*{escaped_title}{part_suffix}*\n\n"
+        escaped_chunk = escaped_summary[start:end]
 
-        if i == len(summary_chunks):
+        if i == len(spans):
             # Last message includes sources
             message = (
                 f"{title_section}{summary_label} {escaped_chunk}\n\n{source_section}"
@@ -239,16 +246,128 @@ def format_article_md2(title, summary, sources, tag, locale="english"):
     return messages
 
 
-def send_to_telegram(headline, topic, locale="english", chat_id=None):
+def localized_fields(headline, locale="english"):
     """
-    Sends formatted article(s) to a Telegram chat.
-    Handles message splitting automatically.
+    Returns (title, summary, locale) of a headline in the given locale.
+    Falls back to the English fields when the Farsi ones are missing.
+    """
+    if locale == "farsi":
+        title = headline.get("farsi_title", headline.get("title", ""))
+        summary = headline.get("farsi_summary", headline.get("summary", ""))
+        if title and summary:
+            return title, summary, locale
+        warnings.warn("Farsi fields not found in headline. Falling back to English.")
 
-    Args:
-        headline (dict): Article dictionary with title, summary, sources, and optional Farsi fields
-        topic (str): Topic tag for the article
-        locale (str): Language locale ('english' or 'farsi'), defaults to 'english'
-        chat_id (int, optional): Telegram chat ID. If not provided, uses default based on locale
+    return headline.get("title", ""), headline.get("summary", ""), "english"
+
+
+def format_digest_entry_md2(title, summary, sources, locale="english"):
+    """
+    Formats one headline as a compact digest entry: bold title, summary
+    and source links, without the topic tag.
+    """
+    source_label = "*منبع:*" if locale == "farsi" else "*Source:*"
+    return (
+        f"*{escape_markdown_v2(title)}*\n{escape_markdown_v2(summary)}\n"
+        f"{source_label} {format_sources_md2(sources)}"
+    )
+
+
+def pack_digest_md2(entries, tag, max_length=TELEGRAM_MAX_LENGTH):
+    """
+    Packs digest entries into as few messages as possible, each ending with
+    the topic tag and no longer than `max_length`. An entry that does not
+    fit a message on its own is sent alone.
+    """
+    footer = f"\n\n{escape_markdown_v2(f'#{tag}')}"
+    messages = []
+    current = []
+    current_length = 0
+
+    for entry in entries:
+        added = telegram_length(entry) + (2 if current else 0)
+        if current and current_length + added + telegram_length(footer) > max_length:
+            messages.append("\n\n".join(current) + footer)
+            current = []
+            current_length = 0
+            added = telegram_length(entry)
+        current.append(entry)
+        current_length += added
+
+    if current:
+        messages.append("\n\n".join(current) + footer)
+
+    return messages
+
+
+def build_digest_requests(
+    headlines, topic, locale="english", chat_id=None, image_urls=None
+):
+    """
+    Builds the Bot API requests that send several short headlines together.
+    When every headline has an image and its caption fits, they go out as a
+    single sendMediaGroup album; otherwise as packed sendMessage digests.
+    Returns (chat_id, requests) like build_telegram_requests.
+    """
+    if locale not in ["english", "farsi"]:
+        warnings.warn(f"Unsupported locale '{locale}'. Using default 'english'.")
+        locale = "english"
+
+    if chat_id is None:
+        chat_id = default_chat_id(locale)
+
+    entries = []
+    for headline in headlines:
+        title, summary, text_locale = localized_fields(headline, locale)
+        entries.append(
+            format_digest_entry_md2(
+                title, summary, headline.get("sources", []), text_locale
+            )
+        )
+
+    image_urls = image_urls or [None] * len(headlines)
+    tag = escape_markdown_v2(f"#{topic}")
+    captions = [f"{entry}\n\n{tag}" for entry in entries]
+    if (
+        2 <= len(headlines) <= TELEGRAM_MAX_ALBUM_SIZE
+        and all(image_urls)
+        and all(telegram_length(c) <= TELEGRAM_MAX_CAPTION_LENGTH for c in captions)
+    ):
+        media = [
+            {
+                "type": "photo",
+                "media": image_url,
+                "caption": caption,
+                "parse_mode": "MarkdownV2",
+            }
+            for image_url, caption in zip(image_urls, captions)
+        ]
+        return chat_id, [
+            {
+                "method": "sendMediaGroup",
+                "payload": {"media": json.dumps(media, ensure_ascii=False)},
+            }
+        ]
+
+    return chat_id, [
+        {
+            "method": "sendMessage",
+            "payload": {
+                "text": message,
+                "parse_mode": "MarkdownV2",
+                "disable_web_page_preview": True,
+            },
+        }
+        for message in pack_digest_md2(entries, topic)
+    ]
+
+
+def build_telegram_requests(
+    headline, topic, locale="english", chat_id=None, image_url=None
+):
+    """
+    Builds the Bot API requests for one headline in one locale.
+    Returns (chat_id, requests) where requests is a list of {"method", "payload"}.
     """
     # Validate and normalize locale
     supported_locales = ["english", "farsi"]
@@ -257,69 +376,103 @@ def send_to_telegram(headline, topic, locale="english", chat_id=None):
         locale = "english"
 
     # Set default chat_id based on locale if not provided
-    if chat_id is None:
-        chat_id = (
-            farsi_default_chat_id if locale == "farsi" else english_default_chat_id
-        )
-        chat_id = int(chat_id)
-
-    # Extract fields based on locale
-    if locale == "farsi":
-        title = headline.get("farsi_title", headline.get("title", ""))
-        summary = headline.get("farsi_summary", headline.get("summary", ""))
-        if not title or not summary:
-            warnings.warn(
-                "Farsi fields not found in headline. Falling back to English."
-            )
-            title = headline.get("title", "")
-            summary = headline.get("summary", "")
-            locale = "english"
-            chat_id = int(english_default_chat_id)
-    else:
-        title = headline.get("title", "")
-        summary = headline.get("summary", "")
+    routed_by_locale = chat_id is None
+    if routed_by_locale:
+        chat_id = default_chat_id(locale)
+
+    title, summary, text_locale = localized_fields(headline, locale)
+    if text_locale != locale:
+        locale = text_locale
+        # Untranslated headlines move to the English channel, unless the
+        # chat was chosen explicitly (e.g. a subscribed Farsi group)
+        if routed_by_locale:
+            chat_id = default_chat_id("english")
 
     sources = headline.get("sources", [])
 
-    bot_token = os.environ.get("TELEGRAM_TOKEN")
-    if not bot_token:
-        raise RuntimeError("TELEGRAM_TOKEN environment variable is not set.")
-
     # Get formatted messages (could be multiple)
     messages = format_article_md2(title, summary, sources, tag=topic, locale=locale)
 
+    requests_to_send = []
+    for i, message in enumerate(messages):
+        if i == 0 and image_url:
+            # Send first message with image
+            requests_to_send.append(
+                {
+                    "method": "sendPhoto",
+                    "payload": {
+                        "caption": message,
+                        "parse_mode": "MarkdownV2",
+                        "photo": image_url,
+                        "disable_web_page_preview": True,
+                    },
+                }
+            )
+        else:
+            # Send text message
+            requests_to_send.append(
+                {
+                    "method": "sendMessage",
+                    "payload": {
+                        "text": message,
+                        "parse_mode": "MarkdownV2",
+                        "disable_web_page_preview": True,
+                    },
+                }
+            )
+
+    return chat_id, requests_to_send
+
+
+def headline_image(headline):
+    """Returns the preview image of the headline's first source, if any."""
+    sources = headline.get("sources", [])
+
     # Normalize sources to list format for image extraction
     if isinstance(sources, str):
         sources = [sources]
 
-    image_url = None
-    if sources:
-        image_url = extract_image_from_url(sources[0])
+    if sources and sources[0]:
+        return extract_image_from_url(sources[0])
+    return None
 
-    url = f"https://api.telegram.org/bot{bot_token}"
-    responses = []
 
-    for i, message in enumerate(messages):
-        if i == 0 and image_url:
-            # Send first message with image
-            payload = {
-                "chat_id": chat_id,
-                "caption": message,
-                "parse_mode": "MarkdownV2",
-                "photo": image_url,
-                "disable_web_page_preview": True,
-            }
-            response = requests.post(f"{url}/sendPhoto", data=payload)
-        else:
-            # Send text message
-            payload = {
-                "chat_id": chat_id,
-                "text": message,
-                "parse_mode": "MarkdownV2",
-                "disable_web_page_preview": True,
-            }
-            response = requests.post(f"{url}/sendMessage", data=payload)
+def send_to_telegram(headline, topic, locale="english", chat_id=None):
+    """
+    Sends formatted article(s) to a Telegram chat.
+    Handles message splitting automatically.
 
-        responses.append(response)
+    Args:
+        headline (dict): Article dictionary with title, summary, sources, and optional Farsi fields
+        topic (str): Topic tag for the article
+        locale (str): Language locale ('english' or 'farsi'), defaults to 'english'
+        chat_id (int, optional): Telegram chat ID. If not provided, uses default based on locale
+    """
+    chat_id, requests_to_send = build_telegram_requests(
+        headline, topic, locale, chat_id, image_url=headline_image(headline)
+    )
 
-    return responses  # Returns list of responses for all sent messages
+    client = get_telegram_client()
+    # Returns list of Bot API results for all sent messages
+    return client.run(client.send_sequence(chat_id, requests_to_send))
+
+
+def send_headline_to_telegram(headline, topic, locales=("english", "farsi")):
+    """
+    Sends a headline to the default chat of every locale concurrently.
+    Order is kept within each chat. Raises the first failure after all
+    locales have been attempted.
+    """
+    image_url = headline_image(headline)
+    batches = [
+        build_telegram_requests(headline, topic, locale, image_url=image_url)
+        for locale in locales
+    ]
+
+    client = get_telegram_client()
+    results = client.run(client.send_batches(batches))
+
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+    return results
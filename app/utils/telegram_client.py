@@ -0,0 +1,371 @@
+import os
+import json
+import asyncio
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Optional
+
+import aiohttp
+from cachetools import LRUCache
+
+from app.utils.logger import setup_logger
+from app.metrics.telegram import get_telegram_metrics
+
+# Bot API endpoint, overridable for offline runs against app/devtools/gemini_stub.py
+TELEGRAM_API_URL = os.getenv("TELEGRAM_API_URL", "https://api.telegram.org")
+
+
+class TelegramAPIError(RuntimeError):
+    """A Bot API request that Telegram answered with a non-retryable error."""
+
+    def __init__(self, method: str, status: int, description: str):
+        super().__init__(f"Telegram {method} failed ({status}): {description}")
+        self.status = status
+        self.description = description
+
+
+class PartialSendError(RuntimeError):
+    """A send_sequence that failed after its first `sent` requests went out."""
+
+    def __init__(self, sent: int, error: Exception):
+        super().__init__(f"{error} (after {sent} message(s) were sent)")
+        self.sent = sent
+        self.error = error
+
+
+class ChatRateScheduler:
+    """
+    Paces Bot API sends to Telegram's documented limits: about one message
+    per second in a single chat, at most 20 messages per minute in a group
+    or channel (negative chat ids), and about 30 messages per second overall.
+
+    Each send reserves the next free slot for its chat up front, so bursts
+    from several jobs are spread out instead of being answered with 429s.
+    An album counts as one message per item, as Telegram counts it.
+    Not thread-safe; it is only used from the client's event loop.
+    """
+
+    def __init__(
+        self,
+        per_chat_interval: float = 1.0,
+        group_per_minute: int = 20,
+        global_per_second: int = 30,
+    ):
+        self.per_chat_interval = per_chat_interval
+        self.group_per_minute = group_per_minute
+        self.global_interval = 1.0 / global_per_second
+        self._chat_slots = defaultdict(deque)
+        self._global_next = 0.0
+
+    def reserve(self, chat_id, now: float, count: int = 1) -> float:
+        """
+        Reserves the chat's next `count` send slots (one per album item).
+        Returns the delay until the first one.
+        """
+        slots = self._chat_slots[str(chat_id)]
+        while slots and slots[0] <= now - 60:
+            slots.popleft()
+
+        slot = now
+        if slots:
+            slot = max(slot, slots[-1] + self.per_chat_interval)
+        if str(chat_id).startswith("-"):
+            # All `count` messages must fit in the last minute's budget
+            window = max(1, self.group_per_minute - count + 1)
+            if len(slots) >= window:
+                slot = max(slot, slots[-window] + 60)
+
+        # Later messages queue behind the whole album
+        slots.extend(slot + i * self.per_chat_interval for i in range(count))
+        return slot - now
+
+    async def acquire(self, chat_id, count: int = 1) -> float:
+        """Waits until `count` messages may be sent to `chat_id`. Returns the seconds waited."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        delay = self.reserve(chat_id, start, count)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        # Global spacing is applied at send time, so a chat that is waiting
+        # on its own slot does not hold up the others
+        now = loop.time()
+        slot = max(now, self._global_next)
+        self._global_next = slot + self.global_interval * count
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+        return loop.time() - start
+
+
+class TelegramClient:
+    """
+    Async Telegram Bot API client with one shared keep-alive session.
+
+    The session lives on a dedicated event loop thread so that the
+    synchronous jobs (running in worker threads) and async callers share
+    the same connection pool. Sends to different chats run concurrently;
+    messages to the same chat are sent in order, one at a time, paced by
+    a ChatRateScheduler.
+
+    429 responses are retried after Telegram's `retry_after`; network
+    errors and 5xx responses are retried with exponential backoff.
+
+    The file_id Telegram returns for a photo sent by URL is cached by that
+    URL, so the second locale (and any retry) reuses the uploaded photo
+    instead of making Telegram fetch the remote image again.
+    """
+
+    def __init__(
+        self,
+        bot_token: str = None,
+        api_url: str = None,
+        timeout: float = 20.0,
+        max_retries: int = 5,
+        connection_limit: int = 20,
+        scheduler: ChatRateScheduler = None,
+        file_id_cache_size: int = 1024,
+    ):
+        self.bot_token = bot_token or os.environ.get("TELEGRAM_TOKEN")
+        if not self.bot_token:
+            raise RuntimeError("TELEGRAM_TOKEN environment variable is not set.")
+
+        self.base_url = f"{api_url or TELEGRAM_API_URL}/bot{self.bot_token}"
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.connection_limit = connection_limit
+        self.logger = setup_logger(self.__class__.__name__)
+        self.metrics = get_telegram_metrics()
+        self.scheduler = scheduler or ChatRateScheduler()
+        self.file_ids = LRUCache(maxsize=file_id_cache_size)
+        self._photo_locks = {}
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._chat_locks = defaultdict(asyncio.Lock)
+        self._start_lock = threading.Lock()
+
+    # ---------------- event loop plumbing ----------------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="telegram-client", daemon=True
+                )
+                thread.start()
+                self._loop = loop
+        return self._loop
+
+    def run(self, coro):
+        """Runs a coroutine on the client loop and blocks for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.connection_limit, keepalive_timeout=60
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def _close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    def close(self):
+        if self._loop is not None:
+            self.run(self._close())
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+
+    # ---------------- API calls ----------------
+
+    async def call(self, method: str, payload: dict) -> dict:
+        """
+        Calls a Bot API method, retrying throttling and transient errors.
+        Returns the `result` object; raises RuntimeError once retries are exhausted
+        or on a non-retryable error.
+        """
+        chat_id = payload.get("chat_id")
+        # Form fields must be strings for aiohttp
+        form = {
+            key: (str(value).lower() if isinstance(value, bool) else str(value))
+            for key, value in payload.items()
+            if value is not None
+        }
+        # Every item of an album counts toward the rate limits
+        messages = (
+            len(json.loads(payload["media"])) if method == "sendMediaGroup" else 1
+        )
+        session = await self._get_session()
+        start = time.monotonic()
+        backoff = 1.0
+
+        try:
+            for attempt in range(self.max_retries + 1):
+                waited = await self.scheduler.acquire(chat_id, messages)
+                if waited > 0:
+                    self.metrics.paced(chat_id, waited)
+                try:
+                    async with session.post(
+                        f"{self.base_url}/{method}", data=form
+                    ) as response:
+                        body = await response.json(content_type=None)
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                    self.metrics.request_finished(chat_id, method, "error")
+                    if attempt == self.max_retries:
+                        raise RuntimeError(f"Telegram {method} failed: {e}") from e
+                    self.logger.warning(
+                        f"Telegram {method} to {chat_id} failed ({e}), retrying in {backoff}s"
+                    )
+                    await asyncio.sleep(backoff)
+                    backoff *= 2
+                    continue
+
+                if response.status == 200 and body.get("ok"):
+                    self.metrics.request_finished(chat_id, method, "success")
+                    return body.get("result")
+
+                if response.status == 429:
+                    retry_after = float(
+                        (body.get("parameters") or {}).get("retry_after", backoff)
+                    )
+                    self.metrics.request_finished(chat_id, method, "throttled")
+                    self.metrics.throttled(chat_id, retry_after)
+                    if attempt == self.max_retries:
+                        break
+                    self.logger.warning(
+                        f"Telegram throttled {chat_id}, retrying after {retry_after}s"
+                    )
+                    await asyncio.sleep(retry_after)
+                    continue
+
+                self.metrics.request_finished(chat_id, method, "error")
+                if response.status >= 500 and attempt < self.max_retries:
+                    await asyncio.sleep(backoff)
+                    backoff *= 2
+                    continue
+
+                raise TelegramAPIError(method, response.status, body.get("description"))
+
+            raise RuntimeError(
+                f"Telegram {method} to {chat_id} still throttled after {self.max_retries} retries"
+            )
+        finally:
+            self.metrics.send_finished(chat_id, method, time.monotonic() - start)
+
+    async def send(self, method: str, payload: dict):
+        """Like `call`, but reuses cached file_ids for photos sent by URL."""
+        if method == "sendPhoto":
+            return await self._send_photo(payload)
+        if method == "sendMediaGroup":
+            return await self._send_media_group(payload)
+        return await self.call(method, payload)
+
+    def _remember_file_id(self, url, message):
+        photo = (message or {}).get("photo") if isinstance(message, dict) else None
+        if url and photo:
+            # Any size's file_id resends the photo; the last one is the largest
+            self.file_ids[url] = photo[-1]["file_id"]
+
+    async def _send_photo(self, payload: dict):
+        url = payload.get("photo")
+        if url not in self.file_ids:
+            # One upload per URL: concurrent sends of the same image wait
+            # for the first one and then reuse its file_id
+            lock = self._photo_locks.setdefault(url, asyncio.Lock())
+            async with lock:
+                if url not in self.file_ids:
+                    self.metrics.file_id_lookup("miss")
+                    try:
+                        result = await self.call("sendPhoto", payload)
+                    finally:
+                        self._photo_locks.pop(url, None)
+                    self._remember_file_id(url, result)
+                    return result
+
+        self.metrics.file_id_lookup("hit")
+        try:
+            return await self.call("sendPhoto", dict(payload, photo=self.file_ids[url]))
+        except TelegramAPIError as e:
+            if e.status != 400:
+                raise
+            # The file_id was rejected; forget it and send the URL again
+            self.file_ids.pop(url, None)
+            result = await self.call("sendPhoto", payload)
+            self._remember_file_id(url, result)
+            return result
+
+    async def _send_media_group(self, payload: dict):
+        media = json.loads(payload["media"])
+        urls = [item.get("media") for item in media]
+        cached = [url in self.file_ids for url in urls]
+        for item, url, hit in zip(media, urls, cached):
+            self.metrics.file_id_lookup("hit" if hit else "miss")
+            if hit:
+                item["media"] = self.file_ids[url]
+
+        try:
+            result = await self.call(
+                "sendMediaGroup",
+                dict(payload, media=json.dumps(media, ensure_ascii=False)),
+            )
+        except TelegramAPIError as e:
+            if e.status != 400 or not any(cached):
+                raise
+            for url in urls:
+                self.file_ids.pop(url, None)
+            result = await self.call("sendMediaGroup", payload)
+            cached = [False] * len(urls)
+
+        for url, hit, message in zip(urls, cached, result or []):
+            if not hit:
+                self._remember_file_id(url, message)
+        return result
+
+    async def send_sequence(self, chat_id, requests: list) -> list:
+        """
+        Sends `requests` ({"method": ..., "payload": ...}) to one chat in order.
+        Holds the chat's lock so concurrent senders cannot interleave messages.
+        A failure after some requests went out raises PartialSendError.
+        """
+        results = []
+        async with self._chat_locks[str(chat_id)]:
+            for request in requests:
+                payload = dict(request["payload"], chat_id=chat_id)
+                try:
+                    results.append(await self.send(request["method"], payload))
+                except Exception as e:
+                    if results:
+                        raise PartialSendError(len(results), e) from e
+                    raise
+        return results
+
+    async def send_batches(self, batches: list) -> list:
+        """
+        Sends several (chat_id, requests) batches concurrently.
+        Returns one result list per batch, or the exception it raised.
+        """
+        return await asyncio.gather(
+            *(self.send_sequence(chat_id, requests) for chat_id, requests in batches),
+            return_exceptions=True,
+        )
+
+
+# Global client instance - shared so every job reuses the same connections
+_client_instance: Optional[TelegramClient] = None
+_client_lock = threading.Lock()
+
+
+def get_telegram_client() -> TelegramClient:
+    """Get the global Telegram client instance."""
+    global _client_instance
+    with _client_lock:
+        if _client_instance is None:
+            _client_instance = TelegramClient()
+    return _client_instance
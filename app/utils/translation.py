@@ -0,0 +1,53 @@
+import json
+from google.genai import types
+from app.utils.ai import GeminiClient
+
+
+class GeminiSegmentTranslator:
+    """
+    Translates short English segments (names, headers, titles) to Farsi
+    in a single Gemini call. Used as the `translator` of
+    TranslationMemoryService.translate for segments not in memory yet.
+    """
+
+    def __init__(self, job: str = None, route: str = None):
+        self.llm_client = GeminiClient(
+            job=job,
+            route=route,
+            system_instruction=[
+                "You will receive a JSON array of short English segments: football team names, competition names, section headers or titles.",
+                "Translate each segment to Farsi (Persian) the way Persian sports and news media write it.",
+                "Return JSON with `translations`: an array of objects with `source` (the exact input segment) and `farsi`.",
+                "Do not skip, merge or reorder segments.",
+            ],
+            response_schema=types.Schema(
+                type=types.Type.OBJECT,
+                required=["translations"],
+                properties={
+                    "translations": types.Schema(
+                        type=types.Type.ARRAY,
+                        items=types.Schema(
+                            type=types.Type.OBJECT,
+                            required=["source", "farsi"],
+                            properties={
+                                "source": types.Schema(type=types.Type.STRING),
+                                "farsi": types.Schema(type=types.Type.STRING),
+                            },
+                        ),
+                    )
+                },
+            ),
+        )
+
+    def __call__(self, segments: list) -> dict:
+        if not segments:
+            return {}
+        translations = self.llm_client.generate(
+            json.dumps(list(segments), ensure_ascii=False)
+        )["translations"]
+        wanted = set(segments)
+        return {
+            item["source"]: item["farsi"]
+            for item in translations
+            if item.get("source") in wanted and item.get("farsi")
+        }
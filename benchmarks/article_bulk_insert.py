@@ -0,0 +1,103 @@
+"""
+Benchmarks a 50k-article backfill: create_article once per row against
+ArticleService.create_articles_bulk.
+
+    DATABASE_URL=postgresql://... python -m benchmarks.article_bulk_insert --rows 50000
+    DATABASE_URL=sqlite:///bench.db python -m benchmarks.article_bulk_insert --rows 50000
+
+The row-by-row path is timed on --sample rows and extrapolated. Rows are
+inserted into the articles table under a unique title prefix and deleted
+afterwards.
+"""
+
+import argparse
+import time
+import uuid
+
+from app.db.backend import create_article_service, is_sqlite
+
+
+def make_articles(prefix: str, count: int) -> list:
+    return [
+        {
+            "title": f"{prefix} headline {i}",
+            "summary": "Lorem ipsum dolor sit amet. " * 20,
+            "source": f"https://example.com/{i % 50}",
+            "farsi_title": f"تیتر {i}",
+            "farsi_summary": "متن نمونه برای خلاصه خبر. " * 20,
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--sample", type=int, default=2_000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    article_service = create_article_service()
+    prefix = f"bench-{uuid.uuid4().hex[:8]}"
+
+    try:
+        articles = make_articles(f"{prefix}-single", args.sample)
+        start = time.perf_counter()
+        for article in articles:
+            article_service.create_article(
+                article["title"],
+                article["summary"],
+                article["source"],
+                farsi_title=article["farsi_title"],
+                farsi_summary=article["farsi_summary"],
+            )
+        single_s = (time.perf_counter() - start) / args.sample * args.rows
+
+        articles = make_articles(f"{prefix}-bulk", args.rows)
+        start = time.perf_counter()
+        results = article_service.create_articles_bulk(
+            articles, page_size=args.page_size
+        )
+        bulk_s = time.perf_counter() - start
+        inserted = sum(result["inserted"] for result in results)
+
+        # Re-running the same batch only reports skips
+        start = time.perf_counter()
+        article_service.create_articles_bulk(articles, page_size=args.page_size)
+        rerun_s = time.perf_counter() - start
+
+        print(f"{'path':<28} {'seconds':>10} {'rows/s':>10}")
+        print(
+            f"{'create_article (extrap.)':<28} {single_s:>10.1f} {args.rows / single_s:>10,.0f}"
+        )
+        print(
+            f"{'create_articles_bulk':<28} {bulk_s:>10.1f} {args.rows / bulk_s:>10,.0f}"
+        )
+        print(
+            f"{'bulk re-run (all skipped)':<28} {rerun_s:>10.1f} {args.rows / rerun_s:>10,.0f}"
+        )
+        print(f"\n{inserted:,} inserted, speedup {single_s / bulk_s:.1f}x")
+    finally:
+        with article_service.db_service.connection() as conn:
+            cur = conn.cursor()
+            if is_sqlite():
+                cur.execute(
+                    "DELETE FROM articles WHERE title LIKE ?;", (f"{prefix}-%",)
+                )
+            else:
+                cur.execute(
+                    """
+                    WITH deleted AS (
+                        DELETE FROM articles WHERE title LIKE %s RETURNING title_hash
+                    )
+                    DELETE FROM article_keys
+                    WHERE title_hash IN (SELECT title_hash FROM deleted);
+                """,
+                    (f"{prefix}-%",),
+                )
+            conn.commit()
+            cur.close()
+
+
+if __name__ == "__main__":
+    main()
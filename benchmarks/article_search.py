@@ -0,0 +1,137 @@
+"""
+Benchmarks /rss?search= on a synthetic articles table: the previous
+four-column ILIKE scan against the tsvector/GIN search in
+app.db.queries.list_articles_query.
+
+    DATABASE_URL=postgresql://... python -m benchmarks.article_search --rows 1000000
+
+The table (articles_search_bench, a copy of the articles schema with its
+generated columns and indexes) is filled once and kept for later runs;
+pass --drop to remove it afterwards.
+"""
+
+import argparse
+import statistics
+import time
+
+from app.db import queries
+from app.db.base_service import BaseDatabaseService
+
+TABLE = "articles_search_bench"
+
+WORDS_EN = (
+    "russian ukrainian forces offensive drone strike kyiv pokrovsk front "
+    "election market inflation oil sanctions ceasefire missile talks league "
+    "goal transfer injury coach storm climate court minister parliament"
+).split()
+WORDS_FA = (
+    "نیروهای روسیه اوکراین حمله پهپاد کی‌یف جبهه انتخابات بازار تورم نفت "
+    "تحریم آتش‌بس موشک مذاکره لیگ گل انتقال مصدومیت مربی طوفان دادگاه وزیر مجلس"
+).split()
+
+# Rare, common and multi-word terms, in both languages
+TERMS = ["pokrovsk", "drone strike", "ceasefire", "storm", "پهپاد", "آتش‌بس"]
+
+ILIKE_QUERY = f"""
+    SELECT id, title, summary, source, sent_to_telegram, created_at, farsi_title, farsi_summary
+    FROM {TABLE}
+    WHERE (title ILIKE %s OR summary ILIKE %s OR farsi_title ILIKE %s OR farsi_summary ILIKE %s)
+    ORDER BY created_at DESC LIMIT %s
+"""
+
+
+def fill(cur, rows: int, batch: int = 100_000):
+    cur.execute(f"CREATE TABLE IF NOT EXISTS {TABLE} (LIKE articles INCLUDING ALL);")
+    cur.execute(f"SELECT count(*) FROM {TABLE};")
+    existing = cur.fetchone()[0]
+
+    for start in range(existing, rows, batch):
+        count = min(batch, rows - start)
+        t = time.monotonic()
+        # The subqueries reference g so Postgres draws new words per row
+        cur.execute(
+            f"""
+            INSERT INTO {TABLE} (title, summary, source, farsi_title, farsi_summary, created_at)
+            SELECT
+                'Headline ' || g || ' ' || (
+                    SELECT string_agg((%(en)s::text[])[1 + floor(random() * %(en_n)s)::int], ' ')
+                    FROM generate_series(1, 6 + g %% 2)),
+                (SELECT string_agg((%(en)s::text[])[1 + floor(random() * %(en_n)s)::int], ' ')
+                    FROM generate_series(1, 60 + g %% 2)),
+                'https://example.com/' || (g %% 50),
+                (SELECT string_agg((%(fa)s::text[])[1 + floor(random() * %(fa_n)s)::int], ' ')
+                    FROM generate_series(1, 6 + g %% 2)),
+                (SELECT string_agg((%(fa)s::text[])[1 + floor(random() * %(fa_n)s)::int], ' ')
+                    FROM generate_series(1, 60 + g %% 2)),
+                now() - g * interval '1 minute'
+            FROM generate_series(%(first)s, %(last)s) AS g;
+        """,
+            {
+                "en": WORDS_EN,
+                "en_n": len(WORDS_EN),
+                "fa": WORDS_FA,
+                "fa_n": len(WORDS_FA),
+                "first": start + 1,
+                "last": start + count,
+            },
+        )
+        cur.connection.commit()
+        print(f"  inserted {start + count:,}/{rows:,} ({time.monotonic() - t:.1f}s)")
+
+    cur.execute(f"ANALYZE {TABLE};")
+    cur.connection.commit()
+
+
+def timed(cur, query: str, params, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cur.execute(query, params)
+        rows = cur.fetchall()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--drop", action="store_true")
+    args = parser.parse_args()
+
+    db_service = (
+        BaseDatabaseService()
+    )  # migrates the articles schema the copy is based on
+
+    with db_service.connection() as conn:
+        cur = conn.cursor()
+        print(f"Preparing {TABLE} with {args.rows:,} rows...")
+        fill(cur, args.rows)
+
+        print(
+            f"\n{'term':<14} {'ilike ms':>10} {'fts ms':>10} {'speedup':>8} {'rows':>5}"
+        )
+        for term in TERMS:
+            like = f"%{term}%"
+            ilike_s, _ = timed(
+                cur, ILIKE_QUERY, (like, like, like, like, args.limit), args.repeat
+            )
+
+            query, params = queries.list_articles_query(search=term, limit=args.limit)
+            query = query.replace("FROM articles", f"FROM {TABLE}")
+            fts_s, found = timed(cur, query, params, args.repeat)
+
+            print(
+                f"{term:<14} {ilike_s * 1000:>10.1f} {fts_s * 1000:>10.1f} "
+                f"{ilike_s / fts_s:>7.1f}x {found:>5}"
+            )
+
+        if args.drop:
+            cur.execute(f"DROP TABLE {TABLE};")
+            conn.commit()
+        cur.close()
+
+
+if __name__ == "__main__":
+    main()
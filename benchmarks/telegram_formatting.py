@@ -0,0 +1,104 @@
+"""
+Benchmarks the Telegram formatting path (escaping, chunking and
+format_article_md2) on English and Farsi summaries from 1KB to 1MB.
+
+    python -m benchmarks.telegram_formatting [--repeat 5]
+
+Every formatted message is also checked against TELEGRAM_MAX_LENGTH.
+"""
+
+import argparse
+import random
+import time
+
+from app.utils.telegram import (
+    TELEGRAM_MAX_LENGTH,
+    chunk_summary,
+    escape_markdown_v2,
+    format_article_md2,
+    telegram_length,
+)
+
+WORDS = {
+    "english": (
+        "Russian forces conducted offensive operations near Pokrovsk (Donetsk Oblast) "
+        "on October 18. Ukrainian officials reported 1,200 strikes - including "
+        "drone attacks! ISW assesses the #front is stable; see https://isw.pub/x_y."
+    ).split(),
+    "farsi": (
+        "نیروهای روسیه در نزدیکی پوکروفسک (استان دونتسک) عملیات تهاجمی انجام دادند. "
+        "مقامات اوکراینی ۱۲۰۰ حمله را گزارش کردند - از جمله حملات پهپادی! "
+        "آیا خط مقدم پایدار است؟ 🇺🇦 ارزیابی موسسه مطالعات جنگ."
+    ).split(),
+}
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+def make_summary(locale: str, size: int, rng: random.Random) -> str:
+    """Builds ISW-style text of about `size` characters with paragraphs."""
+    words = WORDS[locale]
+    parts = []
+    length = 0
+    while length < size:
+        word = rng.choice(words)
+        separator = rng.choices([" ", "\n", "\n\n"], weights=[60, 1, 2])[0]
+        parts.append(word + separator)
+        length += len(word) + len(separator)
+    return "".join(parts)[:size]
+
+
+def best_of(repeat: int, fn, *args) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(
+        f"{'locale':<8} {'size':>9} {'escape ms':>10} {'chunk ms':>10} "
+        f"{'format ms':>10} {'messages':>9}"
+    )
+    for locale in WORDS:
+        for size in SIZES:
+            summary = make_summary(locale, size, rng)
+            title = "Russian Offensive Campaign Assessment, October 18 (Part 1)"
+
+            escape_s = best_of(args.repeat, escape_markdown_v2, summary)
+            chunk_s = best_of(args.repeat, chunk_summary, summary, 3000)
+            format_s = best_of(
+                args.repeat,
+                format_article_md2,
+                title,
+                summary,
+                ["https://www.understandingwar.org/backgrounder/x"],
+                "ukraine",
+                locale,
+            )
+
+            messages = format_article_md2(
+                title, summary, ["https://www.understandingwar.org"], "ukraine", locale
+            )
+            too_long = [m for m in messages if telegram_length(m) > TELEGRAM_MAX_LENGTH]
+            if too_long:
+                raise SystemExit(
+                    f"{locale}/{size}: {len(too_long)} message(s) over the limit"
+                )
+
+            print(
+                f"{locale:<8} {size:>9} {escape_s * 1000:>10.2f} {chunk_s * 1000:>10.2f} "
+                f"{format_s * 1000:>10.2f} {len(messages):>9}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+from datetime import date
+
+from app.utils.football_render import FootballRenderer
+
+
+class FakeMemory:
+    def __init__(self):
+        self.remembered = {}
+
+    def remember(self, pairs, approved=False):
+        self.remembered.update(pairs)
+
+
+PREVIEW = """Level 4 – Firestorm 🔥 | Sunderland AFC 🆚 Ipswich Town FC
+📅 Date: 24 Oct 2026
+
+Level 1 – Chill 🥱 | **Leicester City FC** 🆚 Made Up FC"""
+
+FARSI_PREVIEW = """سطح ۴ – بازی آتشین 🔥 | ساندرلند 🆚 ایپسویچ تاون
+📅 تاریخ: ۲ آبان ۱۴۰۵
+
+سطح ۱ – دیدار کم‌حرارت 🥱 | لستر سیتی 🆚 میداپ"""
+
+
+def test_captures_team_names_from_aligned_preview_lines():
+    memory = FakeMemory()
+    renderer = FootballRenderer(translation_memory=memory)
+
+    pairs = renderer.capture_team_names(
+        PREVIEW,
+        FARSI_PREVIEW,
+        {"Sunderland AFC", "Ipswich Town FC", "Leicester City FC"},
+    )
+
+    # Names in the static table and names not in the input are left out
+    assert pairs == {
+        "Ipswich Town FC": "ایپسویچ تاون",
+        "Leicester City FC": "لستر سیتی",
+    }
+    assert memory.remembered == pairs
+    assert renderer.team_fa("Ipswich Town FC") == "ایپسویچ تاون"
+
+
+def test_captures_nothing_when_the_languages_list_different_games():
+    memory = FakeMemory()
+    renderer = FootballRenderer(translation_memory=memory)
+    farsi = FARSI_PREVIEW.split("\n\n")[0]
+
+    assert renderer.capture_team_names(PREVIEW, farsi, {"Ipswich Town FC"}) == {}
+    assert memory.remembered == {}
+
+
+def test_week_titles_carry_the_week_start():
+    titles = FootballRenderer().render_week_titles("Premier League", date(2026, 10, 23))
+
+    assert titles == {
+        "title": "Premier League upcoming week preview - 23 Oct 2026",
+        "farsi_title": "پیش‌نمایش هفته آینده لیگ برتر انگلیس - ۱ آبان ۱۴۰۵",
+    }
@@ -0,0 +1,48 @@
+from app.utils.telegram_client import ChatRateScheduler
+
+
+def reserve_all(scheduler, chat_id, counts, now=0.0):
+    return [scheduler.reserve(chat_id, now, count) for count in counts]
+
+
+def test_private_chat_sends_are_spaced_per_message():
+    scheduler = ChatRateScheduler(per_chat_interval=1.0)
+
+    assert reserve_all(scheduler, 42, [1, 1, 1]) == [0.0, 1.0, 2.0]
+
+
+def test_album_items_take_one_slot_each():
+    scheduler = ChatRateScheduler(per_chat_interval=1.0)
+
+    # A 3-item album holds slots 0-2, so the next message waits for slot 3
+    assert reserve_all(scheduler, 42, [3, 1]) == [0.0, 3.0]
+
+
+def test_chats_are_paced_independently():
+    scheduler = ChatRateScheduler(per_chat_interval=1.0)
+
+    scheduler.reserve(1, 0.0)
+    assert scheduler.reserve(2, 0.0) == 0.0
+
+
+def test_group_waits_for_the_minute_window():
+    scheduler = ChatRateScheduler(per_chat_interval=1.0, group_per_minute=20)
+
+    delays = reserve_all(scheduler, -100, [1] * 21)
+
+    assert delays[:20] == [float(i) for i in range(20)]
+    # The 21st message waits until the first one leaves the window
+    assert delays[20] == 60.0
+
+
+def test_group_album_must_fit_the_window_as_a_whole():
+    scheduler = ChatRateScheduler(per_chat_interval=1.0, group_per_minute=20)
+
+    assert reserve_all(scheduler, -100, [10, 1, 10, 1]) == [0.0, 10.0, 60.0, 70.0]
+
+
+def test_expired_slots_free_the_group_window():
+    scheduler = ChatRateScheduler(per_chat_interval=1.0, group_per_minute=20)
+    reserve_all(scheduler, -100, [1] * 20)
+
+    assert scheduler.reserve(-100, 120.0) == 0.0
@@ -0,0 +1,195 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.db.sqlite_service import (
+    SQLiteArticleService,
+    SQLiteCronJobDBService,
+    SQLiteDatabaseService,
+)
+
+
+@pytest.fixture
+def db_service(tmp_path):
+    return SQLiteDatabaseService(f"sqlite:///{tmp_path / 'news.db'}")
+
+
+@pytest.fixture
+def articles(db_service):
+    return SQLiteArticleService(db_service)
+
+
+@pytest.fixture
+def jobs(db_service):
+    return SQLiteCronJobDBService(db_service)
+
+
+def create(articles, title, summary="", source="test", **fields):
+    return articles.create_article(title, summary, source, **fields)
+
+
+def all_pages(articles, limit, **filters):
+    seen = []
+    after = None
+    while True:
+        page, after = articles.list_articles_page(limit=limit, after=after, **filters)
+        seen.extend(article["id"] for article in page)
+        if after is None:
+            return seen
+
+
+@pytest.mark.parametrize("db_url", ["sqlite:///:memory:", "sqlite://"])
+def test_in_memory_databases_are_rejected(db_url):
+    with pytest.raises(RuntimeError):
+        SQLiteDatabaseService(db_url)
+
+
+# ---------------- dedupe ----------------
+
+
+def test_title_variants_are_deduplicated(articles):
+    article_id = create(articles, "Ceasefire talks resume in Geneva")
+
+    assert article_id is not None
+    assert create(articles, "ceasefire talks   resume, in Geneva!") is None
+    assert (
+        articles.get_article(article_id)["title"] == "Ceasefire talks resume in Geneva"
+    )
+
+
+def test_bulk_insert_skips_duplicates_within_and_across_batches(articles):
+    create(articles, "Markets close higher")
+
+    results = articles.create_articles_bulk(
+        [
+            {"title": "Markets close higher!", "summary": "", "source": "test"},
+            {"title": "Storm hits the coast", "summary": "", "source": "test"},
+            {"title": "storm hits the coast", "summary": "", "source": "test"},
+        ]
+    )
+
+    assert [result["inserted"] for result in results] == [False, True, False]
+
+
+def test_on_created_only_runs_for_inserted_articles(articles):
+    created = []
+    create(articles, "Election results announced")
+
+    articles.create_articles_bulk(
+        [
+            {"title": "Election results announced", "summary": "", "source": "test"},
+            {"title": "Stadium reopens", "summary": "", "source": "test"},
+        ],
+        on_created=lambda cur, position, article_id: created.append(position),
+    )
+
+    assert created == [1]
+
+
+def test_deleted_title_can_be_stored_again(articles):
+    article_id = create(articles, "Bridge reopens after repairs")
+
+    assert articles.delete_article(article_id)
+    assert create(articles, "Bridge reopens after repairs") is not None
+
+
+def test_update_changes_fields_and_title_hash(articles):
+    article_id = create(articles, "Draft headline", topic="news")
+
+    assert articles.update_article(article_id, title="Final headline", summary="Done")
+    article = articles.get_article(article_id)
+    assert (article["title"], article["summary"], article["topic"]) == (
+        "Final headline",
+        "Done",
+        "news",
+    )
+    # The new title is claimed, the old one released
+    assert create(articles, "final headline!") is None
+    assert create(articles, "Draft headline") is not None
+
+
+def test_update_without_fields_is_a_no_op(articles):
+    article_id = create(articles, "Unchanged headline")
+
+    assert not articles.update_article(article_id)
+
+
+def test_update_to_a_taken_title_is_rejected(articles):
+    create(articles, "First headline")
+    article_id = create(articles, "Second headline")
+
+    with pytest.raises(ValueError):
+        articles.update_article(article_id, title="first headline")
+    assert articles.get_article(article_id)["title"] == "Second headline"
+
+
+# ---------------- search paging ----------------
+
+
+def test_pages_cover_every_article_once(articles):
+    ids = {create(articles, f"Headline number {i}") for i in range(7)}
+
+    seen = all_pages(articles, limit=3)
+
+    assert len(seen) == len(ids)
+    assert set(seen) == ids
+
+
+def test_search_pages_cover_every_match_once(articles):
+    matching = {
+        create(articles, f"Ceasefire update {i}", summary="ceasefire " * (i + 1))
+        for i in range(5)
+    }
+    create(articles, "Weather forecast", summary="sunny")
+
+    seen = all_pages(articles, limit=2, search="ceasefire")
+
+    assert len(seen) == len(matching)
+    assert set(seen) == matching
+
+
+def test_search_supports_exclusions(articles):
+    kept = create(articles, "Ceasefire holds in the north")
+    create(articles, "Ceasefire broken in the south")
+
+    page, _ = articles.list_articles_page(search="ceasefire -south")
+
+    assert [article["id"] for article in page] == [kept]
+
+
+def test_search_with_nothing_to_match_returns_no_articles(articles):
+    create(articles, "Anything at all")
+
+    assert articles.list_articles_filtered(search='""') == []
+
+
+# ---------------- job runs ----------------
+
+
+def test_failed_run_is_retried_until_completed(jobs):
+    scheduled = datetime.now(timezone.utc)
+    job_id = jobs.start_job_run("news", scheduled)
+
+    jobs.mark_job_failed(job_id, "timeout", 1.5)
+    hanging = jobs.get_hanging_jobs("news")
+    assert [job["id"] for job in hanging] == [job_id]
+
+    assert jobs.start_job_run("news", scheduled, job_id=job_id) == job_id
+    jobs.mark_job_completed(job_id, 2.0)
+    assert jobs.get_hanging_jobs("news") == []
+
+
+def test_compaction_keeps_max_duration_when_new_runs_have_none(jobs, db_service):
+    scheduled = datetime.now(timezone.utc) - timedelta(days=40)
+    jobs.mark_job_completed(jobs.start_job_run("news", scheduled), 4.0)
+    assert jobs.compact_job_runs(retention_days=30) == 1
+
+    # A completed run without a recorded duration, on the same day
+    jobs.mark_job_completed(jobs.start_job_run("news", scheduled), None)
+    assert jobs.compact_job_runs(retention_days=30) == 1
+
+    with db_service.connection() as conn:
+        row = conn.execute(
+            "SELECT runs, completed, max_duration_seconds FROM cron_job_daily_stats;"
+        ).fetchone()
+    assert row == (2, 2, 4.0)
@@ -0,0 +1,82 @@
+import random
+import re
+
+import pytest
+
+from app.utils.telegram import (
+    chunk_offsets,
+    chunk_summary,
+    escape_markdown_v2,
+    telegram_length,
+)
+
+
+def trailing_backslashes(chunk):
+    return len(chunk) - len(chunk.rstrip("\\"))
+
+
+def assert_valid_chunks(text, limit):
+    spans = chunk_offsets(text, limit)
+    chunks = [text[start:end] for start, end in spans]
+
+    for chunk in chunks:
+        assert 0 < telegram_length(chunk) <= limit
+        assert trailing_backslashes(chunk) % 2 == 0
+    # Chunks are in order and only whitespace is dropped between them
+    assert re.sub(r"\s", "", "".join(chunks)) == re.sub(r"\s", "", text)
+    return chunks
+
+
+def test_text_within_the_limit_is_one_chunk():
+    assert chunk_summary("  short text \n", 100) == ["short text"]
+
+
+def test_prefers_paragraph_over_line_breaks():
+    text = "first paragraph\nstill first\n\nsecond paragraph"
+
+    assert chunk_summary(text, 35) == [
+        "first paragraph\nstill first",
+        "second paragraph",
+    ]
+
+
+def test_falls_back_to_sentence_then_word_boundaries():
+    assert chunk_summary("One two. Three four five.", 16) == [
+        "One two.",
+        "Three four five.",
+    ]
+    assert chunk_summary("alpha beta gamma", 11) == ["alpha beta", "gamma"]
+
+
+def test_counts_surrogate_pairs_as_two_units():
+    # Each emoji is two UTF-16 units, so a limit of 5 fits two of them
+    chunks = assert_valid_chunks("😀" * 7, 5)
+
+    assert chunks == ["😀😀", "😀😀", "😀😀", "😀"]
+
+
+def test_astral_characters_shift_break_offsets():
+    text = "😀😀😀 abc def"
+
+    # 8 code points but 11 units: the break after "abc" does not fit
+    assert chunk_summary(text, 8) == ["😀😀😀", "abc def"]
+
+
+@pytest.mark.parametrize("limit", [2, 3, 4, 5])
+def test_never_splits_an_escape_sequence(limit):
+    text = escape_markdown_v2("a.b.c_d*e" * 3)
+
+    chunks = assert_valid_chunks(text, limit)
+
+    assert "".join(chunks) == text
+
+
+def test_random_escaped_text_stays_within_limits():
+    rng = random.Random(35)
+    alphabet = ["a", "ب", "😀", ".", "_", "\\", " ", "\n", "\n\n", "!", "؟"]
+
+    for _ in range(300):
+        text = escape_markdown_v2(
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 200)))
+        )
+        assert_valid_chunks(text, rng.randint(2, 40))